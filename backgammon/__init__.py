@@ -1,10 +1,12 @@
+from typing import Any
+import importlib
+
 from . import core
 from . import game
-from . import display
 from . import misc
 from . import agents
+from . import nn
 
-# TODO: 1) write function to animate a GameState instance somehow (with adjustable playback speed)
 # TODO: 2) write tests for (only) most important functions
 # TODO: 4) improve performance, esp. for action generation of double rolls
 # TODO: 5) built player for a pytorch model - includes encoding of board
@@ -18,7 +20,19 @@ from .core import (
 )
 from .game import (
     ActionType, Action, Transition,
-    Agent, Game, Match,
+    Agent, Game, Match, VecGame,
 )
-from .display import svg_board, svg_gamestate
-from .agents import RandomAgent, SimpleAgent
+from .agents import RandomAgent, SimpleAgent, NeuralAgent
+
+
+# the display stack (svgwrite, matplotlib, PIL, cairosvg) is only imported when used
+_LAZY = {'display': None, 'svg_board': 'display', 'svg_gamestate': 'display'}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _LAZY[name]
+    if module is None:
+        return importlib.import_module(f'.{name}', __name__)
+    return getattr(importlib.import_module(f'.{module}', __name__), name)
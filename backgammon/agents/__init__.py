@@ -1,2 +1,8 @@
 from .random import RandomAgent
 from .simple import SimpleAgent
+from .evaluator import Evaluator, EvaluatorAgent
+from .neural import NeuralAgent
+from .book import OpeningBook, BookAgent
+from .race import RaceAgent
+from .rollout import OUTCOMES, RolloutResult, rollout
+from .analysis import Analysis, Decision, PlayerStats, analyze
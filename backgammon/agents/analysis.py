@@ -0,0 +1,247 @@
+"""Post-game analysis: the equity each checker play of finished games lost against the best play of its turn.
+
+Every turn with more than one distinct play is a decision. All plays of the turn are evaluated, either directly by an
+evaluator (`plies=0`) or by looking one roll of the opponent ahead (`plies=1`), and the loss of a decision is the
+cubeless equity (`2 * win_prob - 1`) of the best play minus that of the play made. Decisions are keyed by the canonical
+hash of the position and the dice (see `book_key`), so that positions occurring in many games (e.g. the openings) are
+evaluated once, and are evaluated in batches (in worker processes, with `max_workers`), e.g.::
+
+    analysis = analyze('games.log', race_win_prob, max_workers=None)
+    analysis.print_stats()
+    for d in analysis.blunders()[:10]:
+        print(d)
+
+Doubling decisions are not analyzed, since evaluators only estimate winning chances.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from os import PathLike
+from typing import Iterable, Iterator
+
+from numpy.typing import NDArray
+import numpy as np
+
+from ..core import Color, Move, Board, GameState
+from ..core.actions import canonical_points
+from ..game import Game, ActionType, read_games
+from .book import book_key
+from .evaluator import Evaluator, EvaluatorAgent
+from .rollout import ROLL_WEIGHTS, roll_values
+
+# the canonical positions (as bytes) after the plays of a decision, with their winning chances, and the best play
+Evaluation = tuple[dict[bytes, float], list[Move]]
+
+
+@dataclass(slots=True)
+class Decision:
+    """A checker play of a game, the best play of its turn and their equities (of the player to move)."""
+
+    game: int
+    turn: int
+    state: GameState
+    moves: list[Move]
+    best_moves: list[Move]
+    equity: float
+    best_equity: float
+    n_plays: int
+
+    @property
+    def player(self) -> Color:
+        return self.state.turn
+
+    @property
+    def loss(self) -> float:
+        return self.best_equity - self.equity
+
+    def __str__(self) -> str:
+        def fmt(moves: list[Move]) -> str:
+            return ' '.join(m.to_str(bar_off=False, regular=False) for m in moves)
+
+        return (f"game {self.game} turn {self.turn} {self.player.name} {self.state.dice}: {fmt(self.moves)} "
+                f"({self.equity:+.3f}), best {fmt(self.best_moves)} ({self.best_equity:+.3f}), loss {self.loss:.3f}")
+
+
+@dataclass(slots=True)
+class PlayerStats:
+    """The decisions of one player, and how many of them lost at least the error and blunder thresholds."""
+
+    n_decisions: int = 0
+    n_errors: int = 0
+    n_blunders: int = 0
+    total_loss: float = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.n_errors / self.n_decisions if self.n_decisions > 0 else 0.0
+
+    @property
+    def mean_loss(self) -> float:
+        return self.total_loss / self.n_decisions if self.n_decisions > 0 else 0.0
+
+
+@dataclass(slots=True)
+class Analysis:
+    """The decisions of the analyzed games (see `analyze`)."""
+
+    decisions: list[Decision]
+    error_th: float = 0.08
+    blunder_th: float = 0.16
+
+    def player_stats(self) -> dict[Color, PlayerStats]:
+        stats = {Color.BLACK: PlayerStats(), Color.WHITE: PlayerStats()}
+        for d in self.decisions:
+            s = stats[d.player]
+            s.n_decisions += 1
+            s.n_errors += d.loss >= self.error_th
+            s.n_blunders += d.loss >= self.blunder_th
+            s.total_loss += d.loss
+        return stats
+
+    def blunders(self) -> list[Decision]:
+        """The decisions losing at least `blunder_th`, the worst first."""
+        return sorted((d for d in self.decisions if d.loss >= self.blunder_th), key=lambda d: -d.loss)
+
+    def print_stats(self):
+        stats = self.player_stats()
+        b, w = stats[Color.BLACK], stats[Color.WHITE]
+        print(f"analysis of {len(self.decisions):,d} decisions (errors >= {self.error_th}, "
+              f"blunders >= {self.blunder_th}):")
+        print()
+        print("           |   BLACK |   WHITE ")
+        print("-----------|---------|---------")
+        print(f"decisions  | {b.n_decisions:7d} | {w.n_decisions:7d} ")
+        print(f"errors     | {b.n_errors:7d} | {w.n_errors:7d} ")
+        print(f"blunders   | {b.n_blunders:7d} | {w.n_blunders:7d} ")
+        print(f"error rate | {b.error_rate:7.1%} | {w.error_rate:7.1%} ")
+        print(f"total loss | {b.total_loss:7.3f} | {w.total_loss:7.3f} ")
+        print(f"mean loss  | {b.mean_loss:7.4f} | {w.mean_loss:7.4f} ")
+
+
+def _turns(game: Game) -> Iterator[tuple[int, GameState, list[Move], Board]]:
+    """The turns of a game with moves: their index, the state after the roll, the moves and the board after them."""
+    turn, start = -1, None
+    moves: list[Move] = []
+    for t in game.history:
+        if t.action.type == ActionType.DICEROLL:
+            turn += 1
+            start, moves = t.next_state, []
+        elif t.action.type == ActionType.MOVE and start is not None:
+            assert t.action.move is not None
+            moves.append(t.action.move)
+            # the turn is over with the last move (or with the game)
+            if t.next_state.board.game_over() or len(t.next_state.build_legal_moves()) == 0:
+                yield turn, start, moves, t.next_state.board
+                start = None
+
+
+def _ply_values(boards: NDArray[np.integer], evaluator: Evaluator) -> NDArray[np.float64]:
+    """The winning chances after the canonical `boards`, averaged over the best replies to all rolls."""
+    values = np.ones(len(boards))
+    for i, points in enumerate(boards):
+        if np.any(points > 0):
+            # the opponent to roll, as BLACK
+            values[i] = 1.0 - roll_values(GameState(Board(points), Color.BLACK), evaluator) @ ROLL_WEIGHTS
+    return values
+
+
+def _evaluate(states: list[GameState], evaluator: Evaluator, plies: int) -> list[Evaluation]:
+    """The evaluations of all plays of the states, in a single call of the evaluator (for `plies=0`)."""
+    boards, sizes, plays = [], [], []
+    for state in states:
+        candidates = state.build_legal_plays()
+        points = canonical_points(np.array([p.board.points for p in candidates]), state.turn).astype(np.int8)
+        boards.append(points)
+        sizes.append(len(candidates))
+        plays.append(candidates)
+    points = np.concatenate(boards)
+    if plies == 0:
+        # evaluators need not know finished games
+        finished = ~np.any(points > 0, axis=1)
+        values = np.where(finished, 1.0, evaluator(points))
+    else:
+        values = _ply_values(points, evaluator)
+
+    evaluations = []
+    offsets = np.cumsum([0] + sizes)
+    for k, state in enumerate(states):
+        start, stop = offsets[k], offsets[k + 1]
+        best = start + int(np.argmax(values[start:stop]))
+        play_values = {points[i].tobytes(): float(values[i]) for i in range(start, stop)}
+        evaluations.append((play_values, [m for _, m in plays[k][best - start].moves]))
+    return evaluations
+
+
+def analyze(
+        games: Iterable[Game] | str | PathLike,
+        evaluator: Evaluator | EvaluatorAgent,
+        plies: int = 0,
+        error_th: float = 0.08,
+        blunder_th: float = 0.16,
+        batch_size: int = 256,
+        max_workers: int | None = 0,
+        cache: dict[tuple[int, int], Evaluation] | None = None,
+) -> Analysis:
+    """Analyze the checker plays of games against the best plays of their turns.
+
+    Args:
+        games (Iterable[Game] | str | PathLike):    The games, or a log of them (see `GameLogger`).
+        evaluator (Evaluator | EvaluatorAgent):     The evaluator of the positions after the plays (or an agent with
+                                                    one).
+        plies (int):                                0 to evaluate the plays directly, 1 to look one roll ahead.
+        error_th (float):                           The equity loss from which a decision is an error.
+        blunder_th (float):                         The equity loss from which a decision is a blunder.
+        batch_size (int):                           The number of decisions evaluated at once (by a worker).
+        max_workers (int | None):                   Number of worker processes evaluating the batches. With 0,
+                                                    evaluate in this process; with None, use as many processes as
+                                                    there are CPUs.
+        cache (dict):                               Evaluations of earlier analyses with the same evaluator and
+                                                    plies, updated with the new ones.
+
+    Returns:
+        analysis (Analysis):                        The decisions of all games.
+    """
+    if plies not in (0, 1):
+        raise ValueError(f"plies must be 0 or 1, not {plies}")
+    if isinstance(games, (str, PathLike)):
+        games = read_games(games)
+    if isinstance(evaluator, EvaluatorAgent):
+        evaluator = evaluator.evaluator
+    cache = {} if cache is None else cache
+
+    turns = [(i, *turn) for i, game in enumerate(games) for turn in _turns(game)]
+    keys = [book_key(state) for _, _, state, _, _ in turns]
+    new: dict[tuple[int, int], GameState] = {}
+    for key, (_, _, state, _, _) in zip(keys, turns):
+        if key not in cache and key not in new:
+            new[key] = state
+
+    states = list(new.values())
+    batches = [states[i:i + batch_size] for i in range(0, len(states), batch_size)]
+    run = partial(_evaluate, evaluator=evaluator, plies=plies)
+    if max_workers == 0:
+        results = [run(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers) as pool:
+            results = list(pool.map(run, batches))
+    for state, (values, best) in zip(states, (e for batch in results for e in batch)):
+        # moves as played by WHITE, like in the opening book
+        cache[book_key(state)] = values, best if state.turn == Color.WHITE else [m.flipped() for m in best]
+
+    decisions = []
+    for key, (game, turn, state, moves, board) in zip(keys, turns):
+        values, best = cache[key]
+        if len(values) < 2:
+            continue  # a forced play
+        played = canonical_points(board.points, state.turn).astype(np.int8).tobytes()
+        decisions.append(Decision(
+            game=game,
+            turn=turn,
+            state=state,
+            moves=moves,
+            best_moves=best if state.turn == Color.WHITE else [m.flipped() for m in best],
+            equity=2 * values[played] - 1,
+            best_equity=2 * max(values.values()) - 1,
+            n_plays=len(values),
+        ))
+    return Analysis(decisions, error_th=error_th, blunder_th=blunder_th)
@@ -0,0 +1,157 @@
+"""An opening book: the plays for the opening rolls and the replies to them, looked up by position and dice.
+
+The book is generated once with any agent (or evaluator), e.g.::
+
+    book = OpeningBook.generate(SimpleAgent())
+    book.save('opening.npz')
+    agent = BookAgent(SimpleAgent(), OpeningBook.load('opening.npz'))
+
+Each move of a book play is stored under the canonical hash of the position (see `backgammon.core.hashing`) and the
+unused dice, so that a lookup takes constant time. Moves are stored as played by WHITE, and flipped for BLACK.
+"""
+from typing import Iterable, Iterator
+from os import PathLike
+import numpy as np
+
+from ..core import Color, Move, Board, GameState
+from ..core.hashing import canonical_hash
+from ..game import Agent
+from .evaluator import Evaluator, EvaluatorAgent
+
+OPENING_ROLLS = [(d1, d2) for d1 in range(2, 7) for d2 in range(1, d1)]
+ROLLS = [(d1, d2) for d1 in range(1, 7) for d2 in range(1, d1 + 1)]
+
+
+def dice_code(dice: Iterable[int]) -> int:
+    """Encode (unused) dice in any order as a single integer, e.g. `(3, 5)` as `53` in base 7."""
+    code = 0
+    for d in sorted(dice, reverse=True):
+        code = 7 * code + d
+    return code
+
+
+def book_key(state: GameState) -> tuple[int, int]:
+    """The key of a state in an `OpeningBook`: the canonical hash of the position and the code of the unused dice."""
+    unused = (d for d, used in zip(state.dice, state.dice_used) if not used)
+    return canonical_hash(state.board.points, state.turn), dice_code(unused)
+
+
+class OpeningBook:
+    """The moves of an agent for the first turns of a game, keyed by position and dice (see `book_key`).
+
+    Args:
+        moves (dict):   The moves (as played by WHITE), keyed by `book_key` of the states they are played in.
+        source (str):   A description of the agent which generated the book.
+    """
+
+    def __init__(self, moves: dict[tuple[int, int], Move] | None = None, source: str = ''):
+        self.moves = {} if moves is None else moves
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{len(self)} moves>, source={self.source!r})"
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __contains__(self, state: GameState) -> bool:
+        return book_key(state) in self.moves
+
+    def lookup(self, state: GameState) -> Move | None:
+        """The book move for the state, or None if the position (and dice) is not in the book."""
+        move = self.moves.get(book_key(state))
+        if move is not None and state.turn == Color.BLACK:
+            move = move.flipped()
+        return move
+
+    def add(self, state: GameState, move: Move):
+        """Add the move for a state (which is also the move for the flipped state, with the colors swapped)."""
+        self.moves[book_key(state)] = move.flipped() if state.turn == Color.BLACK else move
+
+    def add_turn(self, state: GameState, agent: Agent) -> GameState:
+        """Let the agent play the turn of `state` (with dice rolled), add all its moves and return the state after the
+        turn."""
+        state = state.copy()
+        while len(state.build_legal_moves()) > 0:
+            move = agent.choose_move(state)
+            self.add(state, move)
+            state.do_move(move)
+        state.finish_turn(checked=False)
+        return state
+
+    @classmethod
+    def generate(cls, agent: Agent | Evaluator, replies: bool = True, board: Board | None = None) -> 'OpeningBook':
+        """Build the book for the 15 opening rolls and (with `replies`) the 21 rolls of the reply to each of them.
+
+        The plays are generated for WHITE (and flipped for BLACK by `lookup`). An evaluator (instead of an agent)
+        chooses the play with the highest evaluation (see `EvaluatorAgent`).
+        """
+        if not isinstance(agent, Agent):
+            agent = EvaluatorAgent(agent)
+        book = cls(source=repr(agent))
+        for state in _opening_states(board):
+            after = book.add_turn(state, agent)
+            if replies:
+                for dice in ROLLS:
+                    reply = after.copy()
+                    reply.dice = [dice[0]] * 4 if dice[0] == dice[1] else list(dice)
+                    reply.dice_used = [False] * len(reply.dice)
+                    book.add_turn(reply, agent)
+        return book
+
+    def save(self, path: str | PathLike):
+        """Save the book as `.npz` file with arrays of hashes, dice codes and moves."""
+        keys = list(self.moves.keys())
+        moves = list(self.moves.values())
+        np.savez_compressed(
+            path,
+            hashes=np.array([h for h, _ in keys], dtype=np.uint64),
+            dice=np.array([d for _, d in keys], dtype=np.uint16),
+            src=np.array([m.src for m in moves], dtype=np.int8),
+            dst=np.array([m.dst for m in moves], dtype=np.int8),
+            hit=np.array([m.hit for m in moves], dtype=bool),
+            source=np.array(self.source),
+        )
+
+    @classmethod
+    def load(cls, path: str | PathLike) -> 'OpeningBook':
+        with np.load(path) as data:
+            keys = zip(data['hashes'].tolist(), data['dice'].tolist())
+            moves = (Move(src, dst, hit) for src, dst, hit in
+                     zip(data['src'].tolist(), data['dst'].tolist(), data['hit'].tolist()))
+            return cls(dict(zip(keys, moves)), source=str(data['source']))
+
+
+def _opening_states(board: Board | None = None) -> Iterator[GameState]:
+    for d1, d2 in OPENING_ROLLS:
+        yield GameState(board, Color.WHITE, dice=[d2, d1], dice_used=[False, False])
+
+
+class BookAgent(Agent):
+    """A player that plays the moves of an `OpeningBook` and otherwise (and for the cube) asks another agent.
+
+    Args:
+        agent (Agent):          The agent for positions not in the book.
+        book (OpeningBook):     The book, or the path of an `.npz` file to load it from.
+    """
+
+    def __init__(self, agent: Agent, book: OpeningBook | str | PathLike):
+        super().__init__()
+        if not isinstance(book, OpeningBook):
+            book = OpeningBook.load(book)
+        self.agent = agent
+        self.book = book
+        self.n_hits = 0
+
+    def choose_move(self, state: GameState) -> Move:
+        move = self.book.lookup(state)
+        if move is None:
+            return self.agent.choose_move(state)
+        self.n_hits += 1
+        return move
+
+    def will_double(self, state: GameState, points: Iterable[int], match_ends_at: int) -> bool:
+        return self.agent.will_double(state, points, match_ends_at)
+
+    def will_take_doubling(self, state: GameState, points: Iterable[int], match_ends_at: int) -> bool:
+        return self.agent.will_take_doubling(state, points, match_ends_at)
@@ -0,0 +1,87 @@
+from typing import Iterable, Protocol, Hashable
+from numpy.typing import NDArray
+import numpy as np
+
+from ..core import Move, GameState, Play
+from ..core.actions import canonical_points
+from ..game import Agent
+
+
+class Evaluator(Protocol):
+    """Evaluates a batch of canonical positions of shape (n, 26) right after a play.
+
+    The player that just played has the positive checkers (i.e. plays the part of WHITE) and the opponent is to roll.
+    Returns the probabilities of shape (n,) that the player who just played wins.
+    """
+
+    def __call__(self, points: NDArray[np.integer]) -> NDArray[np.floating]: ...
+
+
+def state_key(state: GameState) -> Hashable:
+    return state.moves_key()
+
+
+class EvaluatorAgent(Agent):
+    """A player that chooses the play with the highest evaluation among all plays of a turn.
+
+    All candidate plays of a turn are evaluated in a single call of the evaluator. The chosen play is remembered, so
+    that the remaining moves of the turn are answered without evaluating again.
+
+    Args:
+        evaluator (Evaluator):  The evaluator for the positions after a play.
+        doubling_th (float):    Player will double the stake, if they judge the winning probability to be higher
+                                than this number. Conversely, accept a doubling if the winnings probability is
+                                judged to be 1 - <doubling_th>.
+        max_plans (int):        Maximum number of remembered moves (for many games played concurrently).
+    """
+
+    def __init__(self, evaluator: Evaluator, doubling_th: float = 0.8, max_plans: int = 10_000):
+        super().__init__()
+        self.evaluator = evaluator
+        self.doubling_th = doubling_th
+        self.max_plans = max_plans
+        self._plans: dict[Hashable, Move] = {}
+
+    def has_plan(self, state: GameState) -> bool:
+        return state_key(state) in self._plans
+
+    def candidates(self, state: GameState) -> tuple[list[Play], NDArray[np.int_]]:
+        """All plays of the current turn and the canonical positions they lead to."""
+        plays = state.build_legal_plays()
+        points = canonical_points(np.array([p.board.points for p in plays]), state.turn)
+        return plays, points
+
+    def select(self, state: GameState, plays: list[Play], values: NDArray[np.floating]) -> Play:
+        """Select the play with the highest value and remember its moves."""
+        play = plays[int(np.argmax(values))]
+
+        while len(self._plans) + len(play.moves) > self.max_plans and len(self._plans) > 0:
+            del self._plans[next(iter(self._plans))]
+        state = state.copy()
+        for k, move in play.moves:
+            self._plans[state_key(state)] = move
+            state.do_move(move, k)
+
+        return play
+
+    def choose_move(self, state: GameState) -> Move:
+        move = self._plans.pop(state_key(state), None)
+        if move is None:
+            plays, points = self.candidates(state)
+            assert len(plays[0].moves) > 0, "No moves to choose from"
+            self.select(state, plays, self.evaluator(points))
+            move = self._plans.pop(state_key(state))
+        return move
+
+    def win_prob(self, state: GameState) -> float:
+        """The winning probability of the player to move (before rolling the dice)."""
+        # evaluate from the viewpoint of the opponent, who has just played
+        points = canonical_points(state.board.points, state.turn.other())
+        return 1.0 - float(self.evaluator(points[None, :])[0])
+
+    def will_double(self, state: GameState, points: Iterable[int], match_ends_at: int) -> bool:
+        return self.win_prob(state) > self.doubling_th
+
+    def will_take_doubling(self, state: GameState, points: Iterable[int], match_ends_at: int) -> bool:
+        # the opponent has doubled, so it is their turn
+        return 1.0 - self.win_prob(state) > 1.0 - self.doubling_th
@@ -0,0 +1,25 @@
+from os import PathLike
+
+from ..nn import MLP, MLPEvaluator
+from .evaluator import EvaluatorAgent
+
+
+class NeuralAgent(EvaluatorAgent):
+    """A player that evaluates positions with a small multilayer perceptron (in pure NumPy).
+
+    The network gets the TD-Gammon encoding of the position after a play and outputs the winning probability of the
+    player who played (see `backgammon.nn.TDTrainer` for training it). All plays of a turn are scored in one batched
+    forward pass.
+
+    Args:
+        model (MLP | str | PathLike):   The network, or the path of an `.npz` file to load it from.
+        extra (bool):                   Whether the network uses the extra input features.
+        doubling_th (float):            See `EvaluatorAgent`.
+    """
+
+    def __init__(self, model: MLP | str | PathLike, extra: bool = False, doubling_th: float = 0.8):
+        if not isinstance(model, MLP):
+            model = MLP.load(model)
+        super().__init__(MLPEvaluator(model, extra=extra), doubling_th=doubling_th)
+        self.model = model
+        self.extra = extra
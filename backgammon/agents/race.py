@@ -0,0 +1,48 @@
+from typing import Iterable
+
+from ..core import Move, GameState
+from ..core.batch import pip_counts
+from ..game import Agent
+from ..misc import effective_pip_counts, race_win_prob
+from .evaluator import EvaluatorAgent
+from .simple import SimpleAgent
+
+
+class RaceAgent(EvaluatorAgent):
+    """A player for races, which asks another agent (the `fallback`) as long as there is contact.
+
+    In a race (see `Board.contact`), it plays the play with the lowest effective pip count (see
+    `backgammon.misc.race`), preferring fewer pips, and doubles by the winning probability of `race_win_prob`.
+    This is both cheaper and better than the general heuristics of most agents.
+
+    Args:
+        fallback (Agent):       The agent for positions with contact (`SimpleAgent()`, if not given).
+        doubling_th (float):    See `EvaluatorAgent`.
+    """
+
+    def __init__(self, fallback: Agent | None = None, doubling_th: float = 0.8):
+        super().__init__(race_win_prob, doubling_th=doubling_th)
+        self.fallback = SimpleAgent() if fallback is None else fallback
+
+    def choose_move(self, state: GameState) -> Move:
+        if self.has_plan(state):
+            return super().choose_move(state)
+        if state.board.contact():
+            return self.fallback.choose_move(state)
+
+        plays, points = self.candidates(state)
+        assert len(plays[0].moves) > 0, "No moves to choose from"
+        # the player who played has the positive checkers
+        values = -(effective_pip_counts(points)[:, 1] + pip_counts(points)[:, 1] / 1000)
+        self.select(state, plays, values)
+        return super().choose_move(state)
+
+    def will_double(self, state: GameState, points: Iterable[int], match_ends_at: int) -> bool:
+        if state.board.contact():
+            return self.fallback.will_double(state, points, match_ends_at)
+        return super().will_double(state, points, match_ends_at)
+
+    def will_take_doubling(self, state: GameState, points: Iterable[int], match_ends_at: int) -> bool:
+        if state.board.contact():
+            return self.fallback.will_take_doubling(state, points, match_ends_at)
+        return super().will_take_doubling(state, points, match_ends_at)
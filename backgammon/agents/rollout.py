@@ -0,0 +1,278 @@
+"""Monte Carlo rollouts: the chances of a position, estimated by playing it out many times.
+
+Each trial plays the position to the end (or to `truncate` turns, where an evaluator estimates the rest) with the same
+agent for both players and without doubling cube. Three techniques make the estimates converge faster:
+
+- Stratified dice: the first rolls of the trials run through all 36 rolls in turn, instead of being random, so that
+  they are exactly as frequent as they should be. The rolls are assigned as a Latin square: in each block of 36 trials,
+  each stratified roll runs through all 36 rolls (and over 1296 trials, the first two rolls through all pairs).
+- Variance reduction: with an evaluator, the luck of each roll is the value of the best play with that roll minus the
+  average over all rolls. Subtracting the total luck of a trial from its result removes much of the noise of the dice,
+  without changing the expectation.
+- Early stopping: trials are played in batches (in worker processes, with `max_workers`), until the standard error of
+  the equity is below `target_error`.
+
+The results are from the viewpoint of the player to roll in the position, cubeless, e.g.::
+
+    res = rollout(state, SimpleAgent(), n_trials=1296, truncate=10, evaluator=race_win_prob, max_workers=None)
+    print(f"{res.probs['win']:.3f} +- {res.errors['win']:.3f}, equity {res.equity:+.3f}")
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+import random
+
+from numpy.typing import NDArray
+import numpy as np
+
+from ..core import Color, WinType, GameState
+from ..core.actions import canonical_points
+from ..game import Agent
+from ..misc import WinProbModel
+from .evaluator import Evaluator, EvaluatorAgent
+
+OUTCOMES = ('win', 'win_gammon', 'win_backgammon', 'lose_gammon', 'lose_backgammon')
+# the cubeless equity of the outcomes, in addition to the -1 of a lost game
+_EQUITY_WEIGHTS = np.array([2.0, 1.0, 1.0, -1.0, -1.0])
+
+ROLLS_36 = [(d1, d2) for d1 in range(1, 7) for d2 in range(1, 7)]
+# the distinct rolls and how many of the 36 rolls they stand for
+ROLLS = [(d1, d2) for d1 in range(1, 7) for d2 in range(1, d1 + 1)]
+ROLL_WEIGHTS = np.array([1.0 if d1 == d2 else 2.0 for d1, d2 in ROLLS]) / 36
+
+
+@dataclass(slots=True)
+class RolloutResult:
+    """The estimated chances (see `OUTCOMES`) of the player to roll, and their standard errors.
+
+    The gammon chances include backgammons. With variance reduction, the winning chances and the equity are corrected
+    by the luck of the rolls (the gammon chances are not, since evaluators only estimate winning chances). The standard
+    errors treat the trials as independent, which overestimates them a little for balanced (stratified) rolls.
+    """
+
+    probs: dict[str, float]
+    errors: dict[str, float]
+    equity: float
+    equity_error: float
+    n_trials: int
+
+    def __repr__(self) -> str:
+        probs = ', '.join(f"{k}={self.probs[k]:.4f}+-{self.errors[k]:.4f}" for k in OUTCOMES)
+        return (f"{self.__class__.__name__}({probs}, equity={self.equity:+.4f}+-{self.equity_error:.4f}, "
+                f"n_trials={self.n_trials})")
+
+
+def _pip_evaluator(points: NDArray[np.integer]) -> NDArray[np.floating]:
+    return WinProbModel().win_probs(points)[..., 1]
+
+
+def _set_dice(state: GameState, dice: tuple[int, int]):
+    state.dice = [dice[0]] * 4 if dice[0] == dice[1] else list(dice)
+    state.dice_used = [False] * len(state.dice)
+
+
+def roll_values(state: GameState, evaluator: Evaluator) -> NDArray[np.float64]:
+    """The winning chances of the player to roll after the best play of each of the distinct rolls (`ROLLS`).
+
+    The best plays are those the evaluator rates highest, and `values @ ROLL_WEIGHTS` are the winning chances before
+    the roll (one ply ahead).
+    """
+    points: list[NDArray[np.integer]] = []
+    sizes: list[int] = []
+    for dice in ROLLS:
+        s = state.copy()
+        _set_dice(s, dice)
+        plays = s.build_legal_plays()
+        points.extend(p.board.points for p in plays)
+        sizes.append(len(plays))
+    canonical = canonical_points(np.array(points), state.turn)
+    # evaluators need not know finished games
+    values = np.where(np.any(canonical > 0, axis=1), evaluator(canonical), 1.0)
+    return np.maximum.reduceat(values, np.cumsum([0] + sizes[:-1]))
+
+
+def _final_outcome(state: GameState, root: Color) -> NDArray[np.float64]:
+    res = state.result()
+    wintype = int(res.wintype)
+    won = res.winner == root
+    return np.array([won, won and wintype >= WinType.GAMMON, won and wintype >= WinType.BACKGAMMON,
+                     not won and wintype >= WinType.GAMMON, not won and wintype >= WinType.BACKGAMMON], dtype=float)
+
+
+def _truncated_outcome(state: GameState, root: Color, evaluator: Evaluator) -> NDArray[np.float64]:
+    """The estimated outcome of a trial stopped with `state.turn` to roll."""
+    # the evaluator takes the viewpoint of the player who just played
+    win = 1.0 - float(evaluator(canonical_points(state.board.points, state.turn.other())[None, :])[0])
+    if state.turn != root:
+        win = 1.0 - win
+    # the gammon chances given a win, as estimated from the pip counts
+    model = WinProbModel()
+    points = state.board.points
+    wins = model.win_probs(points)
+    gammons = model.gammon_probs(points) / np.maximum(wins, 1e-9)
+    own = int(root == Color.WHITE)
+    return np.array([win, win * gammons[own], 0.0, (1 - win) * gammons[1 - own], 0.0])
+
+
+def _first_rolls(i: int, stratify: int) -> list[tuple[int, int]]:
+    """The stratified rolls of trial `i`: the k-th roll is shifted by k for each block of 36 trials."""
+    return [ROLLS_36[(i + k * (i // 36)) % 36] for k in range(stratify)]
+
+
+def _trial(
+        state: GameState,
+        agent: Agent,
+        evaluator: Evaluator,
+        first_rolls: list[tuple[int, int]],
+        rng: np.random.Generator,
+        truncate: int | None,
+        variance_reduction: bool,
+        values_cache: dict[tuple[bytes, int], NDArray[np.float64]],
+) -> NDArray[np.float64]:
+    """Play one trial. Returns the outcome (see `OUTCOMES`) and the luck of the player to roll at the start."""
+    root = state.turn
+    state = state.copy()
+    luck = 0.0
+    ply = 0
+    while True:
+        if truncate is not None and ply >= truncate:
+            return np.append(_truncated_outcome(state, root, evaluator), luck)
+        dice = first_rolls[ply] if ply < len(first_rolls) else tuple(rng.integers(1, 7, size=2).tolist())
+        if variance_reduction:
+            # the first positions are the same in many trials
+            key = (state.board.points.tobytes(), int(state.turn))
+            values = values_cache.get(key)
+            if values is None:
+                values = values_cache[key] = roll_values(state, evaluator)
+            roll = ROLLS.index((max(dice), min(dice)))
+            sign = 1.0 if state.turn == root else -1.0
+            luck += sign * (values[roll] - values @ ROLL_WEIGHTS)
+
+        _set_dice(state, dice)
+        while len(state.build_legal_moves()) > 0:
+            state.do_move(agent.choose_move(state))
+        if state.board.game_over():
+            return np.append(_final_outcome(state, root), luck)
+        state.finish_turn(checked=False)
+        ply += 1
+
+
+def _run_trials(
+        start: int,
+        stop: int,
+        seed: int,
+        state: GameState,
+        agent: Agent,
+        evaluator: Evaluator,
+        truncate: int | None,
+        stratify: int,
+        variance_reduction: bool,
+        seed_agents: bool,
+) -> NDArray[np.float64]:
+    """Trials `start` to `stop` (which determine the stratified first rolls), shape (stop - start, 6)."""
+    rng = np.random.default_rng(seed)
+    if seed_agents:
+        random.seed(seed)  # e.g. `RandomAgent` uses the `random` module
+    rows = []
+    values_cache: dict[tuple[bytes, int], NDArray[np.float64]] = {}
+    for i in range(start, stop):
+        rows.append(_trial(state, agent, evaluator, _first_rolls(i, stratify), rng, truncate, variance_reduction,
+                           values_cache))
+    return np.array(rows).reshape(-1, 6)
+
+
+def _summarize(rows: NDArray[np.float64], variance_reduction: bool) -> RolloutResult:
+    outcomes, luck = rows[:, :5].copy(), rows[:, 5]
+    if variance_reduction:
+        outcomes[:, 0] -= luck
+    equities = outcomes @ _EQUITY_WEIGHTS - 1
+    n = len(rows)
+    errors = outcomes.std(axis=0, ddof=1) / np.sqrt(n) if n > 1 else np.full(5, np.inf)
+    equity_error = float(equities.std(ddof=1) / np.sqrt(n)) if n > 1 else float('inf')
+    return RolloutResult(
+        probs=dict(zip(OUTCOMES, outcomes.mean(axis=0).tolist())),
+        errors=dict(zip(OUTCOMES, errors.tolist())),
+        equity=float(equities.mean()),
+        equity_error=equity_error,
+        n_trials=n,
+    )
+
+
+def rollout(
+        state: GameState,
+        player: Agent | Evaluator,
+        n_trials: int = 1296,
+        evaluator: Evaluator | None = None,
+        truncate: int | None = None,
+        stratify: int = 2,
+        variance_reduction: bool = True,
+        target_error: float | None = None,
+        batch_size: int = 72,
+        max_workers: int | None = 0,
+        seed: int | None = None,
+) -> RolloutResult:
+    """Roll out the position of `state` with its player (`state.turn`) to roll (the dice of `state` are ignored).
+
+    Args:
+        state (GameState):              The position and the player to roll.
+        player (Agent | Evaluator):     The agent playing both sides, or an evaluator (see `EvaluatorAgent`).
+        n_trials (int):                 The (maximum) number of trials.
+        evaluator (Evaluator):          The evaluator for truncated trials and the luck of the rolls. Defaults to the
+                                        evaluator of `player`, if it has one, and else to the pip count estimate
+                                        of `WinProbModel` (without variance reduction).
+        truncate (int):                 Stop the trials after this many turns and estimate the rest with `evaluator`.
+        stratify (int):                 The number of rolls at the start of the trials that are stratified.
+        variance_reduction (bool):      Whether to correct the results by the luck of the rolls.
+        target_error (float):           Stop as soon as the standard error of the equity is below this.
+        batch_size (int):               The number of trials played at once (by a worker), a multiple of 36 keeps
+                                        the stratified rolls balanced, also when stopping early.
+        max_workers (int | None):       Number of worker processes playing the batches. With 0, play in this
+                                        process; with None, use as many processes as there are CPUs.
+        seed (int):                     Seed for the dice (and, in worker processes, for the `random` module).
+
+    Returns:
+        result (RolloutResult):         The estimated chances of the player to roll.
+    """
+    if state.turn == Color.NONE or state.board.game_over():
+        raise ValueError("need a position with a player to roll")
+    if isinstance(player, Agent):
+        agent = player
+        if evaluator is None and isinstance(player, EvaluatorAgent):
+            evaluator = player.evaluator
+    else:
+        agent = EvaluatorAgent(player)
+        evaluator = player if evaluator is None else evaluator
+    if evaluator is None:
+        evaluator = _pip_evaluator
+        variance_reduction = False
+
+    state = state.copy()
+    state.dice, state.dice_used = [], []
+    rng = np.random.default_rng(seed)
+    starts = range(0, n_trials, batch_size)
+    seeds = rng.integers(2**63, size=len(starts)).tolist()
+    run = partial(_run_trials, state=state, agent=agent, evaluator=evaluator, truncate=truncate, stratify=stratify,
+                  variance_reduction=variance_reduction, seed_agents=max_workers != 0)
+
+    def done(batches: list[NDArray[np.float64]]) -> bool:
+        if target_error is None:
+            return False
+        return _summarize(np.concatenate(batches), variance_reduction).equity_error < target_error
+
+    batches: list[NDArray[np.float64]] = []
+    if max_workers == 0:
+        for start, batch_seed in zip(starts, seeds):
+            batches.append(run(start, min(start + batch_size, n_trials), batch_seed))
+            if done(batches):
+                break
+    else:
+        with ProcessPoolExecutor(max_workers) as pool:
+            futures = [pool.submit(run, start, min(start + batch_size, n_trials), batch_seed)
+                       for start, batch_seed in zip(starts, seeds)]
+            for future in futures:  # in order, so that the result does not depend on the timing
+                batches.append(future.result())
+                if done(batches):
+                    break
+            for future in futures:
+                future.cancel()
+    return _summarize(np.concatenate(batches), variance_reduction)
@@ -4,7 +4,7 @@ import numpy as np
 
 from ..core import Color, Move, Board, GameState, BLACK_BAR, WHITE_BAR
 from ..game import Agent
-from ..misc import hit_prob
+from ..misc import hit_prob, WinProbModel
 
 
 class SimpleAgent(Agent):
@@ -55,6 +55,9 @@ class SimpleAgent(Agent):
                                     with the given value as standard deviation.
         blot_penalty (float):       Weight for the number of blots of own color to penelise the evaluation.
         bear_off_bonus (float):     Weight for the number of born off board of own color to improve the evaluation.
+        win_prob_model (WinProbModel):
+                                    The parameters of `est_win_prob`, by default those fitted to RandomPlayer (see
+                                    `WinProbModel.calibrate` to refit them).
     """
 
     def __init__(
@@ -65,6 +68,7 @@ class SimpleAgent(Agent):
             blot_penalty: float = 0.3,
             bear_off_bonus: float = 1.0,
             illegal_hit_weight: float = 0.7,
+            win_prob_model: WinProbModel = WinProbModel(),  # frozen, i.e. safe to share
     ):
         super().__init__()
         self.doubling_th = doubling_th
@@ -73,28 +77,44 @@ class SimpleAgent(Agent):
         self.blot_penalty = blot_penalty
         self.bear_off_bonus = bear_off_bonus
         self.illegal_hit_weight = illegal_hit_weight
+        self.win_prob_model = win_prob_model
 
-        self.eval_board = lru_cache(maxsize=128)(self._eval_board)
+        self._init_caches()
+
+    def _init_caches(self):
+        self._eval_board_cached = lru_cache(maxsize=128)(self._eval_board)
         self.eval_move = lru_cache(maxsize=128)(self._eval_move)
 
+    def __getstate__(self) -> dict:
+        # the caches (of bound methods) cannot be pickled, e.g. to send the agent to worker processes
+        state = self.__dict__.copy()
+        del state['_eval_board_cached'], state['eval_move']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init_caches()
+
     def est_win_prob(self, state: GameState, viewpoint: Color | None = None) -> float:
         """Estimate the winning probability (based on the pip count and empirical win rates of RandomPlayer)."""
         # this is only based on pip count - actual checker distribution (such as blots) is entirely ignored
         if viewpoint is None:
             viewpoint = state.turn
 
-        pips = state.board.pip_count().astype(float)
-
-        # this is an empirical fit to the results of two RandomPlayer playing against each other
-        pip_max = np.max(pips)
-        scale = 0.42 * pip_max
-        win_prob_white = (np.tanh((pips[0] - pips[1]) / scale) + 1) / 2
-
-        win_prob = (1 - win_prob_white) if viewpoint == Color.BLACK else win_prob_white
-        win_prob = float(win_prob)
+        # an empirical fit to the results of two RandomPlayer playing against each other (see `WinProbModel`)
+        black, white = state.board.pip_count().tolist()
+        win_prob = self.win_prob_model.pip_win_prob(black, white)
+        if viewpoint == Color.BLACK:
+            win_prob = 1 - win_prob
 
         return win_prob
 
+    def eval_board(self, board: Board, viewpoint: Color) -> float:
+        """Cached `_eval_board`. A position and its mirror image, evaluated from the other viewpoint, share an entry."""
+        if viewpoint == Color.BLACK:
+            board, viewpoint = board.flipped(), Color.WHITE
+        return self._eval_board_cached(board, viewpoint)
+
     def _eval_board(self, board: Board, viewpoint: Color) -> float:
         """Give the board some evaluation from the given viewpoint. Higher is better.
 
@@ -107,6 +127,7 @@ class SimpleAgent(Agent):
             [x] substract <hitting prob * pip_count> from value:
                 * if creating blots, make being hit more unlikely
                 * generally avoid blots closer to the home board more than those to the opponent's home board
+            [x] skip the blot heuristics in races (where nothing can be hit anymore)
             [x] board borne off increase value:
                 * bore off in single run if possible instead of moving within home board (e.g. 2/off better than 5/3)
             [ ] little encourage for 3+ over 2 board at points
@@ -122,6 +143,18 @@ class SimpleAgent(Agent):
         val = viewpoint * (pips[0] - pips[1])
         val_tot += val
 
+        # blots only matter as long as they can be hit
+        if board.contact():
+            val_tot -= self._blots_penalty(board, viewpoint)
+
+        # encourage bearing off
+        val = self.bear_off_bonus * (15 - board.checkers_count(viewpoint))
+        val_tot += val
+
+        return val_tot
+
+    def _blots_penalty(self, board: Board, viewpoint: Color) -> float:
+        """The penalty for the blots of `viewpoint`, by their hitting probability and the pips lost if hit."""
         # helper variables
         blots_mask = (board.points == viewpoint)
         blots_at = np.where(blots_mask)[0]
@@ -129,7 +162,7 @@ class SimpleAgent(Agent):
         opponent = viewpoint.other()
 
         # hit prob. * pips -> avoid own blots
-        val = 0
+        val = 0.0
         for p, pips_add in zip(blots_at, pips_add_if_hit):
             prob = hit_prob(board, p, opponent, only_legal=True)
             val += prob * pips_add
@@ -137,24 +170,18 @@ class SimpleAgent(Agent):
             if board.points[bar] != 0:
                 val -= (1 - self.illegal_hit_weight) * prob * pips_add
                 val += self.illegal_hit_weight * hit_prob(board, p, opponent, only_legal=False) * pips_add
-        val_tot -= val
 
         # generally penalise blots
-        val = self.blot_penalty * blots_mask.sum()
-        val_tot -= val
+        val += self.blot_penalty * blots_mask.sum()
 
-        # encourage bearing off
-        val = self.bear_off_bonus * (15 - board.checkers_count(viewpoint))
-        val_tot += val
-
-        return val_tot
+        return val
 
     def _eval_move(self, state: GameState, move: Move, viewpoint: Color) -> float:
         # viewpoint of current player, not the one after doing the action!
         if viewpoint == Color.NONE:
             raise ValueError(f"viewpoint has to be either Color.BLACK or Color.WHITE, got {viewpoint}")
 
-        k = state.do_move(move)
+        state.make(move)
         if not all(state.dice_used):
             legal_moves = state.build_legal_moves()
             if len(legal_moves) == 0:
@@ -164,7 +191,7 @@ class SimpleAgent(Agent):
                 val = max(self.eval_move(state, m, viewpoint) for m in legal_moves)
         else:
             val = self.eval_board(state.board, viewpoint)
-        state.undo_move(move, k, checked=False)
+        state.unmake()
 
         return val
 
@@ -2,8 +2,13 @@ from . import defs
 # from . import move
 # from . import board
 
-from .defs import Color, WinType, GameResult, IllegalMoveError, ImpossibleMoveError
-from .move import Move
+from .defs import Color, WinType, PositionClass, GameResult, IllegalMoveError, ImpossibleMoveError
+from .move import Move, MoveList, interned_move
 from .board import Board, START_POINTS, WHITE_BAR, BLACK_BAR
-from .legal_moves import assert_legal_move, is_legal_move, build_legal_move, build_legal_moves
-from .state import GameState
+from .legal_moves import assert_legal_move, is_legal_move, build_legal_move, build_legal_moves, fill_legal_moves
+from .state import GameState, Play
+from .hashing import zobrist_hash, zobrist_hashes, canonical_hash, canonical_hashes
+from .actions import (
+    N_ACTIONS, NO_ACTION, encode_actions, decode_actions, move_to_action, action_to_move, legal_action_mask,
+    encode_play, decode_play,
+)
@@ -0,0 +1,154 @@
+"""Integer encoding of moves for neural agents.
+
+An action is an integer in `range(N_ACTIONS)` which moves a checker from point `src` using a die with `die` pips,
+where `src` is given from the viewpoint of the player to move (i.e. on the canonical board, on which the player to move
+has positive checkers and plays the part of `Color.WHITE`):
+
+    action = (die - 1) * 25 + (src - 1)
+
+Full plays (all moves of one turn) are encoded as arrays of up to four actions, padded with `NO_ACTION` (see
+`encode_play` and `decode_play`).
+"""
+from typing import Iterable, overload
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+
+from .defs import Color
+from .move import Move, interned_move
+from .board import Board
+
+N_ACTIONS = 25 * 6
+NO_ACTION = -1
+MAX_PLAY_MOVES = 4
+
+
+def canonical_points(points: ArrayLike, turn: ArrayLike = Color.WHITE) -> NDArray[np.int_]:
+    """The points (shape (..., 26)) from the viewpoint of the player to move. Always returns a new array."""
+    points = np.asarray(points)
+    turn = np.asarray(turn)
+    if turn.ndim == 0:
+        return -points[..., ::-1] if turn == Color.BLACK else points.copy()
+    return np.where((turn == Color.BLACK)[..., None], -points[..., ::-1], points)
+
+
+def dice_counts(dice: list[int], dice_used: list[bool] | None = None) -> NDArray[np.int8]:
+    """The number of unused dice for each number of pips."""
+    if dice_used is None:
+        dice_used = [False] * len(dice)
+    counts = np.zeros(6, dtype=np.int8)
+    for d, used in zip(dice, dice_used):
+        if not used:
+            counts[d - 1] += 1
+    return counts
+
+
+def encode_actions(src: ArrayLike, die: ArrayLike, turn: ArrayLike = Color.WHITE) -> NDArray[np.int_]:
+    """Encode moves from `src` (regular orientation) with `die` pips as actions. A die of 0 encodes `NO_ACTION`."""
+    src = np.asarray(src)
+    die = np.asarray(die)
+    src = np.where(np.asarray(turn) == Color.BLACK, 25 - src, src)
+    return np.where(die > 0, (die - 1) * 25 + (src - 1), NO_ACTION)
+
+
+def decode_actions(
+        actions: ArrayLike,
+        turn: ArrayLike = Color.WHITE,
+) -> tuple[NDArray[np.int_], NDArray[np.int_], NDArray[np.int_]]:
+    """Decode actions into source, destination (both in regular orientation) and die. `NO_ACTION` gives all zeros."""
+    actions = np.asarray(actions)
+    valid = actions >= 0
+    src = actions % 25 + 1
+    die = actions // 25 + 1
+    dst = np.maximum(src - die, 0)
+    black = np.asarray(turn) == Color.BLACK
+    src = np.where(black, 25 - src, src)
+    dst = np.where(black, 25 - dst, dst)
+    return np.where(valid, src, 0), np.where(valid, dst, 0), np.where(valid, die, 0)
+
+
+def move_to_action(move: Move, die: int, turn: Color) -> int:
+    return int(encode_actions(move.src, die, turn))
+
+
+def action_to_move(action: int, board: Board, turn: Color) -> Move:
+    if not 0 <= action < N_ACTIONS:
+        raise ValueError(f"{action} is not a valid action")
+    src, dst, _ = decode_actions(action, turn)
+    hit = bool(0 < dst < 25 and board.points[dst] == -turn)
+    return interned_move(int(src), int(dst), hit)
+
+
+def encode_play(moves: Iterable[tuple[int, Move]], dice: list[int], turn: Color) -> NDArray[np.int_]:
+    """Encode the moves of a play (as in `Play.moves`: the index of the die and the move) as `MAX_PLAY_MOVES`
+    actions, padded with `NO_ACTION`."""
+    actions = np.full(MAX_PLAY_MOVES, NO_ACTION)
+    for i, (k, move) in enumerate(moves):
+        actions[i] = move_to_action(move, dice[k], turn)
+    return actions
+
+
+def decode_play(actions: ArrayLike, board: Board, turn: Color) -> list[Move]:
+    """Decode the actions of a play (see `encode_play`), played one after another from `board`."""
+    board = board.copy()
+    moves = []
+    for action in np.asarray(actions).tolist():
+        if action == NO_ACTION:
+            break
+        move = action_to_move(action, board, turn)
+        board.do_move(move)
+        moves.append(move)
+    return moves
+
+
+def canonical_action_mask(boards: NDArray[np.integer], dice: NDArray[np.integer]) -> NDArray[np.bool_]:
+    """Legal-action masks of shape (n, N_ACTIONS) for canonical boards of shape (n, 26) and dice counts (n, 6)."""
+    n = len(boards)
+    own = boards > 0
+    open_ = boards >= -1
+    top = 25 - np.argmax(own[:, ::-1], axis=1)  # point of the rearmost own checker
+    home = top <= 6
+    src_ok = own[:, 1:]
+    src_ok[own[:, 25], :24] = False  # checkers on the bar have to be moved first
+    has_die = dice > 0
+
+    mask = np.zeros((n, 6, 25), dtype=bool)
+    for die in range(1, 6 + 1):
+        ok = mask[:, die - 1]  # ok[:, src - 1]
+        ok[:, die:] = open_[:, 1:26 - die]
+        ok[:, die - 1] = home
+        if die > 1:
+            # bearing off with a higher die than needed, only from the rearmost checker
+            ok[:, :die - 1] = home[:, None] & (np.arange(1, die)[None, :] >= top[:, None])
+        ok &= src_ok
+        ok &= has_die[:, die - 1, None]
+    return mask.reshape(n, N_ACTIONS)
+
+
+@overload
+def legal_action_mask(points: Board, dice: ArrayLike, turn: Color) -> NDArray[np.bool_]: ...
+
+
+@overload
+def legal_action_mask(points: ArrayLike, dice: ArrayLike, turn: ArrayLike) -> NDArray[np.bool_]: ...
+
+
+def legal_action_mask(points, dice, turn):
+    """Legal-action mask for a single position or a batch of positions.
+
+    Args:
+        points (Board | ArrayLike): A board or points of shape (26,) or (n, 26) in regular orientation.
+        dice (ArrayLike):           The number of unused dice per number of pips (see `dice_counts`) with shape (6,)
+                                    or (n, 6).
+        turn (ArrayLike):           The color of the player to move (a single one or one per position).
+
+    Returns:
+        mask (NDArray[np.bool_]):   The legal actions with shape (N_ACTIONS,) or (n, N_ACTIONS).
+    """
+    if isinstance(points, Board):
+        points = points.points
+    points = np.asarray(points)
+    single = points.ndim == 1
+    boards = canonical_points(np.atleast_2d(points), turn)
+    dice = np.broadcast_to(np.asarray(dice), (len(boards), 6))
+    mask = canonical_action_mask(boards, dice)
+    return mask[0] if single else mask
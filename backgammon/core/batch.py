@@ -0,0 +1,57 @@
+"""Vectorized versions of `Board` queries for arrays of points with shape (..., 26).
+
+Like `Board.pip_count()` and `Board.checkers_count()`, the results have a trailing axis of length 2 for (BLACK, WHITE).
+"""
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+
+from .board import BLACK_BAR, WHITE_BAR
+
+_PIPS_WHITE = np.arange(26)
+_PIPS_BLACK = _PIPS_WHITE[::-1].copy()
+
+
+def pip_counts(points: ArrayLike) -> NDArray[np.int_]:
+    points = np.asarray(points)
+    white = np.clip(points, 0, None).astype(int)
+    black = np.clip(-points, 0, None).astype(int)
+    return np.stack([black @ _PIPS_BLACK, white @ _PIPS_WHITE], axis=-1)
+
+
+def checkers_counts(points: ArrayLike) -> NDArray[np.int_]:
+    points = np.asarray(points)
+    white = np.clip(points, 0, None).sum(axis=-1, dtype=int)
+    black = np.clip(-points, 0, None).sum(axis=-1, dtype=int)
+    return np.stack([black, white], axis=-1)
+
+
+def bar_counts(points: ArrayLike) -> NDArray[np.int_]:
+    points = np.asarray(points)
+    return np.stack([-points[..., BLACK_BAR], points[..., WHITE_BAR]], axis=-1).astype(int)
+
+
+def off_counts(points: ArrayLike) -> NDArray[np.int_]:
+    return 15 - checkers_counts(points)
+
+
+def blot_counts(points: ArrayLike) -> NDArray[np.int_]:
+    """The number of blots (single checkers) on the points 1 to 24."""
+    points = np.asarray(points)[..., 1:25]
+    return np.stack([(points == -1).sum(axis=-1), (points == 1).sum(axis=-1)], axis=-1)
+
+
+def home_blot_counts(points: ArrayLike) -> NDArray[np.int_]:
+    """The number of blots in the home boards (points 19 to 24 for BLACK, 1 to 6 for WHITE)."""
+    points = np.asarray(points)
+    return np.stack([(points[..., 19:25] == -1).sum(axis=-1), (points[..., 1:7] == 1).sum(axis=-1)], axis=-1)
+
+
+def contact(points: ArrayLike) -> NDArray[np.bool_]:
+    """Whether the checkers of both players can still meet (i.e. the position is not a pure race)."""
+    points = np.asarray(points)
+    index = np.arange(26)
+    # BLACK moves towards 25 and WHITE towards 0 - they have passed each other, if all black checkers are behind
+    # all white ones
+    last_black = np.where(points < 0, index, 26).min(axis=-1)
+    last_white = np.where(points > 0, index, -1).max(axis=-1)
+    return last_black < last_white
@@ -2,7 +2,7 @@ from typing import Any, overload
 from numpy.typing import ArrayLike, NDArray
 import numpy as np
 
-from .defs import Color, WinType
+from .defs import Color, WinType, PositionClass
 from .move import Move
 
 
@@ -12,12 +12,26 @@ BLACK_BAR = 0
 
 
 class Board:
-    __slots__ = ('points',)
+    """The checkers on the points, with WHITE positive and BLACK negative (see `START_POINTS`).
 
-    def __init__(self, points: ArrayLike | None = None, copy: bool = True):
+    With `incremental`, the board keeps derived information (pip and checker counts, `contact`) up to date in
+    `do_move`, `undo_move` and `flip`, instead of computing it from `points` on every query. Such a board must only be
+    changed by these methods, not by writing to `points` directly.
+    """
+    __slots__ = ('points', 'incremental', '_contact', '_pips', '_checkers')
+
+    def __init__(self, points: ArrayLike | None = None, copy: bool = True, incremental: bool = False):
         self.points = START_POINTS.copy() if points is None else np.array(points, dtype=int, copy=copy)
         if self.points.shape != (24 + 2,):
             raise ValueError(f"points must have shape (26,), but got shape {self.points.shape}")
+        self.incremental = incremental
+        self._contact: bool | None = None
+        # (BLACK, WHITE) counts, if incremental
+        self._pips: list[int] | None = None
+        self._checkers: list[int] | None = None
+        if incremental:
+            self._pips = self._pip_count().tolist()
+            self._checkers = self._checkers_count().tolist()
 
     def __hash__(self) -> int:
         return hash(self.points.tobytes())
@@ -32,7 +46,7 @@ class Board:
         return board_ascii_art(self, info=True, swap_ints=False)
 
     def _repr_svg_(self) -> str:
-        from ..display import svg_board
+        from ..display.api import svg_board
         return svg_board(self).tostring()
 
     def __eq__(self, other: Any) -> bool:
@@ -42,10 +56,19 @@ class Board:
         return self.__copy__()
 
     def __copy__(self) -> 'Board':
-        return Board(points=self.points, copy=True)
+        copy = Board(points=self.points, copy=True)
+        if self.incremental:
+            copy.incremental = True
+            copy._contact = self._contact
+            copy._pips = self._pips.copy()  # type: ignore[union-attr]
+            copy._checkers = self._checkers.copy()  # type: ignore[union-attr]
+        return copy
 
     def flip(self):
         self.points = -self.points[::-1]
+        if self.incremental:
+            self._pips.reverse()  # type: ignore[union-attr]
+            self._checkers.reverse()  # type: ignore[union-attr]
 
     def flipped(self) -> 'Board':
         copy = self.__copy__()
@@ -62,16 +85,23 @@ class Board:
     def pip_count(self, color: Color) -> int: ...
 
     def pip_count(self, color=None):
+        if color == Color.NONE:
+            return 0  # with or without incremental counts
+        if self._pips is not None:
+            return np.array(self._pips) if color is None else self._pips[(color + 1) // 2]
         if color is None:
-            black = (self.points < 0)
-            return np.array([
-                -np.sum((self.points * np.arange(26)[::-1])[black]),
-                np.sum((self.points * np.arange(26))[~black]),
-            ])
+            return self._pip_count()
         else:
             mask = (color * self.points > 0)
             return color * np.sum((self.points * np.arange(26)[::color])[mask])
 
+    def _pip_count(self) -> NDArray[np.int_]:
+        black = (self.points < 0)
+        return np.array([
+            -np.sum((self.points * np.arange(26)[::-1])[black]),
+            np.sum((self.points * np.arange(26))[~black]),
+        ])
+
     @overload
     def checkers_count(self, color: None = None) -> NDArray[np.int_]: ...
 
@@ -79,15 +109,46 @@ class Board:
     def checkers_count(self, color: Color) -> int: ...
 
     def checkers_count(self, color=None):
+        """The number of checkers on the board (including the bar)."""
+        if color == Color.NONE:
+            return 0
+        if self._checkers is not None:
+            return np.array(self._checkers) if color is None else self._checkers[(color + 1) // 2]
         if color is None:
-            return np.array([
-                -self.points[self.points < 0].sum(),
-                self.points[self.points > 0].sum(),
-            ])
+            return self._checkers_count()
         else:
             return color * np.sum(self.points[color * self.points > 0])
 
+    def _checkers_count(self) -> NDArray[np.int_]:
+        return np.array([
+            -self.points[self.points < 0].sum(),
+            self.points[self.points > 0].sum(),
+        ])
+
+    @overload
+    def bar_count(self, color: None = None) -> NDArray[np.int_]: ...
+
+    @overload
+    def bar_count(self, color: Color) -> int: ...
+
+    def bar_count(self, color=None):
+        if color is None:
+            return np.array([-self.points[BLACK_BAR], self.points[WHITE_BAR]])
+        return color * int(self.points[BLACK_BAR if color == Color.BLACK else WHITE_BAR])
+
+    @overload
+    def off_count(self, color: None = None) -> NDArray[np.int_]: ...
+
+    @overload
+    def off_count(self, color: Color) -> int: ...
+
+    def off_count(self, color=None):
+        """The number of checkers borne off."""
+        return 15 - self.checkers_count(color)
+
     def game_over(self) -> bool:
+        if self._pips is not None:
+            return 0 in self._pips
         return any(self.pip_count() == 0)
 
     def winner(self) -> Color:
@@ -111,6 +172,25 @@ class Board:
             return WinType.BACKGAMMON
         return WinType.GAMMON
 
+    def contact(self) -> bool:
+        """Whether the checkers of both players can still meet (i.e. the position is not a pure race)."""
+        if self._contact is not None:
+            return self._contact
+        black = np.flatnonzero(self.points < 0)
+        white = np.flatnonzero(self.points > 0)
+        # BLACK moves towards 25 and WHITE towards 0
+        contact = len(black) > 0 and len(white) > 0 and bool(black[0] < white[-1])
+        if self.incremental:
+            self._contact = contact
+        return contact
+
+    def position_class(self) -> PositionClass:
+        if self.contact():
+            return PositionClass.CONTACT
+        if self.bearing_off_allowed(Color.WHITE) and self.bearing_off_allowed(Color.BLACK):
+            return PositionClass.BEAR_OFF
+        return PositionClass.RACE
+
     def checkers_before(self, point: int, color: Color) -> bool:
         if color == Color.WHITE:
             return bool(np.any(self.points[point + 1:] > 0))
@@ -138,6 +218,12 @@ class Board:
         if move.dst not in (BLACK_BAR, WHITE_BAR):
             self.points[move.dst] += color
 
+        if self.incremental:
+            self._add_counts(*self._count_deltas(move, int(color)))
+        # a race stays a race, and contact can only be broken by the last checker leaving a point
+        if self._contact and not move.hit and self.points[move.src] == 0:
+            self._contact = None
+
     def undo_move(self, move: Move):
         if move.dst == BLACK_BAR:
             color = Color.WHITE.value
@@ -153,3 +239,29 @@ class Board:
         if move.hit:
             self.points[move.dst] -= color
             self.points[WHITE_BAR if color == Color.BLACK.value else BLACK_BAR] += color
+
+        if self.incremental:
+            self._add_counts(*self._count_deltas(move, int(color)), sign=-1)
+        # moving back might restore contact
+        if self._contact is False:
+            self._contact = None
+
+    @staticmethod
+    def _count_deltas(move: Move, color: int) -> tuple[tuple[int, int], tuple[int, int]]:
+        """The changes of the (BLACK, WHITE) pip and checker counts by a move of `color`."""
+        own_pips = -abs(move.dst - move.src)
+        # the hit checker starts again from the bar
+        opp_pips = (move.dst if color == Color.WHITE else 25 - move.dst) if move.hit else 0
+        own_checkers = -1 if move.dst == BLACK_BAR or move.dst == WHITE_BAR else 0
+        if color == Color.WHITE:
+            return (opp_pips, own_pips), (0, own_checkers)
+        return (own_pips, opp_pips), (own_checkers, 0)
+
+    def _add_counts(self, pips_delta: tuple[int, int], checkers_delta: tuple[int, int], sign: int = 1):
+        """Update the counts of an incremental board (`sign` -1 for undoing a move)."""
+        pips, checkers = self._pips, self._checkers
+        assert pips is not None and checkers is not None
+        pips[0] += sign * pips_delta[0]
+        pips[1] += sign * pips_delta[1]
+        checkers[0] += sign * checkers_delta[0]
+        checkers[1] += sign * checkers_delta[1]
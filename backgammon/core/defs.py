@@ -12,6 +12,14 @@ class Color(IntEnum):
         return Color(-self)
 
 
+class PositionClass(IntEnum):
+    """The phase of the game: the checkers of both players can still meet (CONTACT), or they have passed each other
+    (RACE), with all checkers in the home boards (BEAR_OFF)."""
+    CONTACT = 0
+    RACE = 1
+    BEAR_OFF = 2
+
+
 class WinType(IntEnum):
     NORMAL = 1
     GAMMON = 2
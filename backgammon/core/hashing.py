@@ -0,0 +1,85 @@
+"""Stable Zobrist hashes of positions.
+
+Unlike `hash(board)`, these hashes do not depend on the Python process (or version), so they can be stored, e.g. in a
+`PositionStore` or an opening book. The hash of a position is the XOR of a random 64 bit key for each point and its
+number of checkers (-15 to 15), and a key for the player to move.
+
+The canonical hash (see `canonical_hashes`) is that of the position seen from the player to move, as if they played
+WHITE. It is the same for a position and its mirror image with the colors swapped, so caches and databases keyed by it
+need only half of the entries.
+"""
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+
+from .defs import Color
+
+SEED = 20240229
+MAX_CHECKERS = 15
+
+
+def splitmix64(n: int, seed: int = SEED) -> NDArray[np.uint64]:
+    """`n` pseudo random 64 bit integers - defined here (and not by NumPy's generators) to be stable for good."""
+    with np.errstate(over='ignore'):
+        z = np.uint64(seed) + np.arange(1, n + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+_keys = splitmix64(26 * (2 * MAX_CHECKERS + 1) + 3)
+ZOBRIST = _keys[:-3].reshape(26, 2 * MAX_CHECKERS + 1)
+ZOBRIST_TURN = _keys[-3:].copy()  # BLACK, NONE, WHITE
+ZOBRIST_TURN[Color.NONE + 1] = 0
+del _keys
+
+# the key of n checkers on point i of the mirror image: -n checkers on point 25 - i
+ZOBRIST_MIRROR = ZOBRIST[::-1, ::-1].copy()
+
+_POINTS = np.arange(26)
+
+
+def zobrist_hashes(points: ArrayLike, turn: ArrayLike = Color.NONE) -> NDArray[np.uint64]:
+    """The hashes of positions with points of shape (..., 26) and the players to move, as unsigned 64 bit integers."""
+    points = np.asarray(points)
+    keys = ZOBRIST[_POINTS, points + MAX_CHECKERS]
+    return np.bitwise_xor.reduce(keys, axis=-1) ^ ZOBRIST_TURN[np.asarray(turn) + 1]
+
+
+def zobrist_hash(points: ArrayLike, turn: Color = Color.NONE) -> int:
+    """The hash of a single position."""
+    return int(zobrist_hashes(points, turn))
+
+
+def canonical_hashes(points: ArrayLike, turn: ArrayLike) -> NDArray[np.uint64]:
+    """The hashes of positions with points of shape (..., 26) from the viewpoint of the players to move.
+
+    This is the same as `zobrist_hashes(canonical_points(points, turn), Color.WHITE)` (and thus as `zobrist_hashes`
+    for WHITE to move), but does not need to flip the points. Positions without player to move are not changed.
+    """
+    points = np.asarray(points)
+    turn = np.asarray(turn)
+    index = points + MAX_CHECKERS
+    if turn.ndim == 0:
+        keys = (ZOBRIST_MIRROR if turn == Color.BLACK else ZOBRIST)[_POINTS, index]
+        hashes = np.bitwise_xor.reduce(keys, axis=-1)
+    else:
+        hashes = np.where(
+            turn == Color.BLACK,
+            np.bitwise_xor.reduce(ZOBRIST_MIRROR[_POINTS, index], axis=-1),
+            np.bitwise_xor.reduce(ZOBRIST[_POINTS, index], axis=-1),
+        )
+    return hashes ^ ZOBRIST_TURN[np.where(turn == Color.NONE, Color.NONE, Color.WHITE) + 1]
+
+
+def canonical_hash(points: ArrayLike, turn: Color) -> int:
+    """The canonical hash of a single position."""
+    return int(canonical_hashes(points, turn))
+
+
+def to_signed(hashes: ArrayLike) -> NDArray[np.int64]:
+    """Reinterpret unsigned hashes as signed 64 bit integers (e.g. for SQLite)."""
+    return np.asarray(hashes, dtype=np.uint64).view(np.int64)
+
+
+def to_unsigned(hashes: ArrayLike) -> NDArray[np.uint64]:
+    return np.asarray(hashes, dtype=np.int64).view(np.uint64)
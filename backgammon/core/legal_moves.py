@@ -1,8 +1,10 @@
-from typing import Iterable
-import numpy as np
-
+from typing import Iterator
 from backgammon.core import Color, WHITE_BAR, BLACK_BAR, ImpossibleMoveError, IllegalMoveError
 from backgammon.core import Move, Board
+from numpy.typing import NDArray
+import numpy as np
+
+from .move import MoveList, _MOVES
 
 
 def assert_legal_move(move: Move, board: Board, turn: Color = Color.NONE):
@@ -83,24 +85,92 @@ def build_legal_move(board: Board, src: int, pips: int, turn: Color = Color.NONE
     return move
 
 
-def build_legal_moves(board: Board, pips: int, color: Color) -> list[Move]:
-    """Build all legal game that that use a die with `pips` eyes."""
-    if color == Color.NONE:
-        sources: Iterable[int] = range(26)
+def _iter_moves(p: list[int], pips: int, color: int) -> Iterator[tuple[int, int, bool]]:
+    """The legal moves of `color` (BLACK or WHITE) using a die with `pips` eyes, for the points as list.
+
+    Yields the source, destination and whether the move hits, in the order of the sources.
+    """
+    if color == Color.WHITE:
+        if p[WHITE_BAR] > 0:
+            sources: list[int] = [WHITE_BAR]
+        else:
+            sources = [i for i in range(1, 25) if p[i] > 0]
+            if len(sources) == 0:
+                return
+        # the checker farthest from home - the only one which may bear off with a higher die
+        rear = sources[-1]
+        home = rear <= 6
+        for src in sources:
+            dst = src - pips
+            if dst > 0:
+                n = p[dst]
+                if n >= -1:
+                    yield src, dst, n == -1
+            elif home and (dst == 0 or src == rear):
+                yield src, 0, False
     else:
-        if color == Color.WHITE and board.points[WHITE_BAR] > 0:
-            sources = [WHITE_BAR]
-        elif color == Color.BLACK and board.points[BLACK_BAR] < 0:
+        if p[BLACK_BAR] < 0:
             sources = [BLACK_BAR]
         else:
-            sources = np.where(np.sign(board.points) == color.value)[0]
+            sources = [i for i in range(1, 25) if p[i] < 0]
+            if len(sources) == 0:
+                return
+        rear = sources[0]
+        home = rear >= 19
+        for src in sources:
+            dst = src + pips
+            if dst < 25:
+                n = p[dst]
+                if n <= 1:
+                    yield src, dst, n == 1
+            elif home and (dst == 25 or src == rear):
+                yield src, 25, False
+
+
+def _legal_moves(p: list[int], pips: int, color: int) -> list[Move]:
+    """All legal moves of `color` (BLACK or WHITE) using a die with `pips` eyes, for the points as list.
 
-    moves = []
-    for src in sources:
-        try:
-            m = build_legal_move(board, src, pips, color)
-            moves.append(m)
-        except IllegalMoveError:
-            pass
+    This is the same as trying `build_legal_move` for all sources, but a lot faster (and the moves are interned).
+    """
+    return [_MOVES[src][dst][hit] for src, dst, hit in _iter_moves(p, pips, color)]
 
+
+def build_legal_moves(board: Board, pips: int, color: Color) -> list[Move]:
+    """Build all legal game that that use a die with `pips` eyes."""
+    p = board.points.tolist()
+    if color != Color.NONE:
+        return _legal_moves(p, pips, color)
+    moves = _legal_moves(p, pips, Color.BLACK) + _legal_moves(p, pips, Color.WHITE)
+    moves.sort(key=lambda m: m.src)
     return moves
+
+
+def _fill_moves(p: list[int], pips: int, color: int, array: NDArray, n: int) -> int:
+    """Write the legal moves of `color` (BLACK or WHITE) as `_legal_moves` to `array`, starting at `n`.
+
+    Returns the new number of moves in `array`, which must have room for 16 moves more.
+    """
+    for src, dst, hit in _iter_moves(p, pips, color):
+        array[n] = (src, dst, hit, pips)
+        n += 1
+    return n
+
+
+def fill_legal_moves(board: Board, pips: int, color: Color, out: MoveList) -> int:
+    """Append all legal moves that use a die with `pips` eyes to `out`, in the order of `build_legal_moves`.
+
+    The moves are written to the array of `out` directly, i.e. without any `Move` objects.
+    Returns the number of moves appended.
+    """
+    p = board.points.tolist()
+    start = len(out)
+    # at most 15 checkers (on distinct points) for each color
+    array = out.reserve(32)
+    if color != Color.NONE:
+        n = _fill_moves(p, pips, color, array, start)
+    else:
+        n = _fill_moves(p, pips, Color.WHITE, array, _fill_moves(p, pips, Color.BLACK, array, start))
+        added = array[start:n]
+        added[:] = added[np.argsort(added['src'], kind='stable')]
+    out.n = n
+    return n - start
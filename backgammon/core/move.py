@@ -1,7 +1,10 @@
+from typing import Iterator
 from dataclasses import dataclass
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
 
 
-@dataclass(repr=False, slots=True, unsafe_hash=True)
+@dataclass(repr=False, frozen=True, slots=True)
 class Move:
     src: int
     dst: int
@@ -36,3 +39,82 @@ class Move:
 
     def bearing_off(self) -> bool:
         return self.dst in (0, 25)
+
+    def flipped(self) -> 'Move':
+        """The same move on the flipped board (see `Board.flip`)."""
+        return _MOVES[25 - self.src][25 - self.dst][self.hit]
+
+
+# all possible moves - `Move` instances shared by all move generators (which is why moves are frozen)
+_MOVES = [[(Move(src, dst, False), Move(src, dst, True)) for dst in range(26)] for src in range(26)]
+
+
+def interned_move(src: int, dst: int, hit: bool = False) -> Move:
+    """The shared instance of a move (equal to `Move(src, dst, hit)`)."""
+    return _MOVES[src][dst][hit]
+
+
+MOVE_DTYPE = np.dtype([('src', np.int8), ('dst', np.int8), ('hit', np.bool_), ('die', np.int8)])
+
+
+class MoveList:
+    """Moves in a (growing) structured array with fields `src`, `dst`, `hit` and `die` (the pips of the die used).
+
+    Move generators append to it without creating `Move` objects, which are only looked up (see `interned_move`) when
+    iterating or indexing. A list can be reused with `clear`.
+
+    Args:
+        capacity (int): Initial number of moves the array can hold.
+    """
+    __slots__ = ('array', 'n')
+
+    def __init__(self, capacity: int = 32):
+        self.array: NDArray = np.zeros(capacity, dtype=MOVE_DTYPE)
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_moves()})"
+
+    def __iter__(self) -> Iterator[Move]:
+        return iter(self.to_moves())
+
+    def __getitem__(self, i: int) -> Move:
+        if not -self.n <= i < self.n:
+            raise IndexError(f"index {i} out of range for {self.n} moves")
+        src, dst, hit, _ = self.array[i % self.n].tolist()
+        return _MOVES[src][dst][hit]
+
+    @property
+    def data(self) -> NDArray:
+        """A view of the array of the moves."""
+        return self.array[:self.n]
+
+    def clear(self):
+        self.n = 0
+
+    def reserve(self, n_more: int) -> NDArray:
+        """Make room for `n_more` moves (after the current ones) and return the array, e.g. for move generators."""
+        n = self.n + n_more
+        if n > len(self.array):
+            array = np.zeros(max(n, 2 * len(self.array)), dtype=MOVE_DTYPE)
+            array[:self.n] = self.array[:self.n]
+            self.array = array
+        return self.array
+
+    def extend(self, src: ArrayLike, dst: ArrayLike, hit: ArrayLike, die: ArrayLike):
+        src = np.asarray(src)
+        n = self.n + len(src)
+        self.reserve(len(src))
+        added = self.array[self.n:n]
+        added['src'] = src
+        added['dst'] = dst
+        added['hit'] = hit
+        added['die'] = die
+        self.n = n
+
+    def to_moves(self) -> list[Move]:
+        data = self.data
+        return [_MOVES[s][d][h] for s, d, h in zip(data['src'].tolist(), data['dst'].tolist(), data['hit'].tolist())]
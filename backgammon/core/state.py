@@ -1,10 +1,44 @@
 from typing import Iterable, Any
+from dataclasses import dataclass
+from numpy.typing import NDArray
+import numpy as np
 import random
 
 from .defs import Color, GameResult
-from .move import Move
-from .board import Board
-from .legal_moves import build_legal_move, build_legal_moves, IllegalMoveError
+from .move import Move, MoveList
+from .board import Board, BLACK_BAR, WHITE_BAR
+from .hashing import ZOBRIST, MAX_CHECKERS, zobrist_hash, canonical_hash
+from .legal_moves import build_legal_move, build_legal_moves, fill_legal_moves, IllegalMoveError
+from .actions import legal_action_mask, dice_counts
+
+
+@dataclass(slots=True)
+class Play:
+    """All moves of one turn, as `(die index, move)` pairs, and the resulting board."""
+    moves: list[tuple[int, Move]]
+    board: Board
+
+
+@dataclass(slots=True)
+class UndoRecord:
+    """What `GameState.make` changed, to restore it in `GameState.unmake` without any checks.
+
+    The hash delta is the XOR of the Zobrist keys changed by the move (see `backgammon.core.hashing`) and the count
+    deltas are those of incremental boards (BLACK, WHITE), or zero.
+    """
+    move: Move
+    die: int
+    changed: tuple[tuple[int, int, int], ...]  # (point, checkers before, checkers after)
+    hash_delta: int
+    pips_delta: tuple[int, int]
+    checkers_delta: tuple[int, int]
+    contact: bool | None
+
+
+_ZOBRIST = ZOBRIST.tolist()  # Python ints are faster to look up one by one
+# the number of positions (and dice) for which a state caches the legal moves: a played turn needs only a few, but a
+# search walking the plays of a turn with `make` / `unmake` (hundreds for doubles) must not grow it without bound
+MAX_CACHED_MOVES = 256
 
 
 class GameState:
@@ -29,6 +63,8 @@ class GameState:
         self.dice_used: list[bool] = [True] * len(self.dice) if dice_used is None else list(dice_used)
         if len(self.dice) != len(self.dice_used):
             raise ValueError("lengths of dice and their used state do not match")
+        self._stack: list[UndoRecord] = []
+        self._legal_moves: dict[tuple[bytes, int, tuple[int, ...]], list[Move]] = {}
 
     def __hash__(self) -> int:
         # the int cast makes PyCharm happy...
@@ -37,6 +73,8 @@ class GameState:
         )
 
     def __getattr__(self, item: str) -> Any:
+        if item == 'board':  # not set yet, e.g. while unpickling
+            raise AttributeError(item)
         return getattr(self.board, item)
 
     def __dir__(self) -> Iterable[str]:
@@ -104,12 +142,84 @@ class GameState:
         self.dice = dice
         self.dice_used = [False] * len(dice)
 
+    def moves_key(self) -> tuple[bytes, int, tuple[int, ...]]:
+        """A key of what the legal moves depend on: the position, the player to move and the unused dice (in any
+        order, since which of two equal dice is used does not matter)."""
+        unused = [d for d, used in zip(self.dice, self.dice_used) if not used]
+        unused.sort()
+        return self.board.points.tobytes(), int(self.turn), tuple(unused)
+
     def build_legal_moves(self) -> list[Move]:
-        # build the set to avoid redundancy in move generation
-        pips = set(p for p, used in zip(self.dice, self.dice_used) if not used)
-        return [m for p in pips for m in build_legal_moves(self.board, p, self.turn)]
+        """All legal moves with the unused dice (each of which may leave other moves for the remaining dice).
+
+        The moves are cached for the turn by `moves_key`, so asking again (e.g. by the game, the agent and when
+        finishing the turn), or after undoing a move, does not build them again.
+        """
+        key = self.moves_key()
+        moves = self._legal_moves.get(key)
+        if moves is None:
+            if len(self._legal_moves) >= MAX_CACHED_MOVES:
+                self._legal_moves.clear()
+            # build the set to avoid redundancy in move generation
+            pips = set(key[2])
+            moves = [m for p in pips for m in build_legal_moves(self.board, p, self.turn)]
+            self._legal_moves[key] = moves
+        return list(moves)
+
+    def legal_move_list(self, out: MoveList | None = None) -> MoveList:
+        """The legal moves (as of `build_legal_moves`) in a `MoveList`, which is cleared first if given."""
+        if out is None:
+            out = MoveList()
+        else:
+            out.clear()
+        for pips in set(p for p, used in zip(self.dice, self.dice_used) if not used):
+            fill_legal_moves(self.board, pips, self.turn, out)
+        return out
+
+    def build_legal_plays(self) -> list[Play]:
+        """Build all plays, i.e. sequences of moves until no legal move is left, that lead to distinct positions."""
+        state = self.copy()
+        plays: dict[bytes, Play] = {}
+        visited: set[tuple[bytes, tuple[bool, ...]]] = set()
+        moves: list[tuple[int, Move]] = []
+
+        def walk():
+            key = (state.board.points.tobytes(), tuple(state.dice_used))
+            if key in visited:
+                return
+            visited.add(key)
+
+            leaf = True
+            tried = set()
+            for k, pips in enumerate(state.dice):
+                if state.dice_used[k] or pips in tried:
+                    continue
+                tried.add(pips)
+                for move in build_legal_moves(state.board, pips, state.turn):
+                    leaf = False
+                    state.make(move, k)
+                    moves.append((k, move))
+                    walk()
+                    moves.pop()
+                    state.unmake()
+
+            if leaf and key[0] not in plays:
+                plays[key[0]] = Play(list(moves), state.board.copy())
+
+        walk()
+        return list(plays.values())
+
+    def legal_action_mask(self) -> NDArray[np.bool_]:
+        return legal_action_mask(self.board, dice_counts(self.dice, self.dice_used), self.turn)
 
     def dice_for_move(self, move: Move) -> int | None:
+        if not move.bearing_off():
+            # only the die with the exact number of pips can be used, if the move is legal at all
+            if move not in self.build_legal_moves():
+                return None
+            pips = move.pips()
+            return next(k for k, (d, used) in enumerate(zip(self.dice, self.dice_used)) if d == pips and not used)
+
         for k, pips in enumerate(self.dice):
             if self.dice_used[k]:
                 continue
@@ -143,9 +253,86 @@ class GameState:
             if move != build_legal_move(self.board, move.src, self.dice[k], self.turn):
                 raise ValueError(f"{move} does not match die #{k}")
 
+    def zobrist_hash(self) -> int:
+        """The stable hash of the position and the player to move (see `backgammon.core.hashing`)."""
+        return zobrist_hash(self.board.points, self.turn)
+
+    def canonical_hash(self) -> int:
+        """The hash of the position from the viewpoint of the player to move (the same for the flipped state)."""
+        return canonical_hash(self.board.points, self.turn)
+
+    def _die_for(self, move: Move) -> int:
+        pips = move.pips()
+        for k, (d, used) in enumerate(zip(self.dice, self.dice_used)):
+            if not used and d == pips:
+                return k
+        # bearing off with a higher die
+        die = self.dice_for_move(move)
+        if die is None:
+            raise IllegalMoveError(f"no unused die for {move}")
+        return die
+
+    def make(self, move: Move, k: int | None = None) -> UndoRecord:
+        """Do a move without checking it and push a record to undo it with `unmake`.
+
+        This is meant for search code, which only plays legal moves (e.g. of `build_legal_moves`) and undoes them in
+        reverse order. The die `k` is looked up, if not given. The returned record holds the change of the Zobrist hash
+        (`zobrist_hash() ^ record.hash_delta` is the hash after the move).
+        """
+        if k is None:
+            k = self._die_for(move)
+        board = self.board
+        points = board.points
+        src, dst, hit = move.src, move.dst, move.hit
+        n_src = points.item(src)
+        color = 1 if n_src > 0 else -1
+        # (point, checkers before, checkers after)
+        changed = [(src, n_src, n_src - color)]
+        if dst != BLACK_BAR and dst != WHITE_BAR:
+            n_dst = points.item(dst)
+            changed.append((dst, n_dst, color if hit else n_dst + color))
+        if hit:
+            bar = WHITE_BAR if color < 0 else BLACK_BAR
+            n_bar = points.item(bar)
+            changed.append((bar, n_bar, n_bar - color))
+
+        hash_delta = 0
+        for p, before, after in changed:
+            points[p] = after
+            keys = _ZOBRIST[p]
+            hash_delta ^= keys[before + MAX_CHECKERS] ^ keys[after + MAX_CHECKERS]
+        self.dice_used[k] = True
+
+        contact = board._contact
+        if board.incremental:
+            pips_delta, checkers_delta = Board._count_deltas(move, color)
+            board._add_counts(pips_delta, checkers_delta)
+            # see `Board.do_move`
+            if contact and not hit and n_src == color:
+                board._contact = None
+        else:
+            pips_delta = checkers_delta = (0, 0)
+        record = UndoRecord(move, k, tuple(changed), hash_delta, pips_delta, checkers_delta, contact)
+        self._stack.append(record)
+        return record
+
+    def unmake(self) -> UndoRecord:
+        """Undo the last move done by `make` (without any checks) and return its record."""
+        record = self._stack.pop()
+        board = self.board
+        points = board.points
+        for p, before, _ in record.changed:
+            points[p] = before
+        self.dice_used[record.die] = False
+        if board.incremental:
+            board._add_counts(record.pips_delta, record.checkers_delta, sign=-1)
+        board._contact = record.contact
+        return record
+
     def finish_turn(self, checked: bool = True):
         if checked:
             assert len(self.build_legal_moves()) == 0, "cannot finish turn, if there are legal moves left"
         self.dice = []
         self.dice_used = []
         self.turn = self.turn.other()
+        self._legal_moves.clear()
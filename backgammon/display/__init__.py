@@ -1,5 +1,30 @@
+from typing import Any
+import importlib
+
 from .board_ascii import board_ascii_art
-from .tools import staple_pos, brighten_color, svg2image
-from .style import DisplayStyle
-from .board_svg import BoardDrawing
-from .api import svg_board, get_dice_colors, svg_gamestate
+
+# all but the ASCII art need svgwrite, matplotlib, PIL or cairosvg - import them only when used
+_LAZY = {
+    'tools': None, 'style': None, 'board_svg': None, 'drawing_plus': None, 'api': None, 'animation': None,
+    'contact_sheet': None,
+    'staple_pos': 'tools', 'brighten_color': 'tools', 'svg2image': 'tools', 'svg2png_bytes': 'tools',
+    'svgs2pngs': 'tools', 'svgs2images': 'tools',
+    'DisplayStyle': 'style',
+    'BoardDrawing': 'board_svg',
+    'svg_board': 'api', 'get_dice_colors': 'api', 'svg_gamestate': 'api',
+    'DEFAULT_DURATIONS': 'animation', 'Frame': 'animation', 'game_frames': 'animation', 'animate_game': 'animation',
+    'thumbnail_size': 'contact_sheet', 'contact_sheets': 'contact_sheet', 'save_contact_sheets': 'contact_sheet',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _LAZY[name]
+    if module is None:
+        return importlib.import_module(f'.{name}', __name__)
+    return getattr(importlib.import_module(f'.{module}', __name__), name)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,252 @@
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from io import BytesIO
+from os import PathLike, cpu_count
+from pathlib import Path
+from xml.etree.ElementTree import tostring
+from PIL import Image  # type: ignore
+
+from ..core import Move, GameState
+from ..game import ActionType, Game, Transition
+from .style import DisplayStyle
+from .board_svg import BoardDrawing
+from .api import svg_gamestate
+from .tools import svg2png_bytes
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# how long (in seconds) a frame is shown after the action that led to it
+DEFAULT_DURATIONS: dict[ActionType, float] = {
+    ActionType.NONE: 1.0,
+    ActionType.MOVE: 0.6,
+    ActionType.DOUBLE: 1.5,
+    ActionType.TAKE: 1.0,
+    ActionType.DROP: 1.5,
+    ActionType.DICEROLL: 0.8,
+    ActionType.FINISH_TURN: 0.3,
+}
+
+
+@dataclass(slots=True)
+class Frame:
+    state: GameState
+    last_move: Move | None
+    duration: float  # seconds
+
+
+def game_frames(
+        game: Game | Sequence[Transition],
+        durations: dict[ActionType, float] | None = None,
+        speed: float = 1.0,
+        final_pause: float = 2.0,
+) -> list[Frame]:
+    """The frames of a game: its start and the state after each action of the history.
+
+    Args:
+        game (Game | Sequence[Transition]):     The game or its history.
+        durations (dict[ActionType, float]):    Seconds to show the state after each type of action. Missing types
+                                                are taken from `DEFAULT_DURATIONS`.
+        speed (float):                          Playback speed, i.e. all durations are divided by this number.
+        final_pause (float):                    Additional seconds to show the final state.
+    """
+    history = game.history if isinstance(game, Game) else game
+    durations = DEFAULT_DURATIONS if durations is None else {**DEFAULT_DURATIONS, **durations}
+    if len(history) == 0:
+        state = game.state if isinstance(game, Game) else GameState()
+        return [Frame(state, None, (durations[ActionType.NONE] + final_pause) / speed)]
+
+    frames = [Frame(history[0].state, None, durations[ActionType.NONE] / speed)]
+    for t in history:
+        last_move = t.action.move if t.action.type == ActionType.MOVE else None
+        frames.append(Frame(t.next_state, last_move, durations[t.action.type] / speed))
+    frames[-1].duration += final_pause / speed
+    return frames
+
+
+def _frame_drawing(frame: Frame, ds: DisplayStyle, background: bool = True) -> BoardDrawing:
+    # the points keep their numbers throughout the game, so that all frames share the same background
+    return svg_gamestate(frame.state, last_move=frame.last_move, ds=ds, turn_marker=frame.state.turn,
+                         swap_ints=False, layered=True, background=background)
+
+
+def _render_frame(frame: Frame, ds: DisplayStyle, palette: bool, **kwargs) -> bytes:
+    png = svg2png_bytes(_frame_drawing(frame, ds), **kwargs)
+    if not palette:
+        return png
+    # quantizing here (i.e. in the workers) also keeps the frames small while they wait for the encoder
+    image = Image.open(BytesIO(png)).convert('RGB').quantize(colors=256)
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def bounded_map(
+        func: Callable[[T], R],
+        items: Iterable[T],
+        executor: Executor | None = None,
+        max_pending: int = 16,
+) -> Iterator[R]:
+    """Lazily map `func` over `items` (in order), with at most `max_pending` items submitted to the executor at once.
+
+    Without executor, the items are mapped in this process.
+    """
+    if executor is None:
+        yield from map(func, items)
+        return
+
+    pending: deque[Future[R]] = deque()
+    for item in items:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+    while len(pending) > 0:
+        yield pending.popleft().result()
+
+
+def _write_raster(
+        path: Path,
+        fmt: str,
+        frames: list[Frame],
+        images: Iterator[bytes],
+        loop: bool,
+        palette: bool,
+):
+    def open_image(png: bytes) -> Image.Image:
+        image = Image.open(BytesIO(png))
+        image.load()
+        return image
+
+    first = open_image(next(images))
+    # GIF counts in units of 10ms
+    durations = [max(10, round(1000 * f.duration, -1 if fmt == 'GIF' else 0)) for f in frames]
+    append_images: Iterable[Image.Image]
+    if fmt == 'GIF':
+        append_images = (open_image(png) for png in images)
+    else:
+        # the APNG encoder passes over the frames twice - opened images are decoded only when needed, though
+        append_images = [Image.open(BytesIO(png)) for png in images]
+    options: dict[str, Any] = dict(save_all=True, append_images=append_images, duration=durations)
+    if fmt == 'GIF':
+        if loop:
+            options['loop'] = 0
+    else:
+        options['loop'] = 0 if loop else 1
+        if palette:
+            options['optimize'] = True
+    first.save(path, format=fmt, **options)
+
+
+def _write_svg(
+        path: Path,
+        ds: DisplayStyle,
+        frames: list[Frame],
+        groups: Iterator[str],
+        loop: bool,
+):
+    drawing = BoardDrawing(ds, layered=True)
+    width, height = drawing['width'], drawing['height']
+    x, y = drawing.origin
+    total = sum(f.duration for f in frames)
+    static = tostring(drawing.static_layer(swap_ints=False).get_xml(), encoding='unicode')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            f'baseProfile="full" version="1.1" width="{width}" height="{height}">\n'
+        )
+        f.write(f'<g transform="translate({x},{y})">{static}</g>\n')
+        if loop:
+            # a clock restarting itself, to which all frames are synchronized
+            f.write(f'<rect width="0" height="0"><animate id="clock" attributeName="x" values="0;0" '
+                    f'dur="{total:.3f}s" begin="0s;clock.end"/></rect>\n')
+
+        t = 0.0
+        for k, (frame, group) in enumerate(zip(frames, groups)):
+            begin = f"clock.begin+{t:.3f}s" if loop else f"{t:.3f}s"
+            freeze = ' fill="freeze"' if not loop and k == len(frames) - 1 else ''
+            f.write(f'<g visibility="hidden"><set attributeName="visibility" to="visible" begin="{begin}" '
+                    f'dur="{frame.duration:.3f}s"{freeze}/>{group}</g>\n')
+            t += frame.duration
+        f.write('</svg>\n')
+
+
+def _frame_group(frame: Frame, ds: DisplayStyle) -> str:
+    # the position is the last element of the drawing (after the `defs`)
+    group = _frame_drawing(frame, ds, background=False).elements[-1]
+    return tostring(group.get_xml(), encoding='unicode')
+
+
+def animate_game(
+        game: Game | Sequence[Transition],
+        path: str | PathLike,
+        ds: DisplayStyle | None = None,
+        durations: dict[ActionType, float] | None = None,
+        speed: float = 1.0,
+        final_pause: float = 2.0,
+        loop: bool = True,
+        palette: bool = True,
+        max_workers: int | None = 0,
+        max_pending: int | None = None,
+        **kwargs,
+) -> list[Frame]:
+    """Export a game as animated GIF, APNG or SVG (chosen by the suffix of `path`: .gif, .png/.apng or .svg).
+
+    The frames are rendered lazily (optionally in worker processes) and streamed to the encoder. Note, however, that
+    PIL keeps all (palette) frames of GIF and APNG files until it writes them, whereas animated SVGs (animated with
+    SMIL, sharing a single board background) are written frame by frame.
+
+    Args:
+        game (Game | Sequence[Transition]):     The game or its history.
+        path (str | PathLike):                  The file to write.
+        ds (DisplayStyle):                      The display style.
+        durations (dict[ActionType, float]):    Seconds to show the state after each type of action (see
+                                                `game_frames`).
+        speed (float):                          Playback speed.
+        final_pause (float):                    Additional seconds to show the final state.
+        loop (bool):                            Whether to play the animation in an endless loop.
+        palette (bool):                         Whether to convert the frames of APNGs to palette mode (256 colors),
+                                                which makes the files (and the memory used) much smaller. GIFs always
+                                                have palette frames.
+        max_workers (int | None):               Number of worker processes to render frames. With 0, render in this
+                                                process; with None, use as many processes as there are CPUs.
+        max_pending (int | None):               Maximum number of frames rendered ahead of the encoder (defaults to
+                                                four per worker).
+        **kwargs:                               Keyword arguments are passed to `svg2png` (see `svg2image`).
+    Returns:
+        frames (list[Frame]):   The exported frames.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    formats = {'.gif': 'GIF', '.png': 'PNG', '.apng': 'PNG', '.svg': 'SVG'}
+    if suffix not in formats:
+        raise ValueError(f"cannot infer the animation format from '{path.name}' (use .gif, .png, .apng or .svg)")
+    fmt = formats[suffix]
+
+    if ds is None:
+        ds = DisplayStyle()
+    frames = game_frames(game, durations=durations, speed=speed, final_pause=final_pause)
+
+    func: Callable[[Frame], str | bytes]
+    if fmt == 'SVG':
+        func = partial(_frame_group, ds=ds)
+    else:
+        func = partial(_render_frame, ds=ds, palette=palette or fmt == 'GIF', **kwargs)
+
+    executor = None if max_workers == 0 else ProcessPoolExecutor(max_workers)
+    try:
+        if max_pending is None:
+            max_pending = 4 * ((cpu_count() or 1) if max_workers is None else max(1, max_workers))
+        results = bounded_map(func, frames, executor, max_pending)
+        if fmt == 'SVG':
+            _write_svg(path, ds, frames, results, loop)  # type: ignore[arg-type]
+        else:
+            _write_raster(path, fmt, frames, results, loop, palette or fmt == 'GIF')  # type: ignore[arg-type]
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return frames
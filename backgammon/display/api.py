@@ -19,11 +19,12 @@ def svg_board(
         highlight_chk: Iterable[int | tuple[int, int]] | dict[int | tuple[int, int], Any] | None = None,
         swap_ints: bool = False,
         show_pips: bool = True,
+        layered: bool = False,
 ) -> BoardDrawing:
     if ds is None:
         ds = DisplayStyle()
 
-    drawing = BoardDrawing(ds)
+    drawing = BoardDrawing(ds, layered=layered)
     drawing.add(drawing.board(
         board,
         dice=dice, dice_colors=dice_colors,
@@ -69,6 +70,8 @@ def svg_gamestate(
         highlight_chk: Iterable[int | tuple[int, int]] | dict[int | tuple[int, int], Any] | None = None,
         swap_ints: bool | None = None,
         show_pips: bool = True,
+        layered: bool = False,
+        background: bool = True,
 ) -> BoardDrawing:
     if ds is None:
         ds = DisplayStyle()
@@ -100,7 +103,7 @@ def svg_gamestate(
     if swap_ints is None:
         swap_ints = state.turn == Color.BLACK
 
-    drawing = BoardDrawing(ds)
+    drawing = BoardDrawing(ds, layered=layered)
     drawing.add(drawing.board(
         state.board,
         dice=dice,
@@ -110,7 +113,8 @@ def svg_gamestate(
         highlight_pnt=highlight_pnt,
         highlight_chk=highlight_chk,
         swap_ints=swap_ints,
-        show_pips=show_pips
+        show_pips=show_pips,
+        background=background,
     ))
 
     return drawing
@@ -1,69 +1,63 @@
 from typing import Sequence
-from numpy.typing import NDArray
-import numpy as np
+from functools import lru_cache
 
-from ..core import Color
 from ..core.board import Board, WHITE_BAR, BLACK_BAR
 
 
 COLOR_SYMBOLS = ('X', ' ', 'O')
 
+_ROW = '|  %s  %s  %s  %s  %s  %s  | %s |  %s  %s  %s  %s  %s  %s  |'
+_TOP = "+-13-14-15-16-17-18--+---+-19-20-21-22-23-24--+"
+_BOTTOM = "+-12-11-10--9--8--7--+---+--6--5--4--3--2--1--+"
+_TEMPLATE = '\n'.join([_ROW] * 5 + ["|                    |   |                    |"] + [_ROW] * 5)
+_TEMPLATES = {
+    False: _TOP + '\n' + _TEMPLATE + '\n' + _BOTTOM,
+    True: _BOTTOM + '\n' + _TEMPLATE + '\n' + _TOP + '\n',
+}
+
+
+@lru_cache(maxsize=8)
+def _stacks(syms: tuple[str, str, str]) -> dict[int, tuple[str, ...]]:
+    """The five characters of a point with `n` checkers (positive for O), from the edge of the board."""
+    stacks = {}
+    for n in range(-15, 16):
+        sign = (n > 0) - (n < 0)
+        rest = n - sign * min(abs(n), 4)
+        exceed = ' ' if rest == 0 else syms[sign + 1] if abs(rest) == 1 else str(abs(rest))[0]
+        stacks[n] = tuple(syms[sign + 1] if abs(n) > i else syms[1] for i in range(4)) + (exceed,)
+    return stacks
+
 
 def board_ascii_art(board: Board, info: bool = True, swap_ints: bool = False,
                     syms: Sequence[str] = COLOR_SYMBOLS) -> str:
     assert len(syms) == 3
     assert all(isinstance(s, str) for s in syms)
     assert all(len(s) == 1 for s in syms)
-    symbols = np.array(syms)
-
-    def build_half(points: NDArray[np.int_], bottom: bool, bar: int):
-        points = np.concatenate([points[:6], np.array([bar]), points[6:]])
-
-        rows = []
-        for i in range(4):
-            signs = np.sign(points)
-            rows.append(symbols[signs + 1])
-            points -= signs
-
-        def exceed_char(n):
-            if n == 0:
-                return ' '
-            elif abs(n) == 1:
-                return symbols[np.sign(n) + 1]
-            else:  # more than checker left
-                return str(abs(n))
-
-        rows.append(np.fromiter(map(exceed_char, points), dtype='U1'))
-        rows_np = np.array(rows)
-        rows_np[:, 6] = rows_np[::-1, 6]  # stack board on bar from center, not from edge
-
-        if bottom:
-            rows_np = rows_np[::-1, ::-1]
-
-        def build_row(row):
-            return '|  ' + '  '.join(row[:6]) + f'  | {row[6]} |  ' + '  '.join(row[7:]) + '  |'
+    stacks = _stacks(tuple(syms))  # type: ignore[arg-type]
 
-        rows = [build_row(row) for row in rows_np]
+    p = board.points.tolist()
+    top = [stacks[n] for n in p[13:19]], stacks[p[WHITE_BAR]], [stacks[n] for n in p[19:25]]
+    bottom = [stacks[n] for n in p[12:6:-1]], stacks[p[BLACK_BAR]], [stacks[n] for n in p[6:0:-1]]
 
-        return '\n'.join(rows)
+    chars: list[str] = []
+    # the checkers on the bar are stacked from the center, the others from the edge
+    for i in range(5):
+        chars += [s[i] for s in top[0]]
+        chars.append(top[1][4 - i])
+        chars += [s[i] for s in top[2]]
+    for i in range(4, -1, -1):
+        chars += [s[i] for s in bottom[0]]
+        chars.append(bottom[1][4 - i])
+        chars += [s[i] for s in bottom[2]]
 
-    if swap_ints:
-        s = "+-12-11-10--9--8--7--+---+--6--5--4--3--2--1--+\n"
-    else:
-        s = "+-13-14-15-16-17-18--+---+-19-20-21-22-23-24--+\n"
-    s += build_half(board.points[13:25], False, board.points[WHITE_BAR])
-    s += "\n|                    |   |                    |\n"
-    s += build_half(board.points[1:13], True, board.points[BLACK_BAR])
-    if swap_ints:
-        s += "\n+-13-14-15-16-17-18--+---+-19-20-21-22-23-24--+\n"
-    else:
-        s += "\n+-12-11-10--9--8--7--+---+--6--5--4--3--2--1--+"
+    s = _TEMPLATES[swap_ints] % tuple(chars)
 
     if info:
-        s += '\n'
-        for color, name in [(Color.BLACK, "Black"), (Color.WHITE, "White")]:
-            cnt = board.pip_count(color)
-            borne_off = 15 - board.checkers_count(color)
-            s += f"\n{name}:  {cnt:3d} pips  /  borne off: {borne_off:2d}"
+        black_pips = sum((25 - k) * -n for k, n in enumerate(p) if n < 0)
+        white_pips = sum(k * n for k, n in enumerate(p) if n > 0)
+        black_off = 15 + sum(n for n in p if n < 0)
+        white_off = 15 - sum(n for n in p if n > 0)
+        s += (f"\n\nBlack:  {black_pips:3d} pips  /  borne off: {black_off:2d}"
+              f"\nWhite:  {white_pips:3d} pips  /  borne off: {white_off:2d}")
 
     return s
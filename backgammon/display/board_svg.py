@@ -1,4 +1,5 @@
 from typing import Any, Iterable
+from xml.etree.ElementTree import Element
 from svgwrite import shapes, container, gradients  # type: ignore
 
 from .drawing_plus import DrawingPlus
@@ -8,7 +9,29 @@ from .tools import brighten_color
 from ..core.board import Board
 
 
+class StaticLayer:
+    """An already serialized part of a drawing, that can be added to any number of drawings."""
+    elementname = 'g'
+
+    def __init__(self, xml: Element):
+        self.xml = xml
+
+    def get_xml(self) -> Element:
+        return self.xml
+
+
+# static layers (checker definitions and empty board, or only the definitions) by display style and numbering of the
+# points
+_STATIC_LAYERS: dict[tuple[Any, bool, bool], StaticLayer] = {}
+
+
 class BoardDrawing(DrawingPlus):
+    """A drawing of a backgammon board.
+
+    With `layered`, the static layer of the board (the checker definitions and the empty board) is built only once
+    for each display style and then reused, i.e. the drawing itself only contains the elements of the position. Without
+    background, the drawing still gets the (static) checker definitions.
+    """
 
     def __init__(
             self,
@@ -17,6 +40,7 @@ class BoardDrawing(DrawingPlus):
             origin: Iterable[float | int] | None = None,
             filename: str = "noname.svg",
             profile: str = "full",
+            layered: bool = False,
             **extra
     ):
         if size is None:
@@ -29,7 +53,10 @@ class BoardDrawing(DrawingPlus):
         super().__init__(size=size, origin=origin, filename=filename, profile=profile, **extra)
 
         self.ds = ds
-        self._def_checkers()
+        self.layered = layered
+        self._has_defs = not layered
+        if not layered:
+            self._def_checkers()
 
     def _def_checkers(self):
         for color in (Color.BLACK, Color.WHITE):
@@ -51,6 +78,21 @@ class BoardDrawing(DrawingPlus):
             checker = self.circle((0, 0), r=self.ds.scale/2, fill=f"url(#{grad_name})", id=name)
             self.defs.add(checker)
 
+    def static_layer(self, swap_ints: bool = False, with_board: bool = True) -> StaticLayer:
+        """The checker definitions and (with `with_board`) the empty board."""
+        key = (self.ds.key(), swap_ints and with_board, with_board)
+        layer = _STATIC_LAYERS.get(key)
+        if layer is None:
+            drawing = BoardDrawing(self.ds)
+            g = drawing.g()
+            # the drawing's own `defs` are shifted to its origin, as any top level element
+            defs = g.add(container.Defs())
+            defs.elements.extend(drawing.defs.elements)
+            if with_board:
+                g.add(drawing.empty_board(flip_points=swap_ints))
+            layer = _STATIC_LAYERS[key] = StaticLayer(g.get_xml())
+        return layer
+
     def checker(self, center: Any, color: Color, **extra) -> container.Use:
         name = f"#checker_{color.name}"
         return self.use(name, center, **extra)
@@ -210,13 +252,20 @@ class BoardDrawing(DrawingPlus):
             highlight_chk: Iterable[int | tuple[int, int]] | dict[int | tuple[int, int], Any] | None = None,
             swap_ints: bool = True,
             show_pips: bool = True,
+            background: bool = True,
     ) -> container.Group:
         # TODO: highlight borne off board
         ds = self.ds
         b = self.g()
 
-        # background / board
-        b.add(self.empty_board(flip_points=swap_ints))
+        # background / board (leave it out to draw only what changes between positions)
+        if background:
+            b.add(self.static_layer(swap_ints) if self.layered else self.empty_board(flip_points=swap_ints))
+            self._has_defs = True
+        elif not self._has_defs:
+            # the checkers refer to their definitions - in the drawing, not in the returned group
+            self.defs.add(self.static_layer(with_board=False))
+            self._has_defs = True
 
         # highlight points
         if highlight_pnt is not None:
@@ -0,0 +1,116 @@
+from typing import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from os import PathLike
+from pathlib import Path
+from numpy.typing import NDArray
+from PIL import Image, ImageDraw  # type: ignore
+import numpy as np
+
+from ..core import Board, GameState
+from .style import DisplayStyle
+from .api import svg_board, svg_gamestate
+from .animation import bounded_map
+from .tools import svg2png_bytes
+
+Position = GameState | Board | NDArray[np.integer]
+
+
+def thumbnail_size(ds: DisplayStyle, width: int) -> tuple[int, int]:
+    """The size of a thumbnail with the given width, keeping the aspect ratio of the board."""
+    height = (ds.height + 2 * ds.boarder[1]) / (ds.width + 2 * ds.boarder[0]) * width
+    return width, round(height)
+
+
+def _render_tiles(positions: Sequence[Position], ds: DisplayStyle, size: tuple[int, int], **kwargs) -> list[bytes]:
+    tiles = []
+    for pos in positions:
+        if isinstance(pos, GameState):
+            drawing = svg_gamestate(pos, ds=ds, turn_marker=pos.turn, swap_ints=False, layered=True)
+        else:
+            drawing = svg_board(pos if isinstance(pos, Board) else Board(pos), ds=ds, layered=True)
+        tiles.append(svg2png_bytes(drawing, output_width=size[0], output_height=size[1], **kwargs))
+    return tiles
+
+
+def contact_sheets(
+        positions: Sequence[Position] | NDArray[np.integer],
+        width: int = 240,
+        columns: int = 6,
+        rows: int | None = None,
+        labels: Sequence[str] | None = None,
+        ds: DisplayStyle | None = None,
+        padding: int = 4,
+        max_workers: int | None = 0,
+        chunksize: int = 16,
+        **kwargs,
+) -> Iterator[Image.Image]:
+    """Render many positions as thumbnails, tiled into contact sheets.
+
+    The sheets are produced one after the other, so that only the thumbnails of a single sheet are kept in memory.
+
+    Args:
+        positions (Sequence[Position] | NDArray):   GameStates, Boards or points of shape (n, 26).
+        width (int):                                Width of a thumbnail in pixels (the height keeps the aspect ratio).
+        columns (int):                              Number of thumbnails per row.
+        rows (int | None):                          Number of rows per sheet. With None, all positions are put on a
+                                                    single sheet.
+        labels (Sequence[str] | None):              A caption for each position, e.g. an index or an equity loss.
+        ds (DisplayStyle):                          The display style.
+        padding (int):                              Space between the thumbnails in pixels.
+        max_workers (int | None):                   Number of worker processes to render the thumbnails. With 0,
+                                                    render in this process; with None, use as many processes as
+                                                    there are CPUs.
+        chunksize (int):                            Number of thumbnails rendered by a worker at once.
+        **kwargs:                                   Keyword arguments are passed to `svg2png` (see `svg2image`).
+    Yields:
+        sheet (PIL.Image.Image):    The contact sheets.
+    """
+    if ds is None:
+        ds = DisplayStyle()
+    if labels is not None and len(labels) != len(positions):
+        raise ValueError(f"got {len(labels)} labels for {len(positions)} positions")
+    n = len(positions)
+    per_sheet = n if rows is None else rows * columns
+    size = thumbnail_size(ds, width)
+    label_height = 0 if labels is None else 14
+
+    render = partial(_render_tiles, ds=ds, size=size, **kwargs)
+    chunks = (positions[i:i + chunksize] for i in range(0, n, chunksize))
+    executor = None if max_workers == 0 else ProcessPoolExecutor(max_workers)
+    try:
+        tiles = (tile for chunk in bounded_map(render, chunks, executor, max_pending=32) for tile in chunk)
+        for start in range(0, n, per_sheet):
+            count = min(per_sheet, n - start)
+            n_cols = min(columns, count)
+            n_rows = -(-count // columns)
+            sheet = Image.new('RGB', (
+                n_cols * (size[0] + padding) + padding,
+                n_rows * (size[1] + label_height + padding) + padding,
+            ), 'white')
+            draw = ImageDraw.Draw(sheet) if labels is not None else None
+            for k in range(count):
+                x = padding + (k % columns) * (size[0] + padding)
+                y = padding + (k // columns) * (size[1] + label_height + padding)
+                with Image.open(BytesIO(next(tiles))) as tile:
+                    sheet.paste(tile, (x, y))
+                if draw is not None and labels is not None:
+                    draw.text((x + 2, y + size[1] + 1), labels[start + k], fill='black')
+            yield sheet
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def save_contact_sheets(
+        positions: Sequence[Position] | NDArray[np.integer],
+        path: str | PathLike = "sheet_{:03d}.png",
+        **kwargs,
+) -> list[Path]:
+    """Render contact sheets (see `contact_sheets` for the arguments) and save them as `path.format(<index>)`."""
+    paths = []
+    for k, sheet in enumerate(contact_sheets(positions, **kwargs)):
+        paths.append(Path(str(path).format(k)))
+        sheet.save(paths[-1])
+    return paths
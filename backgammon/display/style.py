@@ -38,6 +38,10 @@ class DisplayStyle:
         self.highlight_color_2 = highlight_color_2
         self.font = font
 
+    def key(self) -> tuple:
+        """A hashable key of all style settings (e.g. to cache drawings)."""
+        return tuple(sorted(vars(self).items()))
+
     @property
     def point_width(self) -> float:
         return 1.1 * self.scale
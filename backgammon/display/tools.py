@@ -1,9 +1,15 @@
+from typing import TYPE_CHECKING, Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
 import numpy as np
-from matplotlib.colors import hex2color, rgb2hex  # type: ignore
 from svgwrite import Drawing  # type: ignore
-from PIL import Image  # type: ignore
-from tempfile import NamedTemporaryFile  # type: ignore
-from cairosvg import svg2png  # type: ignore
+
+if TYPE_CHECKING:
+    from PIL import Image  # type: ignore
+
+# matplotlib, PIL and cairosvg are imported when they are needed - cairosvg, in particular, is only needed (and needs
+# the cairo library) for rasterizing
 
 
 def staple_pos(pos: int, max_n: int) -> float:
@@ -18,29 +24,87 @@ def staple_pos(pos: int, max_n: int) -> float:
 
 
 def brighten_color(color_hex: str, factor: float) -> str:
+    from matplotlib.colors import hex2color, rgb2hex  # type: ignore
     return rgb2hex(np.clip(np.array(hex2color(color_hex)) * factor, 0, 1))
 
 
-def svg2image(svg: Drawing, **kwargs) -> Image.Image:
+def _svg_bytes(svg: Drawing | str | bytes) -> bytes:
+    if isinstance(svg, Drawing):
+        svg = svg.tostring()
+    return svg.encode('utf-8') if isinstance(svg, str) else svg
+
+
+def svg2png_bytes(svg: Drawing | str | bytes, **kwargs) -> bytes:
+    """Rasterize an SVG (a Drawing or its source) into PNG data, entirely in memory.
+
+    Args:
+         svg (Drawing | str | bytes):   The SVG to convert.
+         **kwargs:                      Keyword arguments are passed to `svg2png` (see `svg2image`).
+    Retuns:
+        png (bytes):    The PNG data.
+    """
+    from cairosvg import svg2png  # type: ignore
+    buffer = BytesIO()
+    svg2png(bytestring=_svg_bytes(svg), write_to=buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def png2image(png: bytes) -> 'Image.Image':
+    from PIL import Image
+    image = Image.open(BytesIO(png))
+    image.load()
+    return image
+
+
+def svg2image(svg: Drawing | str | bytes, **kwargs) -> 'Image.Image':
     """Convert an SVG Drawing into a PIL Image.
 
     Args:
-         svg (Drawing): The SVG to convert.
-         **kwargs:      Keyword arguments are passed to `svg2png`. Most noteable, ther is
-                        dpi: int = 96,
-                        parent_width: Any = None,
-                        parent_height: Any = None,
-                        scale: int = 1,
-                        output_width: Any = None,
-                        output_height: Any = None,
+         svg (Drawing | str | bytes):   The SVG to convert (a Drawing or its source).
+         **kwargs:                      Keyword arguments are passed to `svg2png`. Most noteable, ther is
+                                        dpi: int = 96,
+                                        parent_width: Any = None,
+                                        parent_height: Any = None,
+                                        scale: int = 1,
+                                        output_width: Any = None,
+                                        output_height: Any = None,
     Retuns:
         image (PIL.Image.Image):    The converted image.
     """
-    # TODO: is there a better method - this is relatively slow (~50ms)
-    tmp_svg = NamedTemporaryFile('w+', encoding='utf-8')
-    with open(tmp_svg.name, 'w', encoding='utf-8') as f:
-        svg.write(f)
-
-    tmp_png = NamedTemporaryFile()
-    svg2png(url=tmp_svg.name, write_to=tmp_png.name, **kwargs)
-    return Image.open(tmp_png.name)
+    return png2image(svg2png_bytes(svg, **kwargs))
+
+
+def svgs2pngs(
+        svgs: Iterable[Drawing | str | bytes],
+        max_workers: int | None = 0,
+        chunksize: int = 8,
+        **kwargs,
+) -> list[bytes]:
+    """Rasterize many SVGs into PNG data (e.g. to save a whole game archive).
+
+    Args:
+         svgs (Iterable[Drawing | str | bytes]):    The SVGs to convert.
+         max_workers (int | None):                  Number of worker processes. With 0, convert in this process;
+                                                    with None, use as many processes as there are CPUs.
+         chunksize (int):                           Number of SVGs sent to a worker at once.
+         **kwargs:                                  Keyword arguments are passed to `svg2png` (see `svg2image`).
+    Retuns:
+        pngs (list[bytes]): The PNG data, in the order of the SVGs.
+    """
+    # the Drawings are serialized here, as only their sources are sent to the workers
+    sources = [_svg_bytes(svg) for svg in svgs]
+    convert: Callable[[bytes], bytes] = partial(svg2png_bytes, **kwargs)
+    if max_workers == 0 or len(sources) <= 1:
+        return [convert(src) for src in sources]
+    with ProcessPoolExecutor(max_workers) as pool:
+        return list(pool.map(convert, sources, chunksize=chunksize))
+
+
+def svgs2images(
+        svgs: Iterable[Drawing | str | bytes],
+        max_workers: int | None = 0,
+        chunksize: int = 8,
+        **kwargs,
+) -> list['Image.Image']:
+    """Convert many SVGs into PIL Images. See `svgs2pngs` for the arguments."""
+    return [png2image(png) for png in svgs2pngs(svgs, max_workers, chunksize, **kwargs)]
@@ -1,7 +1,15 @@
 from . import agent
+from . import instrument
 from . import game
 from . import match
+from . import vec_game
+from . import scheduler
+from . import logger
 
 from .agent import Agent
+from .instrument import Instrumentation
 from .game import Action, Game, ActionType, Transition
 from .match import Match
+from .vec_game import VecGame
+from .scheduler import BatchScheduler, BatchStats
+from .logger import GameLogger, read_games
@@ -1,10 +1,14 @@
-from typing import Collection, Iterable
+from typing import Any, Callable, Collection, Iterable, TypeVar
 from dataclasses import dataclass
 from enum import Enum, auto
+from time import perf_counter
 import random
 
-from ..core import Color, GameResult, WinType, Move, GameState
+from ..core import Color, GameResult, WinType, Move, Board, GameState
 from .agent import Agent
+from .instrument import Instrumentation
+
+T = TypeVar('T')
 
 
 class ActionType(Enum):
@@ -33,10 +37,24 @@ class Transition:
 
 class Game:
 
-    def __init__(self, state: GameState | None = None):
-        self.state = GameState() if state is None else state.copy()
+    def __init__(self, state: GameState | None = None, instrument: Instrumentation | None = None):
+        self.state = GameState(Board(incremental=True), copy=False) if state is None else state.copy()
         self.moves: list[tuple[int, Move]] = []
         self.history: list[Transition] = []
+        self.instrument = instrument
+
+    def _timed(self, phase: str | Agent, func: Callable[..., T], *args: Any) -> T:
+        if self.instrument is None:
+            return func(*args)
+        if isinstance(phase, Agent):
+            phase = self.instrument.agent_phase(phase)
+        t0 = perf_counter()
+        res = func(*args)
+        self.instrument.add(phase, perf_counter() - t0)
+        return res
+
+    def _copy_state(self) -> GameState:
+        return self._timed('history', self.state.copy)
 
     def _first_move(self) -> bool:
         if len(self.history) == 0:
@@ -74,10 +92,10 @@ class Game:
         return self.resigned() or self.state.board.game_over()
 
     def do_move(self, move: Move) -> 'Game':
-        state = self.state.copy()
+        state = self._copy_state()
         i = self.state.do_move(move)
         reward = self.state.result().stake if self.state.board.game_over() else 0
-        self.history.append(Transition(state, Action(move), self.state.copy(), reward))
+        self.history.append(Transition(state, Action(move), self._copy_state(), reward))
         self.moves.append((i, move))
         return self
 
@@ -114,7 +132,7 @@ class Game:
 
         if len(self.history) > 0 and self.history[-1].action.type == ActionType.DOUBLE:
             agent = agents[self.state.turn.other()]
-            if agent.will_take_doubling(self.state, points, match_ends_at):
+            if self._timed(agent, agent.will_take_doubling, self.state, points, match_ends_at):
                 action = Action(None, ActionType.TAKE)
                 self.state.doubling_turn = self.state.turn.other()
                 self.state.stake *= 2
@@ -126,19 +144,19 @@ class Game:
         if len(self.state.dice) == 0:
             if allow_doubling and len(self.history) > 0 and self.state.can_couble():
                 agent = agents[self.state.turn]
-                if agent.will_double(self.state, points, match_ends_at):
+                if self._timed(agent, agent.will_double, self.state, points, match_ends_at):
                     action = Action(None, ActionType.DOUBLE)
                     return action, 0
 
-            self.state.roll_dice()
+            self._timed('dice', self.state.roll_dice)
             return Action(None, ActionType.DICEROLL), 0
 
-        if len(self.state.build_legal_moves()) == 0:
+        if len(self._timed('legal_moves', self.state.build_legal_moves)) == 0:
             self.finish_turn()
             return Action(None, ActionType.FINISH_TURN), 0
 
         agent = agents[self.state.turn]
-        move = agent.choose_move(self.state)
+        move = self._timed(agent, agent.choose_move, self.state)
         self.do_move(move)
         return Action(move), self.history[-1].reward
 
@@ -149,9 +167,15 @@ class Game:
             match_ends_at: int = 1,
             allow_doubling: bool = True,
     ) -> Action | None:
-        prev_state = self.state.copy()
+        t0 = perf_counter() if self.instrument is not None else 0.0
+        prev_state = self._copy_state()
         action, reward = self._step(agents, points, match_ends_at, allow_doubling)
         if action is not None and action.type != ActionType.MOVE:
-            transition = Transition(prev_state, action, self.state.copy(), reward)
+            transition = Transition(prev_state, action, self._copy_state(), reward)
             self.history.append(transition)
+        if self.instrument is not None:
+            self.instrument.add('step', perf_counter() - t0)
+            self.instrument.count('steps')
+            if action is not None:
+                self.instrument.count(action.type.name.lower())
         return action
@@ -0,0 +1,108 @@
+from typing import Any, Callable, Collection, TypeVar, TYPE_CHECKING
+from collections import Counter, defaultdict
+from os import PathLike
+import io
+import numpy as np
+
+from .agent import Agent
+
+if TYPE_CHECKING:
+    import pstats
+
+T = TypeVar('T')
+
+SUMMARY_FIELDS = ('phase', 'count', 'total', 'mean', 'min', 'p50', 'p90', 'p99', 'max')
+
+
+class Instrumentation:
+    """Opt-in timers and counters for `Game` and `Match` (pass it as `instrument` to them).
+
+    Phases timed in `Game`: `step` (all of `Game.step`), `dice`, `legal_moves`, `history` (copying states for the
+    history) and `think[<agent>]` (time spent in the agent's `choose_move`, `will_double` and `will_take_doubling`).
+    In `Match`: `game` (all of `Match.play_single_game`) and `hooks` (the `after_move` hooks).
+
+    Args:
+        profile_games (Collection[int]):    Indices of games (in the order they are played by a `Match`) to capture
+                                            with cProfile. The captures are stored in `profiles`.
+    """
+
+    def __init__(self, profile_games: Collection[int] = ()):
+        self.timers: dict[str, list[float]] = defaultdict(list)
+        self.counters: Counter[str] = Counter()
+        self.profile_games = set(profile_games)
+        self.profiles: dict[int, 'pstats.Stats'] = {}
+        self._agent_phases: dict[int, str] = {}
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+        self.profiles.clear()
+
+    def add(self, phase: str, seconds: float):
+        self.timers[phase].append(seconds)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def agent_phase(self, agent: Agent) -> str:
+        phase = self._agent_phases.get(id(agent))
+        if phase is None:
+            # distinct agents with the same repr (e.g. two `RandomAgent()`s) get distinct phases
+            n_same = sum(p.startswith(f"think[{agent!r}]") for p in self._agent_phases.values())
+            phase = f"think[{agent!r}]" if n_same == 0 else f"think[{agent!r}]#{n_same + 1}"
+            self._agent_phases[id(agent)] = phase
+        return phase
+
+    def profile(self, index: int, func: Callable[[], T]) -> T:
+        """Call `func` and capture it with cProfile, if `index` is one of `profile_games`."""
+        if index not in self.profile_games:
+            return func()
+        # imported only when profiling, not by every `import backgammon`
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func)
+        finally:
+            self.profiles[index] = pstats.Stats(profiler)
+
+    def dump_profile(self, index: int, path: str | PathLike):
+        """Write the cProfile capture of a game, e.g. for `snakeviz` or `python -m pstats`."""
+        self.profiles[index].dump_stats(path)
+
+    def summary(self) -> list[dict[str, Any]]:
+        rows = []
+        for phase, times in sorted(self.timers.items()):
+            t = np.array(times)
+            p50, p90, p99 = np.percentile(t, [50, 90, 99])
+            rows.append(dict(phase=phase, count=len(t), total=float(t.sum()), mean=float(t.mean()),
+                             min=float(t.min()), p50=float(p50), p90=float(p90), p99=float(p99), max=float(t.max())))
+        return rows
+
+    def to_json(self, path: str | PathLike | None = None, raw: bool = False) -> str:
+        """Export the summary and the counters (and all raw timings, if `raw`) as JSON."""
+        import json
+
+        data: dict[str, Any] = dict(timers=self.summary(), counters=dict(self.counters))
+        if raw:
+            data['raw'] = dict(self.timers)
+        s = json.dumps(data, indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(s)
+        return s
+
+    def to_csv(self, path: str | PathLike | None = None) -> str:
+        """Export the summary of the timers as CSV (one row per phase)."""
+        import csv
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(self.summary())
+        s = buffer.getvalue()
+        if path is not None:
+            with open(path, 'w', newline='') as f:
+                f.write(s)
+        return s
@@ -0,0 +1,184 @@
+from typing import Iterable, Iterator, TextIO
+from os import PathLike
+
+from ..core import Color, Move, Board, GameState
+from .game import Game, Action, ActionType, Transition
+
+COLOR_CODES = {Color.BLACK: 'B', Color.NONE: '-', Color.WHITE: 'W'}
+CODE_COLORS = {c: color for color, c in COLOR_CODES.items()}
+ACTION_NAMES = {
+    ActionType.MOVE: 'move',
+    ActionType.DICEROLL: 'roll',
+    ActionType.FINISH_TURN: 'finish',
+    ActionType.DOUBLE: 'double',
+    ActionType.TAKE: 'take',
+    ActionType.DROP: 'drop',
+}
+
+
+def _actor(t: Transition) -> Color:
+    if t.action.type == ActionType.DICEROLL:
+        return t.next_state.turn  # the opening roll decides who starts
+    if t.action.type in (ActionType.TAKE, ActionType.DROP):
+        return t.state.turn.other()
+    return t.state.turn
+
+
+def format_transition(t: Transition) -> str:
+    """A single log line for an action, e.g. `W roll 3 1`, `W move 8/5*` or `B take`."""
+    color = COLOR_CODES[_actor(t)]
+    if t.action.type == ActionType.MOVE:
+        assert t.action.move is not None
+        return f"{color} move {t.action.move.to_str(bar_off=False, regular=False)}"
+    if t.action.type == ActionType.DICEROLL:
+        return f"{color} roll {' '.join(map(str, t.next_state.dice))}"
+    return f"{color} {ACTION_NAMES[t.action.type]}"
+
+
+def format_start(index: int, state: GameState) -> str:
+    points = ','.join(map(str, state.board.points.tolist()))
+    return (f"game {index} {COLOR_CODES[state.turn]} {state.stake} "
+            f"{COLOR_CODES[state.doubling_turn]} {points}")
+
+
+class GameLogger:
+    """Write a compact text log of games: a line for the start of a game, one line per action and a line for the end.
+
+    It can be used as hook of a `Match` (`match.play(after_move=[logger.after_move])`) or log complete games with
+    `log_game`. Lines of the log are::
+
+        game <index> <turn> <stake> <doubling turn> <points, comma separated>
+        <color> roll <dice>
+        <color> move <src>/<dst>[*]
+        <color> finish | double | take | drop
+        end <winner> <stake> <win type>
+
+    with colors `B`, `W` (or `-` for none) and the points as in `Board.points`. Board diagrams (with `boards`) are
+    indented and ignored by `read_games`, as are lines starting with `#`.
+
+    Args:
+        file (str | PathLike | TextIO): The file to write to (or an open text file).
+        boards (bool):                  Whether to write a board diagram after each turn.
+        buffering (int):                Size of the write buffer in bytes.
+    """
+
+    def __init__(self, file: str | PathLike | TextIO, boards: bool = False, buffering: int = 1 << 16):
+        if isinstance(file, (str, PathLike)):
+            self.file: TextIO = open(file, 'w', buffering=buffering, encoding='utf-8')
+            self._owns_file = True
+        else:
+            self.file = file
+            self._owns_file = False
+        self.boards = boards
+        self.n_games = 0
+        self._game: Game | None = None
+        self._n_logged = 0
+
+    def __enter__(self) -> 'GameLogger':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def _board(self, state: GameState):
+        from ..display.board_ascii import board_ascii_art
+        art = board_ascii_art(state.board, info=False)
+        self.file.write('    ' + art.replace('\n', '\n    ') + '\n')
+
+    def _start(self, game: Game):
+        self._game = game
+        self._n_logged = 0
+        state = game.history[0].state if len(game.history) > 0 else game.state
+        self.file.write(format_start(self.n_games, state) + '\n')
+        self.n_games += 1
+
+    def _end(self, game: Game):
+        res = game.result()
+        self.file.write(f"end {COLOR_CODES[res.winner]} {res.stake} {res.wintype.name}\n")
+        if self.boards:
+            self._board(game.state)
+        self._game = None
+
+    def after_move(self, game: Game, dice: list[int], action: Action | None) -> bool:
+        """Log the actions of `game` not logged yet (a `MoveHook` of `Match`)."""
+        if game is not self._game:
+            self._start(game)
+        history = game.history
+        write = self.file.write
+        for t in history[self._n_logged:]:
+            write(format_transition(t) + '\n')
+            if self.boards and t.action.type == ActionType.FINISH_TURN:
+                self._board(t.next_state)
+        self._n_logged = len(history)
+        if game.game_over():
+            self._end(game)
+        return False
+
+    def log_game(self, game: Game):
+        """Log a complete game."""
+        self._start(game)
+        self.after_move(game, game.state.dice, None)
+
+
+def _replay(game: Game, color: Color, kind: str, args: list[str]):
+    state = game.state
+    prev = state.copy()
+    if kind == 'move':
+        src, dst = args[0].rstrip('*').split('/')
+        game.do_move(Move(int(src), int(dst), args[0].endswith('*')))
+        return
+    reward = 0
+    if kind == 'roll':
+        state.turn = color
+        state.dice = [int(d) for d in args]
+        state.dice_used = [False] * len(state.dice)
+        action_type = ActionType.DICEROLL
+    elif kind == 'finish':
+        game.finish_turn()
+        action_type = ActionType.FINISH_TURN
+    elif kind == 'double':
+        action_type = ActionType.DOUBLE
+    elif kind == 'take':
+        state.doubling_turn = color
+        state.stake *= 2
+        action_type = ActionType.TAKE
+    elif kind == 'drop':
+        action_type = ActionType.DROP
+        reward = -state.stake
+    else:
+        raise ValueError(f"unknown action '{kind}'")
+    game.history.append(Transition(prev, Action(None, action_type), state.copy(), reward))
+
+
+def read_games(lines: str | PathLike | Iterable[str]) -> Iterator[Game]:
+    """Replay the games of a log written by `GameLogger` (a file name or the lines of a log)."""
+    if isinstance(lines, (str, PathLike)):
+        with open(lines, encoding='utf-8') as f:
+            yield from read_games(f)
+        return
+
+    game: Game | None = None
+    for line in lines:
+        if line[:1] in ('#', ' ', '\n', ''):
+            continue
+        fields = line.split()
+        if fields[0] == 'game':
+            _, _, turn, stake, doubling_turn, points = fields
+            board = Board([int(p) for p in points.split(',')])
+            game = Game(GameState(board, CODE_COLORS[turn], int(stake), CODE_COLORS[doubling_turn], copy=False))
+        elif fields[0] == 'end':
+            if game is not None:
+                yield game
+            game = None
+        elif game is None:
+            raise ValueError(f"action outside of a game: {line.strip()}")
+        else:
+            _replay(game, CODE_COLORS[fields[0]], fields[1], fields[2:])
+    if game is not None:  # unfinished game
+        yield game
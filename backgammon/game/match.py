@@ -1,11 +1,12 @@
 from typing import Iterable, Callable, Any
+from time import perf_counter
 import numpy as np
 from numpy.typing import NDArray
-from tqdm.auto import tqdm  # type: ignore
 
 from ..core import Color, GameState
 from .agent import Agent
 from .game import Game, Action
+from .instrument import Instrumentation
 
 MoveHook = Callable[[Game, list[int], Action | None], bool]
 GameHook = Callable[[Game], bool]
@@ -19,6 +20,7 @@ class Match:
             n_points: int = 1,
             allow_doubling: bool = True,
             start_start: GameState | None = None,
+            instrument: Instrumentation | None = None,
     ):
         if isinstance(agents, Agent):
             agents = {Color.BLACK: agents, Color.WHITE: agents}
@@ -26,15 +28,15 @@ class Match:
         self.n_points = n_points
         self.allow_doubling = allow_doubling
         self.start_state = start_start
+        self.instrument = instrument
 
         self.points = [0, 0]
         self.games: list[Game] = []
 
         self._current_game: Game | None = None  # useful for debugging
 
-    def play_single_game(self, after_move: Iterable[MoveHook] = ()) -> Game:
-        game = Game(state=self.start_state)
-        self._current_game = game
+    def _play_game(self, game: Game, after_move: Iterable[MoveHook]):
+        instrument = self.instrument
         while not game.game_over():
             action = game.step(
                 self.agents,
@@ -42,9 +44,26 @@ class Match:
                 match_ends_at=self.n_points,
                 allow_doubling=self.allow_doubling,
             )
-            if any([hook(game, game.state.dice, action) for hook in after_move]):
+            if instrument is None:
+                stop = any([hook(game, game.state.dice, action) for hook in after_move])
+            else:
+                t0 = perf_counter()
+                stop = any([hook(game, game.state.dice, action) for hook in after_move])
+                instrument.add('hooks', perf_counter() - t0)
+            if stop:
                 break
 
+    def play_single_game(self, after_move: Iterable[MoveHook] = ()) -> Game:
+        game = Game(state=self.start_state, instrument=self.instrument)
+        self._current_game = game
+        if self.instrument is None:
+            self._play_game(game, after_move)
+        else:
+            t0 = perf_counter()
+            self.instrument.profile(len(self.games), lambda: self._play_game(game, after_move))
+            self.instrument.add('game', perf_counter() - t0)
+            self.instrument.count('games')
+
         self.games.append(game)
         res = game.result()
         if res.winner is not Color.NONE:
@@ -61,6 +80,7 @@ class Match:
             tqdm_disable: bool = False,
             tqdm_args: dict[str, Any] | None = None,
     ):
+        from tqdm.auto import tqdm  # type: ignore  # imported here, as it is slow to import
         args = dict(unit='points', smoothing=0.05, disable=tqdm_disable)
         if tqdm_args is not None:
             args.update(tqdm_args)
@@ -0,0 +1,159 @@
+from typing import Any, Callable, Generator, Hashable, Protocol, runtime_checkable
+from dataclasses import dataclass, field
+import time
+from numpy.typing import NDArray
+import numpy as np
+
+from ..core import Color, GameState
+from .agent import Agent
+from .game import Game, ActionType
+
+
+@runtime_checkable
+class BatchAgent(Protocol):
+    """An agent, that chooses its moves based on evaluations by `evaluator` (e.g. `backgammon.agents.EvaluatorAgent`).
+
+    When `has_plan(state)` is false, `choose_move(state)` would evaluate `candidates(state)`. Instead, the evaluations
+    can be done beforehand and passed to `select`.
+    """
+
+    evaluator: Callable[[NDArray[np.integer]], NDArray[np.floating]]
+
+    def has_plan(self, state: GameState) -> bool: ...
+
+    def candidates(self, state: GameState) -> tuple[Any, NDArray[np.integer]]: ...
+
+    def select(self, state: GameState, candidates: Any, values: NDArray[np.floating]) -> Any: ...
+
+
+@dataclass
+class BatchStats:
+    """Statistics on the evaluator calls of a `BatchScheduler`."""
+    batch_sizes: list[int] = field(default_factory=list)  # number of positions per evaluator call
+    batch_requests: list[int] = field(default_factory=list)  # number of agent decisions per evaluator call
+
+    @property
+    def n_batches(self) -> int:
+        return len(self.batch_sizes)
+
+    @property
+    def mean_batch_size(self) -> float:
+        return float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0
+
+    def summary(self) -> dict[str, float]:
+        sizes = np.array(self.batch_sizes) if self.batch_sizes else np.zeros(1)
+        return dict(
+            n_batches=self.n_batches,
+            n_positions=int(np.sum(self.batch_sizes)),
+            n_requests=int(np.sum(self.batch_requests)),
+            mean_batch_size=self.mean_batch_size,
+            median_batch_size=float(np.median(sizes)),
+            max_batch_size=int(np.max(sizes)),
+            mean_requests=float(np.mean(self.batch_requests)) if self.batch_requests else 0.0,
+        )
+
+
+Request = tuple[BatchAgent, NDArray[np.integer]]
+
+
+class BatchScheduler:
+    """Play many games cooperatively, evaluating the candidate positions of all games together.
+
+    Each game runs in a generator that pauses, whenever a `BatchAgent` would evaluate candidates in `choose_move`.
+    The pending positions of all paused games are gathered into one batch per evaluator, evaluated in one call and the
+    games are resumed. Other agents are simply called as usual.
+
+    Args:
+        agents (Agent | dict[Color, Agent]):    The agents to play the games.
+        max_batch_size (int):                   Evaluate as soon as this many positions are pending.
+        max_wait (float):                       Evaluate as soon as the oldest pending request waited this long (in
+                                                seconds), even if more games could still add to the batch.
+        allow_doubling (bool):                  Whether doubling is allowed in the games.
+    """
+
+    def __init__(
+            self,
+            agents: Agent | dict[Color, Agent],
+            max_batch_size: int = 4096,
+            max_wait: float = 0.05,
+            allow_doubling: bool = True,
+    ):
+        if isinstance(agents, Agent):
+            agents = {Color.BLACK: agents, Color.WHITE: agents}
+        self.agents: dict[Color, Agent] = agents
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.allow_doubling = allow_doubling
+        self.stats = BatchStats()
+
+    def _next_agent(self, game: Game) -> BatchAgent | None:
+        # the batch agent that would evaluate in the next step (cf. `Game._step`)
+        state = game.state
+        if len(state.dice) == 0 or game.game_over():
+            return None
+        if len(game.history) > 0 and game.history[-1].action.type == ActionType.DOUBLE:
+            return None
+        agent = self.agents[state.turn]
+        if not isinstance(agent, BatchAgent) or agent.has_plan(state):
+            return None
+        if len(state.build_legal_moves()) == 0:
+            return None
+        return agent
+
+    def _run(self, game: Game) -> Generator[Request, NDArray[np.floating], Game]:
+        while not game.game_over():
+            agent = self._next_agent(game)
+            if agent is not None:
+                candidates, points = agent.candidates(game.state)
+                values = yield agent, points
+                agent.select(game.state, candidates, values)
+            game.step(self.agents, allow_doubling=self.allow_doubling)
+        return game
+
+    def _evaluate(self, pending: list[tuple[Generator, Request]]) -> list[tuple[Generator, NDArray[np.floating]]]:
+        by_evaluator: dict[Hashable, list[tuple[Generator, Request]]] = {}
+        for item in pending:
+            by_evaluator.setdefault(id(item[1][0].evaluator), []).append(item)
+
+        results = []
+        for items in by_evaluator.values():
+            evaluator = items[0][1][0].evaluator
+            points = np.concatenate([points for _, (_, points) in items])
+            values = evaluator(points)
+            self.stats.batch_sizes.append(len(points))
+            self.stats.batch_requests.append(len(items))
+            splits = np.cumsum([len(points) for _, (_, points) in items])[:-1]
+            results += [(gen, v) for (gen, _), v in zip(items, np.split(values, splits))]
+        return results
+
+    def play(self, games: int | list[Game], start_state: GameState | None = None) -> list[Game]:
+        """Play the given games (or the given number of new games) until they are over."""
+        if isinstance(games, int):
+            games = [Game(state=start_state) for _ in range(games)]
+
+        # (generator, value to send) - None starts a generator
+        runnable: list[tuple[Generator, Any]] = [(self._run(game), None) for game in games]  # type: ignore[misc]
+        pending: list[tuple[Generator, Request]] = []
+        n_pending = 0
+        since = 0.0
+
+        while runnable or pending:
+            while runnable:
+                gen, value = runnable.pop()
+                try:
+                    request = gen.send(value)
+                except StopIteration:
+                    continue
+                if not pending:
+                    since = time.perf_counter()
+                pending.append((gen, request))
+                n_pending += len(request[1])
+                if n_pending >= self.max_batch_size or time.perf_counter() - since >= self.max_wait:
+                    break
+
+            if pending:
+                runnable += self._evaluate(pending)
+                pending = []
+                n_pending = 0
+
+        return games
@@ -0,0 +1,146 @@
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+
+from ..core import Color, Move, Board, GameState, IllegalMoveError, START_POINTS
+from ..core.actions import N_ACTIONS, canonical_action_mask, action_to_move
+
+
+class VecGame:
+    """Many games of backgammon played in lockstep, backed by NumPy arrays (for reinforcement learning).
+
+    All boards are stored from the viewpoint of the player to move: their checkers are positive and move towards
+    point 0, i.e. they play the part of `Color.WHITE` (`turn` keeps track of the actual color). Each step moves a
+    single checker, as `Game.step` does. Turns are passed automatically once the dice are used up or no legal move is
+    left, and finished games are reset automatically. There is no doubling cube.
+
+    Actions are encoded as described in `backgammon.core.actions`.
+
+    Args:
+        n_games (int):  The number of games to play in parallel.
+        seed (int):     Seed for the random number generator rolling the dice.
+        checked (bool): Raise an `IllegalMoveError` if any of the actions passed to `step` is not legal.
+    """
+
+    def __init__(self, n_games: int, seed: int | None = None, checked: bool = True):
+        self.n_games = n_games
+        self.checked = checked
+        self.rng = np.random.default_rng(seed)
+
+        self.boards = np.zeros((n_games, 26), dtype=np.int8)
+        self.dice = np.zeros((n_games, 6), dtype=np.int8)
+        self.turn = np.zeros(n_games, dtype=np.int8)
+        self.masks = np.zeros((n_games, N_ACTIONS), dtype=bool)
+        self.n_steps = np.zeros(n_games, dtype=np.int64)
+
+        self._idx = np.arange(n_games)
+
+    def __len__(self) -> int:
+        return self.n_games
+
+    def _roll(self, idx: NDArray[np.int_], opening: bool = False):
+        n = len(idx)
+        rolls = self.rng.integers(1, 6 + 1, size=(n, 2))
+        if opening:
+            again = rolls[:, 0] == rolls[:, 1]
+            while np.any(again):
+                rolls[again] = self.rng.integers(1, 6 + 1, size=(np.sum(again), 2))
+                again = rolls[:, 0] == rolls[:, 1]
+            # same convention as `GameState.roll_dice`
+            self.turn[idx] = np.where(rolls[:, 0] > rolls[:, 1], Color.BLACK, Color.WHITE)
+
+        r = np.arange(n)
+        dice = np.zeros((n, 6), dtype=np.int8)
+        dice[r, rolls[:, 0] - 1] += 1
+        dice[r, rolls[:, 1] - 1] += 1
+        dice *= np.where(rolls[:, 0] == rolls[:, 1], 2, 1).astype(np.int8)[:, None]
+        self.dice[idx] = dice
+
+    def _reset(self, idx: NDArray[np.int_]):
+        # the start position is symmetric - it looks the same from both sides
+        self.boards[idx] = START_POINTS
+        self.n_steps[idx] = 0
+        self._roll(idx, opening=True)
+        self.masks[idx] = canonical_action_mask(self.boards[idx], self.dice[idx])
+
+    def _pass_turns(self, idx: NDArray[np.int_]):
+        # pass the turn in all given games, until a player actually has a legal move
+        while len(idx) > 0:
+            self.boards[idx] = -self.boards[idx, ::-1]
+            self.turn[idx] = -self.turn[idx]
+            self._roll(idx)
+            self.masks[idx] = canonical_action_mask(self.boards[idx], self.dice[idx])
+            idx = idx[~np.any(self.masks[idx], axis=1)]
+
+    def reset(self) -> tuple[NDArray[np.int8], NDArray[np.bool_]]:
+        """Start new games in all environments. Returns the observations and the legal-action masks."""
+        self._reset(self._idx)
+        return self.boards.copy(), self.masks.copy()
+
+    def step(
+            self,
+            actions: ArrayLike,
+    ) -> tuple[NDArray[np.int8], NDArray[np.float32], NDArray[np.bool_], NDArray[np.bool_]]:
+        """Do one action (i.e. move one checker) in every game.
+
+        Returns:
+            observations (NDArray[np.int8]):    The boards of shape (n_games, 26) from the viewpoint of the player to
+                                                move. For finished games, this is already the start of a new game.
+            rewards (NDArray[np.float32]):      The points won by the player that did the action (i.e. the stake of
+                                                the game, if it was won by this action, else zero).
+            dones (NDArray[np.bool_]):          Whether a game was finished (and reset) by this action.
+            masks (NDArray[np.bool_]):          The legal-action masks of shape (n_games, N_ACTIONS) for the next step.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.n_games,):
+            raise ValueError(f"need one action per game, i.e. shape ({self.n_games},), got shape {actions.shape}")
+        idx = self._idx
+        if self.checked and not np.all(self.masks[idx, actions]):
+            bad = np.where(~self.masks[idx, actions])[0]
+            raise IllegalMoveError(f"illegal actions {actions[bad].tolist()} in games {bad.tolist()}")
+
+        boards = self.boards
+        src = actions % 25 + 1
+        die = actions // 25 + 1
+        dst = np.maximum(src - die, 0)
+
+        hit = (dst > 0) & (boards[idx, dst] == -1)
+        boards[idx, src] -= 1
+        boards[idx[hit], dst[hit]] = 0
+        boards[idx[hit], 0] -= 1  # opponent's bar
+        on_board = dst > 0
+        boards[idx[on_board], dst[on_board]] += 1
+        self.dice[idx, die - 1] -= 1
+        self.n_steps += 1
+
+        # the mover can only win on their own move
+        dones = ~np.any(boards > 0, axis=1)
+        rewards = np.zeros(self.n_games, dtype=np.float32)
+        if np.any(dones):
+            won = boards[dones]
+            gammon = np.sum(won, axis=1) == -15
+            backgammon = gammon & np.any(won[:, :7] < 0, axis=1)
+            rewards[dones] = 1 + gammon + backgammon
+
+        # a new array, so that the returned masks are not modified by later steps
+        self.masks = canonical_action_mask(boards, self.dice)
+        self._pass_turns(idx[~dones & ~np.any(self.masks, axis=1)])
+        self._reset(idx[dones])
+
+        return boards.copy(), rewards, dones, self.masks
+
+    def _board(self, i: int) -> Board:
+        board = Board(self.boards[i], copy=True)
+        if self.turn[i] == Color.BLACK:
+            board.flip()
+        return board
+
+    def decode_move(self, i: int, action: int) -> Move:
+        """The action in game `i` as a `Move` (in the regular, not the canonical orientation)."""
+        return action_to_move(action, self._board(i), Color(int(self.turn[i])))
+
+    def state(self, i: int) -> GameState:
+        """The state of game `i` as `GameState` (in the regular, not the canonical orientation)."""
+        turn = Color(int(self.turn[i]))
+        board = self._board(i)
+        dice = [d for d, n in zip(range(1, 6 + 1), self.dice[i]) for _ in range(n)]
+        return GameState(board, turn=turn, dice=dice, dice_used=[False] * len(dice), copy=False)
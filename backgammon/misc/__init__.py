@@ -1 +1,5 @@
 from .hit_prob import hit_prob
+from .position_store import FEATURES, Positions, PositionStore, CachedEvaluator
+from .race import effective_pip_counts, race_win_prob
+from .win_prob import WinProbModel, game_positions
+from .simulate import POLICIES, Simulations, simulate
@@ -0,0 +1,277 @@
+from typing import Any, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from os import PathLike
+from numpy.typing import ArrayLike, NDArray
+import sqlite3
+import numpy as np
+
+from ..core import Board, Color, GameState
+from ..core.batch import pip_counts, blot_counts, home_blot_counts, bar_counts, off_counts, contact
+from ..core.actions import canonical_points
+from ..core.hashing import zobrist_hashes, canonical_hashes, to_signed, to_unsigned
+
+# the features are stored from the viewpoint of the player to move ("own") and their opponent ("opp")
+FEATURES = (
+    'pips_own', 'pips_opp', 'blots_own', 'blots_opp', 'home_blots_own', 'home_blots_opp',
+    'bar_own', 'bar_opp', 'off_own', 'off_opp', 'contact',
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS positions (
+    hash INTEGER PRIMARY KEY,
+    points BLOB NOT NULL,
+    turn INTEGER NOT NULL,
+    {', '.join(f'{f} INTEGER NOT NULL' for f in FEATURES)},
+    game INTEGER,
+    ply INTEGER,
+    count INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    hash INTEGER NOT NULL,
+    evaluator TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (hash, evaluator)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_positions_contact_home_blots ON positions (contact, home_blots_own, home_blots_opp);
+CREATE INDEX IF NOT EXISTS ix_positions_contact_blots ON positions (contact, blots_own, blots_opp);
+CREATE INDEX IF NOT EXISTS ix_positions_pips ON positions (pips_own, pips_opp);
+CREATE INDEX IF NOT EXISTS ix_positions_bar ON positions (bar_own, bar_opp);
+CREATE INDEX IF NOT EXISTS ix_positions_game ON positions (game, ply);
+"""
+
+_INSERT = f"""
+INSERT INTO positions (hash, points, turn, {', '.join(FEATURES)}, game, ply)
+VALUES ({', '.join(['?'] * (len(FEATURES) + 5))})
+ON CONFLICT (hash) DO UPDATE SET count = count + 1
+"""
+
+
+def position_features(points: ArrayLike, turn: ArrayLike) -> NDArray[np.int_]:
+    """The `FEATURES` of positions with points of shape (n, 26) and players to move of shape (n,)."""
+    points = np.asarray(points)
+    # the index of the player to move in the (BLACK, WHITE) pairs - WHITE, if no one is to move
+    own = (np.asarray(turn) >= 0).astype(int)[:, None]
+    columns = []
+    for counts in (pip_counts(points), blot_counts(points), home_blot_counts(points), bar_counts(points),
+                   off_counts(points)):
+        columns += [np.take_along_axis(counts, own, axis=1)[:, 0], np.take_along_axis(counts, 1 - own, axis=1)[:, 0]]
+    columns.append(contact(points).astype(int))
+    return np.stack(columns, axis=1)
+
+
+@dataclass(slots=True)
+class Positions:
+    """Positions as arrays: their hashes (n,), points (n, 26) and players to move (n,)."""
+    hashes: NDArray[np.uint64]
+    points: NDArray[np.int8]
+    turns: NDArray[np.int8]
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def states(self) -> list[GameState]:
+        return [GameState(Board(p), Color(t), copy=False) for p, t in zip(self.points, self.turns)]
+
+
+class PositionStore:
+    """A local database of positions, backed by SQLite.
+
+    The positions are keyed by their stable Zobrist hash (see `backgammon.core.hashing`), together with the player to
+    move. Their `FEATURES` are stored in indexed columns, so that queries on them do not need to scan the table.
+    Evaluations of any number of evaluators are stored alongside (and can serve as a cache, see `cached`).
+
+    With `canonical`, positions are stored from the viewpoint of the player to move, as if they played WHITE, and keyed
+    by their canonical hash (see `backgammon.core.hashing`). A position and its mirror image with the colors swapped are
+    then the same entry - as are their evaluations, as long as these are relative to the player to move (e.g. their
+    winning probability).
+
+    Args:
+        path (str | PathLike):  The database file (created, if it does not exist), or ":memory:".
+        batch_size (int):       Number of rows written per transaction in bulk inserts.
+        canonical (bool):       Whether to store positions with a player to move in canonical orientation.
+    """
+
+    def __init__(self, path: str | PathLike = ":memory:", batch_size: int = 10_000, canonical: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.canonical = canonical
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'PositionStore':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def __contains__(self, key: int | GameState) -> bool:
+        if isinstance(key, GameState):
+            key = int(self.hashes(key.board.points, key.turn))
+        row = self.connection.execute("SELECT 1 FROM positions WHERE hash = ?", (int(to_signed(key)),)).fetchone()
+        return row is not None
+
+    def hashes(self, points: ArrayLike, turns: ArrayLike = Color.NONE) -> NDArray[np.uint64]:
+        """The keys of positions in this store: their Zobrist hashes, or canonical hashes with `canonical`."""
+        return canonical_hashes(points, turns) if self.canonical else zobrist_hashes(points, turns)
+
+    def add(
+            self,
+            points: ArrayLike,
+            turns: ArrayLike = Color.NONE,
+            game: int | ArrayLike | None = None,
+            ply: int | ArrayLike | None = None,
+    ) -> NDArray[np.uint64]:
+        """Add positions with points of shape (n, 26), in batched transactions. Returns their hashes.
+
+        Positions already stored are not changed, but their `count` is incremented. The `game` and `ply` (e.g. an index
+        of a game and the number of the action in it) are references to the first occurrence of a position.
+        """
+        points = np.asarray(points, dtype=np.int8).reshape(-1, 26)
+        n = len(points)
+        turns = np.broadcast_to(np.asarray(turns, dtype=np.int8), (n,))
+        hashes = self.hashes(points, turns)
+        if self.canonical:
+            points = canonical_points(points, turns).astype(np.int8)
+            turns = np.where(turns == Color.NONE, Color.NONE, Color.WHITE).astype(np.int8)
+        keys = to_signed(hashes).tolist()
+        features = position_features(points, turns).tolist()
+        games = np.broadcast_to(np.asarray(game, dtype=object), (n,)).tolist()
+        plies = np.broadcast_to(np.asarray(ply, dtype=object), (n,)).tolist()
+        blobs = [p.tobytes() for p in points]
+        turn_list = turns.tolist()
+
+        rows = ((keys[i], blobs[i], turn_list[i], *features[i], games[i], plies[i]) for i in range(n))
+        self._write_batches(_INSERT, rows)
+        return hashes
+
+    def add_states(self, states: Iterable[GameState], game: int | None = None) -> NDArray[np.uint64]:
+        """Add the positions of game states (e.g. all states of a game, with `ply` as their index)."""
+        states = list(states)
+        points = np.array([s.board.points for s in states]).reshape(-1, 26)
+        turns = np.array([s.turn for s in states], dtype=np.int8)
+        plies = None if game is None else np.arange(len(states))
+        return self.add(points, turns, game=game, ply=plies)
+
+    def _write_batches(self, sql: str, rows: Iterable[Sequence[Any]]):
+        batch: list[Sequence[Any]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                with self.connection:
+                    self.connection.executemany(sql, batch)
+                batch = []
+        if len(batch) > 0:
+            with self.connection:
+                self.connection.executemany(sql, batch)
+
+    def set_evaluations(self, hashes: ArrayLike, values: ArrayLike, evaluator: str):
+        """Store (or replace) the evaluations of positions by an evaluator with the given name."""
+        keys = to_signed(np.asarray(hashes, dtype=np.uint64).ravel()).tolist()
+        rows = zip(keys, [evaluator] * len(keys), np.asarray(values, dtype=float).ravel().tolist())
+        self._write_batches("INSERT OR REPLACE INTO evaluations (hash, evaluator, value) VALUES (?, ?, ?)", rows)
+
+    def evaluations(self, hashes: ArrayLike, evaluator: str) -> NDArray[np.float64]:
+        """The stored evaluations of positions by an evaluator (NaN for positions without evaluation)."""
+        keys = to_signed(np.asarray(hashes, dtype=np.uint64).ravel()).tolist()
+        found: dict[int, float] = {}
+        for i in range(0, len(keys), 500):  # stay below the limit of SQL variables
+            chunk = keys[i:i + 500]
+            placeholders = ', '.join(['?'] * len(chunk))
+            found.update(self.connection.execute(
+                f"SELECT hash, value FROM evaluations WHERE evaluator = ? AND hash IN ({placeholders})",
+                [evaluator, *chunk],
+            ).fetchall())
+        return np.array([found.get(k, np.nan) for k in keys], dtype=float)
+
+    def query(self, where: str = "", params: Sequence[Any] = (), order_by: str = "", limit: int | None = None
+              ) -> Positions:
+        """Select positions with an SQL condition on the columns of the `positions` table, e.g. `contact AND
+        home_blots_own > 0` (with `?` placeholders for `params`)."""
+        sql = "SELECT hash, points, turn FROM positions"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self.connection.execute(sql, params).fetchall()
+        if len(rows) == 0:
+            return Positions(np.zeros(0, dtype=np.uint64), np.zeros((0, 26), dtype=np.int8), np.zeros(0, dtype=np.int8))
+        keys, blobs, turns = zip(*rows)
+        points = np.frombuffer(b''.join(blobs), dtype=np.int8).reshape(-1, 26)
+        return Positions(to_unsigned(np.array(keys, dtype=np.int64)), points, np.array(turns, dtype=np.int8))
+
+    def find(
+            self,
+            contact: bool | None = None,
+            min_home_blots_own: int | None = None,
+            min_home_blots_opp: int | None = None,
+            min_blots_own: int | None = None,
+            min_blots_opp: int | None = None,
+            max_pips_own: int | None = None,
+            max_pips_opp: int | None = None,
+            limit: int | None = None,
+    ) -> Positions:
+        """Select positions by their features, e.g. all contact positions with a blot in the home board of the player to
+        move with `find(contact=True, min_home_blots_own=1)`."""
+        conditions: list[str] = []
+        params: list[Any] = []
+        if contact is not None:
+            conditions.append("contact = ?")
+            params.append(int(contact))
+        for column, value in [('home_blots_own', min_home_blots_own), ('home_blots_opp', min_home_blots_opp),
+                              ('blots_own', min_blots_own), ('blots_opp', min_blots_opp)]:
+            if value is not None:
+                conditions.append(f"{column} >= ?")
+                params.append(value)
+        for column, value in [('pips_own', max_pips_own), ('pips_opp', max_pips_opp)]:
+            if value is not None:
+                conditions.append(f"{column} <= ?")
+                params.append(value)
+        return self.query(" AND ".join(conditions), params, limit=limit)
+
+    def query_plan(self, where: str, params: Sequence[Any] = ()) -> list[str]:
+        """How SQLite executes a query (e.g. to check that it uses an index)."""
+        rows = self.connection.execute(f"EXPLAIN QUERY PLAN SELECT hash FROM positions WHERE {where}", params)
+        return [row[-1] for row in rows]
+
+    def cached(self, evaluator: Callable[[NDArray[np.integer]], NDArray[np.floating]], name: str
+               ) -> 'CachedEvaluator':
+        return CachedEvaluator(evaluator, self, name)
+
+
+class CachedEvaluator:
+    """An evaluator (see `backgammon.agents.Evaluator`) that stores its evaluations in a `PositionStore`.
+
+    Only positions without stored evaluation are passed on to the wrapped evaluator. The positions are canonical after
+    a play, i.e. the player who just played is WHITE and the opponent (BLACK) is to roll - in a canonical store (see
+    `PositionStore`), they are stored flipped, with WHITE to move. Flipping both the board and the player to move gives
+    the same position, so the stored evaluation is still the winning chance of the player who just played.
+    """
+
+    def __init__(self, evaluator: Callable[[NDArray[np.integer]], NDArray[np.floating]], store: PositionStore,
+                 name: str):
+        self.evaluator = evaluator
+        self.store = store
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.evaluator!r}, name={self.name!r})"
+
+    def __call__(self, points: NDArray[np.integer]) -> NDArray[np.floating]:
+        hashes = self.store.hashes(points, Color.BLACK)
+        values = self.store.evaluations(hashes, self.name)
+        missing = np.isnan(values)
+        if missing.any():
+            values[missing] = self.evaluator(points[missing])
+            self.store.add(points[missing], Color.BLACK)
+            self.store.set_evaluations(hashes[missing], values[missing], self.name)
+        return values
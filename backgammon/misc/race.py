@@ -0,0 +1,55 @@
+"""Race evaluation by effective pip counts.
+
+In a race (see `Board.contact`) the checkers cannot be hit any more, so a position is well described by the pip
+counts - corrected for the pips wasted by stacking on the low points and by gaps in the home board. The corrections
+are those of the Keith count:
+
+    + 2 for each checker more than one on the 1-point
+    + 1 for each checker more than one on the 2-point
+    + 1 for each checker more than three on the 3-point
+    + 1 for each empty 4-, 5- or 6-point
+"""
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+
+from ..core.batch import pip_counts
+
+# the spread of the difference of the pips both players need, per square root of all pips
+RACE_SPREAD = 1.5
+# the player on roll is about half a roll ahead
+ON_ROLL_PIPS = 4.0
+
+
+def _wastage(own: NDArray[np.int_]) -> NDArray[np.int_]:
+    """Correction of the pip count for checker counts of shape (..., 26) of a player moving towards 0."""
+    return (
+        2 * np.maximum(own[..., 1] - 1, 0)
+        + np.maximum(own[..., 2] - 1, 0)
+        + np.maximum(own[..., 3] - 3, 0)
+        + (own[..., 4:7] == 0).sum(axis=-1)
+    )
+
+
+def effective_pip_counts(points: ArrayLike) -> NDArray[np.int_]:
+    """The effective pip counts (BLACK, WHITE) of positions with points of shape (..., 26).
+
+    Players who have borne off all checkers have an effective pip count of 0.
+    """
+    points = np.asarray(points)
+    pips = pip_counts(points)
+    white = np.clip(points, 0, None)
+    black = np.clip(-points[..., ::-1], 0, None)
+    wastage = np.stack([_wastage(black), _wastage(white)], axis=-1)
+    return np.where(pips > 0, pips + wastage, 0)
+
+
+def race_win_prob(points: ArrayLike) -> NDArray[np.float64]:
+    """The winning probabilities of WHITE in races with BLACK to roll (an `Evaluator` for canonical positions).
+
+    This uses a normal approximation of the difference of the effective pip counts (in its logistic form).
+    """
+    epc = effective_pip_counts(points).astype(float)
+    lead = epc[..., 0] - epc[..., 1] - ON_ROLL_PIPS
+    spread = RACE_SPREAD * np.sqrt(epc.sum(axis=-1)) + 1e-9
+    prob = 1.0 / (1.0 + np.exp(-1.702 * lead / spread))
+    return np.where(epc[..., 1] == 0, 1.0, np.where(epc[..., 0] == 0, 0.0, prob))
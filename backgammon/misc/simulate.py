@@ -0,0 +1,348 @@
+"""Play many complete games at once, as array operations on all boards (e.g. for statistics of simple players).
+
+The games are played in lockstep, one checker move per step, on boards of shape (n, 26) from the viewpoint of the
+player to move (see `backgammon.core.actions`), like in `VecGame`. Finished games are dropped from the arrays, so that
+each step only works on the games still running. There is no doubling cube.
+
+Instead of the legal-action masks of `canonical_action_mask` (which take 150 entries per game), the points are packed
+into bit masks of one integer per game: bit `i` for point `i`. A die `d` can then move the checkers of all points at
+once, e.g. to the points not blocked by the opponent, `own & ~(blocked << d)`. As with `canonical_action_mask` and
+`GameState.build_legal_moves`, each checker move is legal on its own, but the rule to use both dice (or the higher
+one), if possible, is not enforced - i.e. the games follow the same relaxed rules as games of `Game` and `Match`.
+
+Policies:
+    random: A uniformly random legal checker move, like `RandomAgent` (which also chooses one checker move at a time
+            among the moves of all unused dice). For 100,000 simulated games and 3,000 games of `Match(RandomAgent())`
+            (without doubling), the player to start won 50.3% +- 0.2% vs 50.8% +- 0.9%, with gammons in 59.6% vs
+            58.3% +- 0.9% and backgammons in 23.4% vs 23.2% of the games, after 93.2 vs 92.7 +- 0.7 turns on
+            average. (The opening roll of `Game` cannot be a double, which the simulations do not model.)
+    simple: A random one of the best checker moves by a few rules - hit a blot, else make a point, else bear off, else
+            move without leaving a blot behind or at the destination. It is greedy, so much weaker than `SimpleAgent`,
+            but much stronger than random moves.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+
+from ..core import Color, START_POINTS
+from ..core.actions import canonical_points
+
+POLICIES = ('random', 'simple')
+
+# the boards are padded to 32 points, to pack them into 32 bit integers quickly
+_WIDTH = 32
+_ALL_BITS = np.uint64(2**64 - 1)
+_BAR_BIT = np.uint64(1 << 25)
+_HOME_BITS = np.uint64(0b1111110)
+# the highest bit of the numbers 0 to 127, e.g. the rearmost point of checkers all in the home board
+_HIGHEST_BIT = np.array([max(i.bit_length() - 1, 0) for i in range(128)], dtype=np.uint64)
+_BYTE_COUNTS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+# the position of the k-th set bit of a byte
+_BYTE_SELECT = np.array([[([j for j in range(8) if i >> j & 1] + [0] * 8)[k] for k in range(8)] for i in range(256)],
+                        dtype=np.int64)
+
+
+@dataclass(slots=True)
+class Simulations:
+    """The results of `simulate`, played by the relaxed rules of `Game` (see the module documentation).
+
+    Args:
+        outcomes (NDArray[np.int8]):        The points won by WHITE in each game (-3 to 3), or 0 for unfinished games.
+        turns (NDArray[np.int_]):           The number of turns played in each game (including passed ones).
+        points (NDArray[np.int8]):          The final positions (n, 26) in regular orientation.
+        turn (NDArray[np.int8]):            The player to roll in the final positions (NONE for finished games).
+        positions (NDArray[np.int8]):       With `record`, the positions (m, 26) at the start of each turn.
+        position_games (NDArray[np.int_]):  The index of the game of each recorded position.
+    """
+
+    outcomes: NDArray[np.int8]
+    turns: NDArray[np.int_]
+    points: NDArray[np.int8]
+    turn: NDArray[np.int8]
+    positions: NDArray[np.int8]
+    position_games: NDArray[np.int_]
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def win_rates(self) -> NDArray[np.float64]:
+        """The fractions of finished games won by (BLACK, WHITE)."""
+        finished = max(int(np.count_nonzero(self.outcomes)), 1)
+        return np.array([np.sum(self.outcomes < 0), np.sum(self.outcomes > 0)]) / finished
+
+
+def _popcount(x: NDArray[np.uint64]) -> NDArray[np.int64]:
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(x).astype(np.int64)
+    # NumPy < 2.0
+    return _BYTE_COUNTS[x.view(np.uint8).reshape(len(x), -1)].sum(axis=1, dtype=np.int64)
+
+
+def _select_bit(x: NDArray[np.uint64], k: NDArray[np.int64]) -> NDArray[np.int64]:
+    """The positions of the `k`-th set bits (counted from 0) of 64 bit integers, by binary search."""
+    pos = np.zeros(len(x), dtype=np.int64)
+    for width in (32, 16, 8):
+        low = x & np.uint64((1 << width) - 1)
+        count = _popcount(low)
+        high = k >= count
+        k = np.where(high, k - count, k)
+        x = np.where(high, x >> np.uint64(width), low)
+        pos += high * width
+    return pos + _BYTE_SELECT[x, k]
+
+
+def _bits(cond: NDArray[np.bool_]) -> NDArray[np.uint64]:
+    """Pack conditions on the (padded) points, shape (n, 32), into one integer per game."""
+    return np.packbits(cond, axis=1, bitorder='little').view('<u4').ravel().astype(np.uint64)
+
+
+def _roll(rng: np.random.Generator, n: int, opening: bool = False) -> tuple[NDArray[np.uint64], NDArray[np.uint64]]:
+    """The two dice of `n` rolls (without doubles for the opening roll)."""
+    dice = rng.integers(1, 6 + 1, size=(2, n), dtype=np.uint64)
+    if opening:
+        doubles = dice[0] == dice[1]
+        while np.any(doubles):
+            dice[1, doubles] = rng.integers(1, 6 + 1, size=np.count_nonzero(doubles), dtype=np.uint64)
+            doubles = dice[0] == dice[1]
+    return dice[0], dice[1]
+
+
+def _legal_sources(
+        own: NDArray[np.uint64],
+        blocked: NDArray[np.uint64],
+        bar_mask: NDArray[np.uint64],
+        die: NDArray[np.uint64],
+) -> tuple[NDArray[np.uint64], NDArray[np.uint64]]:
+    """The points (as bits) a checker can be moved from with `die`, and those of them bearing off."""
+    one = np.uint64(1)
+    regular = own & ~(blocked << die) & (_ALL_BITS << (die + one))
+    home = (own & ~_HOME_BITS) == 0
+    rearmost = _HIGHEST_BIT[own & _HOME_BITS]
+    # bearing off exactly, or from the rearmost point with a higher die
+    bear_off = ((own & (one << die)) | (rearmost < die) * (one << rearmost)) * home
+    return (regular | bear_off) & bar_mask, bear_off
+
+
+def _choose(
+        boards: NDArray[np.int8],
+        dice: tuple[NDArray[np.uint64], NDArray[np.uint64]],
+        counts: tuple[NDArray[np.int8], NDArray[np.int8]],
+        simple: NDArray[np.bool_],
+        rng: np.random.Generator,
+) -> NDArray[np.int64]:
+    """The chosen checker moves as `slot * 26 + src` with the slot of the die, or -1 where no move is legal."""
+    points = boards
+    own = _bits(points > 0)
+    blocked = _bits(points < -1) & ~np.uint64(1)  # bearing off cannot be blocked
+    # checkers on the bar have to be moved first
+    bar_mask = np.where(boards[:, 25] > 0, _BAR_BIT, _ALL_BITS)
+    any_simple = bool(np.any(simple))
+    if any_simple:
+        blot, single, two = _bits(points == -1), _bits(points == 1), _bits(points == 2)
+
+    # the legal moves of both dice in one integer, and the moves matching the rules of the simple policy
+    legal = np.zeros(len(boards), dtype=np.uint64)
+    rules = [np.zeros(len(boards), dtype=np.uint64) for _ in range(4)]
+    for slot in range(2):
+        die = dice[slot]
+        sources, bear_off = _legal_sources(own, blocked, bar_mask, die)
+        sources *= counts[slot] > 0
+        shift = np.uint64(26 * slot)
+        legal |= sources << shift
+        if any_simple:
+            safe = sources & ~two & ((own << die) | bear_off)
+            # by increasing priority
+            for rule, moves in zip(rules, (safe, sources & bear_off, sources & (single << die),
+                                           sources & (blot << die))):
+                rule |= moves << shift
+
+    candidates = legal
+    if any_simple:
+        best = legal
+        for rule in rules:
+            best = np.where(rule != 0, rule, best)
+        candidates = np.where(simple, best, legal)
+
+    n_candidates = _popcount(candidates)
+    k = (rng.random(len(boards)) * n_candidates).astype(np.int64)
+    return np.where(n_candidates > 0, _select_bit(candidates, k), -1)
+
+
+def simulate(
+        n_games: int | None = None,
+        points: ArrayLike | None = None,
+        turn: ArrayLike = Color.WHITE,
+        policy: str | tuple[str, str] = 'random',
+        max_turns: int | None = None,
+        record: bool = False,
+        seed: int | np.random.Generator | None = None,
+        max_workers: int | None = 0,
+        chunk_size: int = 50_000,
+) -> Simulations:
+    """Play games to the end (or `max_turns`) with the given policies.
+
+    Args:
+        n_games (int):              The number of games. Needed without `points`, else it repeats a single position.
+        points (ArrayLike):         The start positions (regular orientation) of shape (26,) or (n, 26). Without, the
+                                    games start with an opening roll from the start position.
+        turn (ArrayLike):           The player to roll in each of the start positions.
+        policy (str | tuple):       The policy of both players, or of (BLACK, WHITE). See `POLICIES`.
+        max_turns (int):            Stop unfinished games after this many turns (e.g. to evaluate them otherwise).
+        record (bool):              Record the positions at the start of each turn (e.g. for `WinProbModel.calibrate`).
+        seed (int | Generator):     Seed or generator for the dice and random choices.
+        max_workers (int | None):   Number of worker processes, each playing chunks of the games. With 0, play in
+                                    this process; with None, use as many processes as there are CPUs.
+        chunk_size (int):           Number of games played by a worker at once.
+
+    Returns:
+        results (Simulations):      The outcomes and lengths of the games.
+    """
+    policies = (policy, policy) if isinstance(policy, str) else tuple(policy)
+    for p in policies:
+        if p not in POLICIES:
+            raise ValueError(f"unknown policy '{p}', use one of {', '.join(POLICIES)}")
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    if max_workers != 0:
+        return _simulate_chunks(n_games, points, turn, policy, max_turns, record, rng, max_workers, chunk_size)
+
+    if points is None:
+        if n_games is None:
+            raise ValueError("need either n_games or points")
+        boards = np.zeros((n_games, _WIDTH), dtype=np.int8)
+        boards[:, :26] = START_POINTS
+        die0, die1 = _roll(rng, n_games, opening=True)
+        # the same convention as `GameState.roll_dice`
+        turns = np.where(die0 > die1, Color.BLACK, Color.WHITE).astype(np.int8)
+    else:
+        points = np.atleast_2d(np.asarray(points, dtype=np.int8))
+        if n_games is not None and len(points) == 1:
+            points = np.repeat(points, n_games, axis=0)
+        n_games = len(points)
+        turns = np.broadcast_to(np.asarray(turn, dtype=np.int8), (n_games,)).copy()
+        boards = np.zeros((n_games, _WIDTH), dtype=np.int8)
+        boards[:, :26] = canonical_points(points, turns)
+        die0, die1 = _roll(rng, n_games)
+    # how often each die can still be used (a double twice each)
+    n0 = np.where(die0 == die1, 2, 1).astype(np.int8)
+    n1 = n0.copy()
+    # checkers borne off by the player to move and their opponent
+    own_off = (15 - np.clip(boards, 0, None).sum(axis=1)).astype(np.int8)
+    opp_off = (15 - np.clip(-boards, 0, None).sum(axis=1)).astype(np.int8)
+
+    outcomes = np.zeros(n_games, dtype=np.int8)
+    n_turns = np.ones(n_games, dtype=np.int64)
+    final = np.zeros((n_games, 26), dtype=np.int8)
+    final_turn = np.zeros(n_games, dtype=np.int8)
+    recorded: list[tuple[NDArray[np.integer], NDArray[np.int_]]] = []
+    simple_players = np.array([p == 'simple' for p in policies])  # (BLACK, WHITE)
+
+    games = np.arange(n_games)  # the games still running, in the order of the arrays
+    new_turn = np.ones(n_games, dtype=bool)
+    while len(games) > 0:
+        if record and np.any(new_turn):
+            recorded.append((canonical_points(boards[new_turn, :26], turns[new_turn]), games[new_turn]))
+
+        moves = _choose(boards, (die0, die1), (n0, n1), simple_players[(turns + 1) // 2], rng)
+        can_move = moves >= 0
+
+        # move one checker in all games that can (with indices into the flat boards)
+        idx = np.flatnonzero(can_move)
+        second, src = np.divmod(moves[idx], 26)
+        second = second.astype(bool)
+        dst = np.maximum(src - np.where(second, die1[idx], die0[idx]).astype(np.int64), 0)
+        n0[idx[~second]] -= 1
+        n1[idx[second]] -= 1
+        flat = boards.reshape(-1)
+        base = _WIDTH * idx
+        flat[base + src] -= 1
+        on_board = dst > 0
+        dst_pos = (base + dst)[on_board]
+        hit = flat[dst_pos] == -1
+        flat[dst_pos[hit]] = 0
+        flat[base[on_board][hit]] -= 1  # the opponent's bar
+        flat[dst_pos] += 1
+        own_off[idx[~on_board]] += 1
+
+        # the mover can only win on their own move
+        done = own_off == 15
+        if np.any(done):
+            won = boards[done]
+            gammon = opp_off[done] == 0
+            backgammon = gammon & np.any(won[:, :7] < 0, axis=1)
+            outcomes[games[done]] = turns[done] * (1 + gammon + backgammon)
+            final[games[done]] = canonical_points(won[:, :26], turns[done])
+
+        # pass the turn, where the dice are used up or no move is left
+        new_turn = ~done & (~can_move | ((n0 == 0) & (n1 == 0)))
+        passing = np.flatnonzero(new_turn)
+        if len(passing) > 0:
+            boards[passing, :26] = -boards[passing, 25::-1]
+            turns[passing] = -turns[passing]
+            own_off[passing], opp_off[passing] = opp_off[passing], own_off[passing]
+            die0[passing], die1[passing] = _roll(rng, len(passing))
+            n0[passing] = np.where(die0[passing] == die1[passing], 2, 1)
+            n1[passing] = n0[passing]
+            n_turns[games[passing]] += 1
+
+        stop = done
+        if max_turns is not None:
+            cut = n_turns[games] > max_turns
+            final[games[cut]] = canonical_points(boards[cut, :26], turns[cut])
+            final_turn[games[cut]] = turns[cut]
+            n_turns[games[cut]] = max_turns
+            stop = done | cut
+        if np.any(stop):
+            keep = np.flatnonzero(~stop)
+            games, boards, turns, new_turn = games[keep], boards[keep], turns[keep], new_turn[keep]
+            die0, die1 = die0[keep], die1[keep]
+            n0, n1, own_off, opp_off = n0[keep], n1[keep], own_off[keep], opp_off[keep]
+
+    if recorded:
+        positions = np.concatenate([p for p, _ in recorded]).astype(np.int8)
+        position_games = np.concatenate([g for _, g in recorded])
+    else:
+        positions = np.zeros((0, 26), dtype=np.int8)
+        position_games = np.zeros(0, dtype=np.int64)
+    return Simulations(outcomes, n_turns, final, final_turn, positions, position_games)
+
+
+def _simulate_chunks(
+        n_games: int | None,
+        points: ArrayLike | None,
+        turn: ArrayLike,
+        policy: str | tuple[str, str],
+        max_turns: int | None,
+        record: bool,
+        rng: np.random.Generator,
+        max_workers: int | None,
+        chunk_size: int,
+) -> Simulations:
+    """`simulate` in chunks of games, played by worker processes."""
+    if points is None:
+        if n_games is None:
+            raise ValueError("need either n_games or points")
+        starts: list[tuple[int | None, NDArray[np.int8] | None, ArrayLike]] = [
+            (min(chunk_size, n_games - i), None, turn) for i in range(0, n_games, chunk_size)]
+    else:
+        points = np.atleast_2d(np.asarray(points, dtype=np.int8))
+        if n_games is not None and len(points) == 1:
+            points = np.repeat(points, n_games, axis=0)
+        turns = np.broadcast_to(np.asarray(turn, dtype=np.int8), (len(points),))
+        starts = [(None, points[i:i + chunk_size], turns[i:i + chunk_size]) for i in range(0, len(points), chunk_size)]
+    seeds = rng.integers(2**63, size=len(starts)).tolist()
+
+    with ProcessPoolExecutor(max_workers) as pool:
+        futures = [pool.submit(simulate, n, p, t, policy, max_turns, record, seed)
+                   for (n, p, t), seed in zip(starts, seeds)]
+        chunks = [f.result() for f in futures]
+
+    offsets = np.cumsum([0] + [len(c) for c in chunks[:-1]])
+    return Simulations(
+        outcomes=np.concatenate([c.outcomes for c in chunks]),
+        turns=np.concatenate([c.turns for c in chunks]),
+        points=np.concatenate([c.points for c in chunks]),
+        turn=np.concatenate([c.turn for c in chunks]),
+        positions=np.concatenate([c.positions for c in chunks]),
+        position_games=np.concatenate([c.position_games + o for c, o in zip(chunks, offsets)]),
+    )
@@ -0,0 +1,132 @@
+"""Win and gammon probabilities of many positions at once, estimated from their pip counts.
+
+The probability of WHITE winning is `(tanh(lead / (scale * max_pips)) + 1) / 2`, with the lead in pips (the pip count
+of BLACK minus that of WHITE) and the larger of both pip counts. A win is a gammon (or backgammon) with a probability
+logistic in the relative lead of the winner - and never, once the loser has borne off a checker.
+
+The default parameters are fitted to games of two `RandomAgent`; `WinProbModel.calibrate` refits them to the outcomes
+of any other games, e.g. of many games simulated at once::
+
+    sim = simulate(100_000, policy='simple', record=True)
+    model = WinProbModel.calibrate(sim.positions, sim.outcomes[sim.position_games])
+"""
+from typing import Iterable
+from dataclasses import dataclass
+import math
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+
+from ..core.batch import pip_counts, off_counts
+from ..game import Game, ActionType
+
+
+@dataclass(frozen=True, slots=True)
+class WinProbModel:
+    """The parameters of the pip count estimate of win and gammon probabilities (see the module documentation).
+
+    The probabilities are returned with a trailing axis of length 2 for (BLACK, WHITE), like the queries of
+    `backgammon.core.batch`.
+
+    Args:
+        scale (float):          The lead (relative to the larger pip count) for which the winning chances are 88%.
+        gammon_bias (float):    The log-odds of a win being a gammon, for an even race.
+        gammon_slope (float):   The increase of these log-odds with the relative lead of the winner.
+    """
+
+    scale: float = 0.42
+    gammon_bias: float = -0.05
+    gammon_slope: float = 2.25
+
+    def pip_win_prob(self, black: int, white: int) -> float:
+        """The winning probability of WHITE for a single pair of pip counts (without the overhead of arrays)."""
+        if white == 0 or black == 0:
+            return float(white == 0)
+        return (math.tanh((black - white) / (self.scale * max(black, white))) + 1) / 2
+
+    def pip_win_probs(self, pips: ArrayLike) -> NDArray[np.float64]:
+        """The winning probabilities for pip counts of shape (..., 2)."""
+        pips = np.asarray(pips, dtype=float)
+        lead = pips[..., 0] - pips[..., 1]
+        white = (np.tanh(lead / (self.scale * pips.max(axis=-1) + 1e-9)) + 1) / 2
+        white = np.where(pips[..., 1] == 0, 1.0, np.where(pips[..., 0] == 0, 0.0, white))
+        return np.stack([1 - white, white], axis=-1)
+
+    def win_probs(self, points: ArrayLike) -> NDArray[np.float64]:
+        """The winning probabilities of positions with points of shape (..., 26)."""
+        return self.pip_win_probs(pip_counts(points))
+
+    def gammon_probs(self, points: ArrayLike) -> NDArray[np.float64]:
+        """The probabilities of winning a gammon (or backgammon) of positions with points of shape (..., 26)."""
+        points = np.asarray(points)
+        pips = pip_counts(points).astype(float)
+        win = self.pip_win_probs(pips)
+        given_win = _sigmoid(self.gammon_bias + self.gammon_slope * _relative_leads(pips))
+        # a player can only be gammoned as long as they have not borne off
+        return win * given_win * (off_counts(points)[..., ::-1] == 0)
+
+    @classmethod
+    def calibrate(cls, points: ArrayLike, results: ArrayLike) -> 'WinProbModel':
+        """Fit the parameters to positions with points of shape (n, 26) and the results of their games.
+
+        The results are the number of points WHITE won (without the doubling cube), i.e. -3 to 3 for backgammons,
+        gammons and normal wins of BLACK or WHITE. This maximizes the likelihood of the winners and (given the winner)
+        of the gammons. Games of `simulate` follow the same (relaxed) rules as those of `Game`, in which a player need
+        not use both dice.
+        """
+        points = np.asarray(points).reshape(-1, 26)
+        results = np.asarray(results).reshape(-1)
+        pips = pip_counts(points).astype(float)
+        start = cls()
+
+        # P(WHITE wins) = sigmoid(2 * lead / (scale * max_pips))
+        x = 2 * (pips[:, 0] - pips[:, 1]) / np.maximum(pips.max(axis=-1), 1)
+        coef, = _fit_logistic(x[:, None], results > 0, np.array([1 / start.scale]))
+
+        # from the viewpoint of the winner, for positions where the loser can still be gammoned
+        white = results > 0
+        leads = _relative_leads(pips)
+        lead = np.where(white, leads[:, 1], leads[:, 0])
+        open_ = off_counts(points)[np.arange(len(points)), white.astype(int) ^ 1] == 0
+        features = np.stack([np.ones(open_.sum()), lead[open_]], axis=-1)
+        gammons = np.abs(results[open_]) > 1
+        bias, slope = _fit_logistic(features, gammons, np.array([start.gammon_bias, start.gammon_slope]))
+        return cls(scale=float(1 / coef), gammon_bias=float(bias), gammon_slope=float(slope))
+
+
+def game_positions(games: Iterable[Game]) -> tuple[NDArray[np.int8], NDArray[np.int_]]:
+    """The positions at the dice rolls of finished games and the results of the games (see `WinProbModel.calibrate`)."""
+    points, results = [], []
+    for game in games:
+        if not game.game_over():
+            continue
+        res = game.result()
+        rolls = [t.next_state.board.points for t in game.history if t.action.type == ActionType.DICEROLL]
+        points.extend(rolls)
+        results.extend([res.winner * res.wintype] * len(rolls))
+    return np.array(points, dtype=np.int8).reshape(-1, 26), np.array(results, dtype=int)
+
+
+def _relative_leads(pips: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The leads of (BLACK, WHITE) relative to the larger pip count."""
+    lead = (pips[..., 0] - pips[..., 1]) / np.maximum(pips.max(axis=-1), 1)
+    return np.stack([-lead, lead], axis=-1)
+
+
+def _sigmoid(x: NDArray[np.float64]) -> NDArray[np.float64]:
+    return 1 / (1 + np.exp(-x))
+
+
+def _fit_logistic(x: NDArray[np.float64], y: NDArray[np.bool_], coef: NDArray[np.float64],
+                  max_iter: int = 50) -> NDArray[np.float64]:
+    """Logistic regression (without implicit intercept) by Newton's method, starting from `coef`."""
+    y = y.astype(float)
+    ridge = 1e-6 * np.eye(x.shape[1])
+    for _ in range(max_iter):
+        p = _sigmoid(x @ coef)
+        grad = x.T @ (p - y)
+        hess = (x * (p * (1 - p))[:, None]).T @ x + ridge
+        step = np.linalg.solve(hess, grad)
+        coef = coef - step
+        if np.abs(step).max() < 1e-8:
+            break
+    return coef
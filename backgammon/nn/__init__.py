@@ -0,0 +1,7 @@
+from . import encoding
+from . import mlp
+from . import td
+
+from .encoding import N_FEATURES, N_EXTRA_FEATURES, n_features, encode_points, encode_board, encode_state, encode_states
+from .mlp import MLP, MLPEvaluator
+from .td import TDTrainer
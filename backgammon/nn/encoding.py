@@ -0,0 +1,124 @@
+"""Encoding of positions as feature vectors for neural networks.
+
+The basic encoding is the 198-input encoding of TD-Gammon. For each of the 24 points and each player, there are four
+units: (n >= 1), (n >= 2), (n >= 3) and (n - 3) / 2 for n > 3 checkers. For black, the points are ordered as seen by
+black, so that flipping a position (and the turn) swaps the two halves of the encoding. Finally, there is one unit for
+checkers on the bar (n / 2) and one for borne off checkers (n / 15) per player and two units for whose turn it is:
+
+    [ white points (96) | black points (96) | bar (2) | off (2) | turn (2) ]
+
+With `extra=True`, further `N_EXTRA_FEATURES` features are appended (both per player, white first):
+
+    [ pip count / 167 (2) | blots / 15 (2) | points made in home board / 6 (2) ]
+"""
+from typing import Iterable
+from numpy.typing import ArrayLike, NDArray
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from ..core import Color, Board, GameState, WHITE_BAR, BLACK_BAR
+
+N_FEATURES = 198
+N_EXTRA_FEATURES = 6
+
+_START_PIPS = 167
+
+
+def _extra_weights() -> NDArray[np.float32]:
+    # the extra features are linear in the basic ones: n = u0 + u1 + u2 + 2 * u3 checkers on a point
+    weights = np.zeros((194, N_EXTRA_FEATURES), dtype=np.float32)
+    for side in (0, 1):
+        units = weights[96 * side:96 * (side + 1)].reshape(24, 4, N_EXTRA_FEATURES)
+        units[:, :, side] = np.arange(1, 24 + 1)[:, None] * np.array([1, 1, 1, 2]) / _START_PIPS
+        units[:, 0, 2 + side] = 1 / 15
+        units[:, 1, 2 + side] = -1 / 15
+        units[:6, 1, 4 + side] = 1 / 6
+        weights[192 + side, side] = 2 * 25 / _START_PIPS
+    return weights
+
+
+_EXTRA_WEIGHTS = _extra_weights()
+
+
+def n_features(extra: bool = False) -> int:
+    return N_FEATURES + extra * N_EXTRA_FEATURES
+
+
+# the four units per point for 0, ..., 15 checkers
+_POINT_UNITS = np.array([[n >= 1, n >= 2, n >= 3, max(n - 3, 0) / 2] for n in range(16)], dtype=np.float32)
+
+
+def encode_points(
+        points: ArrayLike,
+        turn: ArrayLike = Color.NONE,
+        out: NDArray[np.float32] | None = None,
+        extra: bool = False,
+) -> NDArray[np.float32]:
+    """Encode points of shape (n, 26) or (26,) into features of shape (n, n_features(extra)) or (n_features(extra),).
+
+    Args:
+        points (ArrayLike):     The points of the positions (in regular orientation).
+        turn (ArrayLike):       Whose turn it is - a single color or one per position. With `Color.NONE`, both turn
+                                units are zero.
+        out (NDArray):          A preallocated, C-contiguous float32 buffer to write the features into. A new one is
+                                allocated, if it is None.
+        extra (bool):           Append the extra features.
+
+    Returns:
+        features (NDArray[np.float32]):     The features (i.e. `out`, if given).
+    """
+    points = np.asarray(points)
+    single = points.ndim == 1
+    points = np.atleast_2d(points)
+    n = len(points)
+    shape = (n, n_features(extra))
+    if out is None:
+        out_2d = np.empty(shape, dtype=np.float32)
+    else:
+        if out.dtype != np.float32:
+            raise ValueError(f"`out` must be of dtype float32, got {out.dtype}")
+        out_2d = out.reshape(shape)
+        if not np.shares_memory(out_2d, out):
+            raise ValueError(f"`out` must be C-contiguous and match shape {shape}, got shape {out.shape}")
+
+    checkers = np.empty((n, 48), dtype=np.intp)
+    white = np.clip(points[:, 1:25], 0, None, out=checkers[:, :24])
+    black = np.clip(-points[:, 24:0:-1], 0, None, out=checkers[:, 24:])
+    units = as_strided(out_2d, shape=(n, 48, 4), strides=(out_2d.strides[0], 4 * out_2d.itemsize, out_2d.itemsize))
+    np.take(_POINT_UNITS, checkers, axis=0, out=units)
+
+    np.multiply(points[:, WHITE_BAR], 0.5, out=out_2d[:, 192])
+    np.multiply(points[:, BLACK_BAR], -0.5, out=out_2d[:, 193])
+    np.subtract(15, white.sum(axis=1) + points[:, WHITE_BAR], out=out_2d[:, 194])
+    np.subtract(15, black.sum(axis=1) - points[:, BLACK_BAR], out=out_2d[:, 195])
+    out_2d[:, 194:196] /= 15
+
+    turn = np.broadcast_to(np.asarray(turn), (n,))
+    np.equal(turn, Color.WHITE, out=out_2d[:, 196])
+    np.equal(turn, Color.BLACK, out=out_2d[:, 197])
+
+    if extra:
+        np.matmul(out_2d[:, :194], _EXTRA_WEIGHTS, out=out_2d[:, 198:])
+
+    if out is not None:
+        return out
+    return out_2d[0] if single else out_2d
+
+
+def encode_board(board: Board, turn: Color = Color.NONE, extra: bool = False) -> NDArray[np.float32]:
+    return encode_points(board.points, turn, extra=extra)
+
+
+def encode_state(state: GameState, extra: bool = False) -> NDArray[np.float32]:
+    return encode_points(state.board.points, state.turn, extra=extra)
+
+
+def encode_states(
+        states: Iterable[GameState],
+        out: NDArray[np.float32] | None = None,
+        extra: bool = False,
+) -> NDArray[np.float32]:
+    states = list(states)
+    points = np.array([s.board.points for s in states], dtype=int).reshape(len(states), 26)
+    turns = np.array([s.turn for s in states], dtype=int)
+    return encode_points(points, turns, out=out, extra=extra)
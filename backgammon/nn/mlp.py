@@ -0,0 +1,129 @@
+from typing import Sequence
+from os import PathLike
+from numpy.typing import NDArray
+import numpy as np
+
+from ..core import Color
+from .encoding import n_features, encode_points
+
+
+def sigmoid(x: NDArray[np.float32]) -> NDArray[np.float32]:
+    # computed in place - `x` is always a fresh array here
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    np.reciprocal(x, out=x)
+    return x
+
+
+class MLP:
+    """A multilayer perceptron with sigmoid activations (also for the output layer), implemented in NumPy.
+
+    Args:
+        weights (Sequence[NDArray]):    The weight matrices of the layers, each with shape (n_in, n_out).
+        biases (Sequence[NDArray]):     The bias vectors of the layers, each with shape (n_out,).
+    """
+
+    def __init__(self, weights: Sequence[NDArray[np.float32]], biases: Sequence[NDArray[np.float32]]):
+        if len(weights) != len(biases) or len(weights) == 0:
+            raise ValueError("need the same (positive) number of weight matrices and bias vectors")
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            if w.ndim != 2 or b.shape != (w.shape[1],):
+                raise ValueError(f"shapes of layer {i} do not match: weights {w.shape}, biases {b.shape}")
+            if i > 0 and w.shape[0] != self.weights[i - 1].shape[1]:
+                raise ValueError(f"input size of layer {i} does not match the previous output size")
+
+    @classmethod
+    def create(cls, sizes: Sequence[int], seed: int | None = None) -> 'MLP':
+        """Create a network with layers of the given sizes (including input and output) and random weights."""
+        rng = np.random.default_rng(seed)
+        weights = [rng.uniform(-1, 1, size=(n_in, n_out)) / np.sqrt(n_in) for n_in, n_out in zip(sizes, sizes[1:])]
+        biases = [np.zeros(n_out) for n_out in sizes[1:]]
+        return cls(weights, biases)  # type: ignore
+
+    @classmethod
+    def load(cls, path: str | PathLike) -> 'MLP':
+        """Load the weights from an `.npz` file with arrays `W0, b0, W1, b1, ...`."""
+        with np.load(path) as data:
+            n_layers = sum(1 for k in data.files if k.startswith('W'))
+            return cls([data[f'W{i}'] for i in range(n_layers)], [data[f'b{i}'] for i in range(n_layers)])
+
+    def save(self, path: str | PathLike):
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'W{i}'] = w
+            arrays[f'b{i}'] = b
+        np.savez(path, **arrays)  # type: ignore[arg-type]
+
+    @property
+    def sizes(self) -> tuple[int, ...]:
+        return (self.weights[0].shape[0],) + tuple(w.shape[1] for w in self.weights)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(sizes={self.sizes})"
+
+    @property
+    def params(self) -> list[NDArray[np.float32]]:
+        return [p for wb in zip(self.weights, self.biases) for p in wb]
+
+    def forward(self, x: NDArray[np.float32]) -> list[NDArray[np.float32]]:
+        """All activations (including the input) for a batch of inputs of shape (n, n_in)."""
+        activations = [x]
+        for w, b in zip(self.weights, self.biases):
+            z = x @ w
+            z += b
+            x = sigmoid(z)
+            activations.append(x)
+        return activations
+
+    def __call__(self, x: NDArray[np.float32]) -> NDArray[np.float32]:
+        """The outputs for a batch of inputs of shape (n, n_in). With a single output unit, the shape is (n,)."""
+        for w, b in zip(self.weights, self.biases):
+            z = x @ w
+            z += b
+            x = sigmoid(z)
+        return x[:, 0] if x.shape[1] == 1 else x
+
+    def gradient(self, x: NDArray[np.float32]) -> tuple[float, list[NDArray[np.float32]]]:
+        """The (first) output and its gradient with respect to `params` for a single input of shape (n_in,)."""
+        activations = self.forward(x[None, :])
+        out = activations[-1][0, 0]
+        grads: list[NDArray[np.float32]] = []
+        delta = out * (1 - out) * np.eye(1, self.sizes[-1], dtype=np.float32)[0]
+        for i in reversed(range(len(self.weights))):
+            a = activations[i][0]
+            grads.append(delta)  # bias
+            grads.append(np.outer(a, delta))  # weights
+            if i > 0:
+                delta = (self.weights[i] @ delta) * a * (1 - a)
+        return float(out), grads[::-1]
+
+
+class MLPEvaluator:
+    """Evaluate canonical positions right after a play with an `MLP` (see `backgammon.agents.Evaluator`).
+
+    The positions are encoded with `backgammon.nn.encoding` (with the opponent, i.e. BLACK, to move) into a reused
+    buffer, and evaluated with a single forward pass.
+    """
+
+    def __init__(self, model: MLP, extra: bool = False):
+        if model.sizes[0] != n_features(extra):
+            raise ValueError(f"model expects {model.sizes[0]} inputs, but the encoding has {n_features(extra)}")
+        self.model = model
+        self.extra = extra
+        self._buffer = np.empty((0, n_features(extra)), dtype=np.float32)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.model!r}, extra={self.extra})"
+
+    def encode(self, points: NDArray[np.integer]) -> NDArray[np.float32]:
+        n = len(points)
+        if len(self._buffer) < n:
+            self._buffer = np.empty((max(n, 2 * len(self._buffer)), n_features(self.extra)), dtype=np.float32)
+        return encode_points(points, Color.BLACK, out=self._buffer[:n], extra=self.extra)
+
+    def __call__(self, points: NDArray[np.integer]) -> NDArray[np.float32]:
+        out = self.model(self.encode(points))
+        return out if out.ndim == 1 else out[:, 0]
@@ -0,0 +1,86 @@
+from typing import Any
+import numpy as np
+
+from ..core import Color, GameState, GameResult
+from ..core.actions import canonical_points
+from .mlp import MLP, MLPEvaluator
+
+
+class TDTrainer:
+    """Train an `MLP` with TD(λ) in self-play, as TD-Gammon did.
+
+    The network evaluates the position after each play from the viewpoint of the player who played (see
+    `MLPEvaluator`). For the TD updates, these evaluations are converted to winning probabilities of WHITE, so that
+    successive positions of both players form one sequence. Gammons are not distinguished from normal wins.
+
+    Args:
+        model (MLP):        The network to train (in place).
+        alpha (float):      The learning rate.
+        lam (float):        The trace decay λ.
+        extra (bool):       Whether the network uses the extra input features.
+        epsilon (float):    Probability to choose a random play instead of the best one (for exploration).
+    """
+
+    def __init__(self, model: MLP, alpha: float = 0.1, lam: float = 0.7, extra: bool = False, epsilon: float = 0.0):
+        self.model = model
+        self.alpha = alpha
+        self.lam = lam
+        self.extra = extra
+        self.epsilon = epsilon
+        self.evaluator = MLPEvaluator(model, extra=extra)
+        self.n_games = 0
+
+    def _update(self, delta: float, trace: list[np.ndarray]):
+        for p, e in zip(self.model.params, trace):
+            p += self.alpha * delta * e
+
+    def play_game(self) -> GameResult:
+        """Play a single game against itself and learn from it."""
+        state = GameState()
+        trace = [np.zeros_like(p) for p in self.model.params]
+        prev_u: float | None = None
+
+        while True:
+            state.roll_dice()
+            plays = state.build_legal_plays()
+            if len(plays) > 1 and np.random.random() < self.epsilon:
+                play = plays[np.random.randint(len(plays))]
+            elif len(plays) > 1:
+                values = self.evaluator(canonical_points(np.array([p.board.points for p in plays]), state.turn))
+                play = plays[int(np.argmax(values))]
+            else:
+                play = plays[0]
+            for k, move in play.moves:
+                state.do_move(move, k)
+
+            if state.board.game_over():
+                target = 1.0 if state.board.winner() == Color.WHITE else 0.0
+                if prev_u is not None:
+                    self._update(target - prev_u, trace)
+                self.n_games += 1
+                return state.result()
+
+            features = self.evaluator.encode(canonical_points(state.board.points, state.turn)[None, :])[0]
+            v, grads = self.model.gradient(features)
+            sign = 1 if state.turn == Color.WHITE else -1
+            u = v if sign > 0 else 1.0 - v
+            if prev_u is not None:
+                self._update(u - prev_u, trace)
+            for e, g in zip(trace, grads):
+                e *= self.lam
+                e += sign * g
+            prev_u = u
+
+            state.finish_turn(checked=False)
+
+    def train(self, n_games: int, tqdm_disable: bool = False, tqdm_args: dict[str, Any] | None = None) -> list[Color]:
+        """Play `n_games` games in self-play and return their winners."""
+        from tqdm.auto import tqdm  # type: ignore  # imported here, as it is slow to import
+        args = dict(unit='games', smoothing=0.05, disable=tqdm_disable)
+        if tqdm_args is not None:
+            args.update(tqdm_args)
+
+        winners = []
+        for _ in tqdm(range(n_games), **args):
+            winners.append(self.play_game().winner)
+        return winners
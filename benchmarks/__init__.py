@@ -0,0 +1,4 @@
+"""Benchmarks of the core engine, agents, games and rendering.
+
+Run them with `python -m benchmarks` (see `python -m benchmarks --help`).
+"""
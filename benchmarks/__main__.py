@@ -0,0 +1,148 @@
+"""Run the benchmarks, write the results as JSON and compare them to a baseline.
+
+Examples:
+    python -m benchmarks                                # run all, compare to benchmarks/baseline.json
+    python -m benchmarks -k legal_moves -o out.json     # run a subset and write the results
+    python -m benchmarks --save-baseline                # run all and store them as new baseline
+
+Besides the comparison to the baseline, some benchmarks have absolute targets (see `suite.TARGETS`).
+"""
+from typing import Any
+from pathlib import Path
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+
+from .suite import BENCHMARKS, TARGETS
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+
+def measure(name: str, min_time: float = 0.2, repeat: int = 5) -> dict[str, Any]:
+    """Time rounds of a benchmark. The reported time per round is the minimum over `repeat` measurements."""
+    run, n_items = BENCHMARKS[name]()
+    run()  # warm up
+
+    t0 = time.perf_counter()
+    run()
+    once = time.perf_counter() - t0
+    number = max(1, int(min_time / max(once, 1e-9)))
+
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            run()
+        times.append((time.perf_counter() - t0) / number)
+
+    best = min(times)
+    return dict(
+        seconds=best,
+        median_seconds=float(np.median(times)),
+        items=n_items,
+        items_per_second=n_items / best,
+        rounds=number * repeat,
+    )
+
+
+def metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip()
+    except OSError:
+        commit = ''
+    return dict(
+        python=platform.python_version(),
+        numpy=np.__version__,
+        machine=platform.machine(),
+        platform=platform.platform(),
+        commit=commit,
+        time=time.strftime('%Y-%m-%dT%H:%M:%S'),
+    )
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Print a comparison table and return the names of regressed benchmarks."""
+    regressions = []
+    print(f"{'benchmark':32s} | {'items/s':>12s} | {'baseline':>12s} | {'ratio':>6s}")
+    print(f"{'-' * 32}-|-{'-' * 12}-|-{'-' * 12}-|-{'-' * 6}")
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:32s} | {res['items_per_second']:12.1f} | {'-':>12s} | {'-':>6s}")
+            continue
+        ratio = res['seconds'] / base['seconds']
+        flag = ''
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = '  <-- REGRESSION'
+        print(f"{name:32s} | {res['items_per_second']:12.1f} | {base['items_per_second']:12.1f} | {ratio:6.2f}{flag}")
+    return regressions
+
+
+def check_targets(results: dict[str, Any]) -> list[str]:
+    """Print the benchmarks missing their target and return their names."""
+    missed = []
+    for name, res in results.items():
+        target = TARGETS.get(name)
+        if target is not None and res['seconds'] / res['items'] > target:
+            missed.append(name)
+            print(f"{name}: {res['seconds'] / res['items']:.3f}s per item misses the target of {target:.3f}s")
+    return missed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', '--filter', default='', help="only run benchmarks whose name contains this string")
+    parser.add_argument('-o', '--output', type=Path, help="write the results as JSON to this file")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="baseline to compare with")
+    parser.add_argument('--save-baseline', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="relative slowdown that counts as regression (default: 0.25)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimum time per measurement in seconds")
+    parser.add_argument('--list', action='store_true', help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+
+    results = {}
+    for name in names:
+        results[name] = measure(name, min_time=args.min_time)
+        print(f"{name:32s} {results[name]['items_per_second']:12.1f} items/s", file=sys.stderr)
+    report = dict(meta=metadata(), results=results)
+    missed = check_targets(results)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        if args.baseline.exists():
+            with open(args.baseline) as f:
+                old = json.load(f)['results']
+            report['results'] = {**old, **results}
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        return int(len(missed) > 0)
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline} - run with --save-baseline first", file=sys.stderr)
+        return int(len(missed) > 0)
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+    return int(len(regressions) > 0 or len(missed) > 0)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Fixed corpus of game states for the benchmarks.
+
+The corpus is stored in `corpus.json`, so that it does not change with the code generating it. It can be regenerated
+with `python -m benchmarks.corpus`.
+"""
+from pathlib import Path
+import json
+import random
+import numpy as np
+
+from backgammon.core import Color, Board, GameState
+from backgammon.game import Game, ActionType
+from backgammon.agents import RandomAgent
+
+CORPUS_PATH = Path(__file__).parent / 'corpus.json'
+SEED = 1234
+
+
+def generate_corpus(n_games: int = 20, every: int = 7, seed: int = SEED) -> list[dict]:
+    """Sample states (at the start of a turn, with rolled dice) from games between random agents."""
+    random.seed(seed)
+    np.random.seed(seed)
+    agent = RandomAgent(double_prob=0.0)
+    corpus = []
+    for _ in range(n_games):
+        game = Game()
+        n = 0
+        while not game.game_over():
+            action = game.step(agent, allow_doubling=False)
+            if action is not None and action.type == ActionType.DICEROLL:
+                n += 1
+                if n % every == 0 and len(game.state.build_legal_moves()) > 0:
+                    state = game.state
+                    corpus.append(dict(points=state.board.points.tolist(), turn=int(state.turn), dice=state.dice))
+    return corpus
+
+
+def load_corpus() -> list[GameState]:
+    with open(CORPUS_PATH) as f:
+        entries = json.load(f)
+    return [
+        GameState(Board(e['points']), turn=Color(e['turn']), dice=e['dice'], dice_used=[False] * len(e['dice']))
+        for e in entries
+    ]
+
+
+if __name__ == '__main__':
+    # one state per line
+    lines = [json.dumps(entry, separators=(',', ':')) for entry in generate_corpus()]
+    with open(CORPUS_PATH, 'w') as f:
+        f.write('[\n' + ',\n'.join(lines) + '\n]\n')
@@ -0,0 +1,248 @@
+"""The benchmarks. Each one is set up once and returns a function doing one round of work on `n_items` items."""
+from typing import Callable
+import random
+import subprocess
+import sys
+import numpy as np
+
+from backgammon.core import Color, Board, Move, MoveList, GameState
+from backgammon.game import Game, Match
+from backgammon.agents import RandomAgent, SimpleAgent, RaceAgent, rollout
+from backgammon.misc import hit_prob, simulate, WinProbModel
+from .corpus import load_corpus, SEED
+
+Benchmark = Callable[[], tuple[Callable[[], object], int]]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+# upper limits for the seconds per item, checked on every run (independent of the baseline)
+TARGETS: dict[str, float] = {
+    'import_backgammon': 0.35,
+}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def _corpus(doubles: bool | None = None) -> list[GameState]:
+    states = load_corpus()
+    if doubles is None:
+        return states
+    return [s for s in states if (len(s.dice) == 4) == doubles]
+
+
+def _uncached_legal_moves(state: GameState) -> list[Move]:
+    # `GameState.build_legal_moves` caches the moves by position and dice
+    state._legal_moves.clear()
+    return state.build_legal_moves()
+
+
+@benchmark('legal_moves_singles')
+def legal_moves_singles():
+    states = _corpus(doubles=False)
+    return lambda: [_uncached_legal_moves(s) for s in states], len(states)
+
+
+@benchmark('legal_moves_doubles')
+def legal_moves_doubles():
+    states = _corpus(doubles=True)
+    return lambda: [_uncached_legal_moves(s) for s in states], len(states)
+
+
+@benchmark('legal_moves_cached')
+def legal_moves_cached():
+    states = _corpus()
+    for s in states:
+        s.build_legal_moves()
+    return lambda: [s.build_legal_moves() for s in states], len(states)
+
+
+@benchmark('legal_move_list_singles')
+def legal_move_list_singles():
+    states = _corpus(doubles=False)
+    moves = MoveList()
+    return lambda: [s.legal_move_list(moves) for s in states], len(states)
+
+
+@benchmark('legal_plays_doubles')
+def legal_plays_doubles():
+    states = _corpus(doubles=True)
+    return lambda: [s.build_legal_plays() for s in states], len(states)
+
+
+@benchmark('board_do_undo_move')
+def board_do_undo_move():
+    pairs: list[tuple[Board, Move]] = [(s.board, m) for s in _corpus() for m in s.build_legal_moves()]
+
+    def run():
+        for board, move in pairs:
+            board.do_move(move)
+            board.undo_move(move)
+
+    return run, len(pairs)
+
+
+@benchmark('state_make_unmake')
+def state_make_unmake():
+    pairs: list[tuple[GameState, Move]] = [(s.copy(), m) for s in _corpus() for m in s.build_legal_moves()]
+
+    def run():
+        for state, move in pairs:
+            state.make(move)
+            state.unmake()
+
+    return run, len(pairs)
+
+
+def _board_queries(incremental: bool):
+    boards = [Board(s.board.points, incremental=incremental) for s in _corpus()]
+
+    def run():
+        for board in boards:
+            board.pip_count()
+            board.checkers_count(Color.WHITE)
+            board.game_over()
+
+    return run, len(boards)
+
+
+@benchmark('board_queries')
+def board_queries():
+    return _board_queries(incremental=False)
+
+
+@benchmark('board_queries_incremental')
+def board_queries_incremental():
+    return _board_queries(incremental=True)
+
+
+@benchmark('hit_prob')
+def hit_prob_():
+    blots = [(s.board, p) for s in _corpus() for p in range(1, 25) if abs(s.board.points[p]) == 1]
+    return lambda: [hit_prob(board, p, only_legal=True) for board, p in blots], len(blots)
+
+
+@benchmark('simple_agent_choose_move')
+def simple_agent_choose_move():
+    states = _corpus()
+
+    def run():
+        agent = SimpleAgent()  # fresh caches
+        return [agent.choose_move(s) for s in states]
+
+    return run, len(states)
+
+
+@benchmark('game_playout_random')
+def game_playout_random():
+    n_games = 5
+    agent = RandomAgent(double_prob=0.0)
+
+    def run():
+        random.seed(SEED)
+        for _ in range(n_games):
+            game = Game()
+            while not game.game_over():
+                game.step(agent, allow_doubling=False)
+
+    return run, n_games
+
+
+@benchmark('game_playout_simple')
+def game_playout_simple():
+    def run():
+        random.seed(SEED)
+        np.random.seed(SEED)
+        game = Game()
+        agent = SimpleAgent()
+        while not game.game_over():
+            game.step(agent, allow_doubling=False)
+
+    return run, 1
+
+
+@benchmark('match_games_random')
+def match_games_random():
+    n_games = 5
+
+    def run():
+        random.seed(SEED)
+        match = Match(RandomAgent(double_prob=0.0), n_points=n_games, allow_doubling=False)
+        while len(match.games) < n_games:
+            match.play_single_game()
+
+    return run, n_games
+
+
+@benchmark('svg_gamestate')
+def svg_gamestate_():
+    from backgammon.display import svg_gamestate
+    states = _corpus()[:20]
+    return lambda: [svg_gamestate(s).tostring() for s in states], len(states)
+
+
+@benchmark('svg_gamestate_layered')
+def svg_gamestate_layered():
+    from backgammon.display import svg_gamestate
+    states = _corpus()[:20]
+    return lambda: [svg_gamestate(s, layered=True).tostring() for s in states], len(states)
+
+
+@benchmark('board_ascii_art')
+def board_ascii_art_():
+    from backgammon.display import board_ascii_art
+    boards = [s.board for s in _corpus()]
+    return lambda: [board_ascii_art(b) for b in boards], len(boards)
+
+
+@benchmark('est_win_prob')
+def est_win_prob():
+    states = _corpus()
+    agent = SimpleAgent()
+    return lambda: [agent.est_win_prob(s, Color.WHITE) for s in states], len(states)
+
+
+@benchmark('win_probs_batch')
+def win_probs_batch():
+    points = np.array([s.board.points for s in _corpus()])
+    model = WinProbModel()
+    return lambda: (model.win_probs(points), model.gammon_probs(points)), len(points)
+
+
+@benchmark('simulate_random')
+def simulate_random():
+    return lambda: simulate(5000, seed=SEED), 5000
+
+
+@benchmark('simulate_simple')
+def simulate_simple():
+    return lambda: simulate(5000, policy='simple', seed=SEED), 5000
+
+
+@benchmark('rollout_race')
+def rollout_race():
+    points = np.zeros(26, dtype=int)
+    points[1:7] = [2, 2, 2, 3, 3, 3]
+    points[19:25] = [-3, -3, -3, -2, -2, -2]
+    state = GameState(Board(points), Color.WHITE)
+    return lambda: rollout(state, RaceAgent(), n_trials=36, stratify=1, seed=SEED), 36
+
+
+# must not be imported by a plain `import backgammon`, e.g. in worker processes
+HEAVY_MODULES = ('svgwrite', 'matplotlib', 'PIL', 'cairosvg', 'tqdm', 'cProfile', 'pstats')
+
+
+@benchmark('import_backgammon')
+def import_backgammon():
+    code = f"import sys, backgammon; sys.exit(any(m in sys.modules for m in {HEAVY_MODULES!r}))"
+
+    def run():
+        # a fresh interpreter for each import (including its startup time)
+        if subprocess.run([sys.executable, '-c', code]).returncode != 0:
+            raise RuntimeError(f"`import backgammon` imports one of {', '.join(HEAVY_MODULES)}")
+
+    return run, 1
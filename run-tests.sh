@@ -2,6 +2,7 @@
 
 flake8 backgammon
 flake8 tests
+flake8 benchmarks
 
 mypy backgammon
 mypy tests
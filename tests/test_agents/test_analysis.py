@@ -0,0 +1,95 @@
+import io
+import random
+
+import numpy as np
+import pytest
+
+from backgammon.core import Board, Color, GameState
+from backgammon.game import Game, GameLogger
+from backgammon.core.actions import canonical_points
+from backgammon.agents import EvaluatorAgent, RandomAgent, analyze
+from backgammon.misc import race_win_prob
+
+
+# a middle game with a back checker each, i.e. with contact but only about a dozen turns to go
+_MIDGAME = [0, 2, 2, 2, 2, 2, 2, -1, 2, 0, 0, 0, 0, 0, 0, 0, 0, -2, 1, -2, -2, -2, -2, -2, -2, 0]
+
+
+def _games(n_games, seed=0):
+    random.seed(seed)  # `RandomAgent` and the dice use the `random` module
+    agents = {Color.BLACK: RandomAgent(), Color.WHITE: EvaluatorAgent(race_win_prob)}
+    games = []
+    for _ in range(n_games):
+        game = Game(GameState(Board(_MIDGAME)))
+        while not game.game_over():
+            game.step(agents, allow_doubling=False)
+        games.append(game)
+    return games
+
+
+def test_analyze():
+    games = _games(4)
+    analysis = analyze(games, race_win_prob)
+    assert len(analysis.decisions) > 0
+    assert all(d.n_plays > 1 and d.loss >= 0 for d in analysis.decisions)
+    assert {d.game for d in analysis.decisions} == set(range(len(games)))
+
+    # WHITE plays the best plays of the evaluator
+    stats = analysis.player_stats()
+    white = [d for d in analysis.decisions if d.player == Color.WHITE]
+    assert all(np.isclose(d.loss, 0) for d in white)
+    assert stats[Color.WHITE].n_errors == 0 and np.isclose(stats[Color.WHITE].total_loss, 0)
+    assert stats[Color.BLACK].n_errors > 0
+    assert stats[Color.BLACK].n_decisions + stats[Color.WHITE].n_decisions == len(analysis.decisions)
+
+    blunders = analysis.blunders()
+    assert len(blunders) == stats[Color.BLACK].n_blunders
+    assert all(a.loss >= b.loss >= analysis.blunder_th for a, b in zip(blunders, blunders[1:]))
+    # the best play leads to the best position
+    for d in blunders:
+        state = d.state.copy()
+        for move in d.best_moves:
+            state.do_move(move)
+        points = canonical_points(state.board.points, d.player)
+        assert np.isclose(2 * race_win_prob(points[None, :])[0] - 1, d.best_equity)
+
+
+def test_analyze_cache_and_log(tmp_path):
+    games = _games(2, seed=1)
+    calls = []
+
+    def evaluator(points):
+        calls.append(len(points))
+        return race_win_prob(points)
+
+    cache = {}
+    analysis = analyze(games, evaluator, cache=cache, batch_size=16)
+    n_calls = len(calls)
+    assert n_calls > 1 and len(cache) >= len(analysis.decisions)
+
+    # the same games from a log, evaluated from the cache
+    f = io.StringIO()
+    logger = GameLogger(f)
+    for game in games:
+        logger.log_game(game)
+    path = tmp_path / 'games.log'
+    path.write_text(f.getvalue())
+    again = analyze(path, evaluator, cache=cache)
+    assert len(calls) == n_calls
+    assert [d.loss for d in again.decisions] == [d.loss for d in analysis.decisions]
+
+    pooled = analyze(games, EvaluatorAgent(race_win_prob), max_workers=1, batch_size=16)
+    assert np.allclose([d.loss for d in pooled.decisions], [d.loss for d in analysis.decisions])
+
+
+def test_analyze_one_ply():
+    random.seed(2)
+    game = Game()
+    agents = {Color.BLACK: RandomAgent(), Color.WHITE: RandomAgent()}
+    while sum(t.next_state.turn != t.state.turn for t in game.history) < 4:
+        game.step(agents, allow_doubling=False)
+    analysis = analyze([game], race_win_prob, plies=1)
+    assert all(-1 <= d.equity <= d.best_equity <= 1 for d in analysis.decisions)
+
+    with pytest.raises(ValueError):
+        analyze([game], race_win_prob, plies=2)
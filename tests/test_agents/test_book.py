@@ -0,0 +1,83 @@
+import numpy as np
+
+from backgammon.core import Color, GameState, Move
+from backgammon.game import Match
+from backgammon.agents import RandomAgent, OpeningBook, BookAgent
+from backgammon.agents.book import book_key, dice_code
+
+
+def _pips_evaluator(points):
+    # prefers positions with few own pips
+    return -np.sum(np.clip(points, 0, None) * np.arange(26), axis=1).astype(float)
+
+
+def _opening(turn, dice):
+    return GameState(turn=turn, dice=dice, dice_used=[False] * len(dice))
+
+
+def test_dice_code():
+    assert dice_code([3, 5]) == dice_code([5, 3]) == 5 * 7 + 3
+    assert dice_code([]) == 0
+    assert len({dice_code([d] * n) for d in range(1, 7) for n in range(1, 5)}) == 24
+
+
+def test_book_key_uses_unused_dice():
+    state = _opening(Color.WHITE, [6, 5])
+    key = book_key(state)
+    assert key == book_key(_opening(Color.WHITE, [5, 6]))
+    # the starting position is symmetric
+    assert key == book_key(_opening(Color.BLACK, [6, 5]))
+    state.dice_used[0] = True
+    assert book_key(state)[1] == 5
+    # a position and its mirror image share the key
+    state.board.do_move(Move(24, 18))
+    assert book_key(state) == book_key(state.flipped())
+    # but not the same position with the other player to move
+    other = state.copy()
+    other.turn = Color.BLACK
+    assert book_key(state) != book_key(other)
+
+
+def test_generate_opening_moves_for_both_colors():
+    book = OpeningBook.generate(_pips_evaluator, replies=False)
+    for turn in (Color.WHITE, Color.BLACK):
+        state = _opening(turn, [4, 2])
+        while not all(state.dice_used):
+            move = book.lookup(state)
+            assert move is not None
+            state.do_move(move)
+        assert state.board.pip_count(turn) == 167 - 6
+    assert book.lookup(_opening(Color.WHITE, [4, 4])) is None
+
+
+def test_generate_replies_and_save_load(tmp_path):
+    book = OpeningBook.generate(_pips_evaluator)
+    state = _opening(Color.WHITE, [3, 1])
+    while not all(state.dice_used):
+        state.do_move(book.lookup(state))
+    state.finish_turn()
+    state.dice, state.dice_used = [2, 2, 2, 2], [False] * 4
+    assert state in book
+
+    book.save(tmp_path / 'book.npz')
+    loaded = OpeningBook.load(tmp_path / 'book.npz')
+    assert loaded.moves == book.moves
+    assert loaded.source == book.source
+
+
+def test_book_agent():
+    book = OpeningBook({book_key(_opening(Color.WHITE, [2, 1])): Move(6, 4)})
+    agent = BookAgent(RandomAgent(), book)
+    assert agent.choose_move(_opening(Color.WHITE, [2, 1])) == Move(6, 4)
+    assert agent.n_hits == 1
+    state = _opening(Color.WHITE, [6, 5])
+    assert agent.choose_move(state) in state.build_legal_moves()
+    assert agent.n_hits == 1
+
+
+def test_book_agent_match():
+    book = OpeningBook.generate(_pips_evaluator, replies=False)
+    agent = BookAgent(RandomAgent(), book)
+    match = Match({Color.BLACK: agent, Color.WHITE: RandomAgent()}, n_points=1)
+    match.play(tqdm_disable=True)
+    assert max(match.points) >= 1
@@ -0,0 +1,30 @@
+import numpy as np
+
+from backgammon.core import Color, GameState
+from backgammon.game import Match
+from backgammon.agents import NeuralAgent, RandomAgent, EvaluatorAgent
+from backgammon.nn import MLP, N_FEATURES
+
+
+def test_evaluator_agent_plays_best_play():
+    # an evaluator preferring positions with few own pips
+    def evaluator(points):
+        return -np.sum(np.clip(points, 0, None) * np.arange(26), axis=1)
+
+    agent = EvaluatorAgent(evaluator)
+    state = GameState(turn=Color.WHITE, dice=[6, 5], dice_used=[False, False])
+    plays = state.build_legal_plays()
+    best = min(p.board.pip_count(Color.WHITE) for p in plays)
+    while not all(state.dice_used):
+        state.do_move(agent.choose_move(state))
+    assert state.board.pip_count(Color.WHITE) == best
+    assert len(agent._plans) == 0
+
+
+def test_neural_agent_match(tmp_path):
+    MLP.create((N_FEATURES, 10, 1), seed=5).save(tmp_path / 'model.npz')
+    agent = NeuralAgent(tmp_path / 'model.npz')
+    assert agent.model.sizes == (N_FEATURES, 10, 1)
+    match = Match({Color.BLACK: agent, Color.WHITE: RandomAgent()}, n_points=2)
+    match.play(tqdm_disable=True)
+    assert max(match.points) >= 2
@@ -0,0 +1,45 @@
+import numpy as np
+
+from backgammon.core import Color, Board, GameState, Move
+from backgammon.game import Match
+from backgammon.agents import RandomAgent, RaceAgent
+from backgammon.misc import effective_pip_counts
+
+
+class _Fallback(RandomAgent):
+
+    def __init__(self):
+        super().__init__()
+        self.n_calls = 0
+
+    def choose_move(self, state: GameState) -> Move:
+        self.n_calls += 1
+        return super().choose_move(state)
+
+
+def test_race_agent_plays_races():
+    fallback = _Fallback()
+    agent = RaceAgent(fallback)
+    points = np.zeros(26, dtype=int)
+    points[[2, 5, 8, 12]] = [3, 4, 4, 4]
+    points[[20, 24]] = [-5, -10]
+    state = GameState(Board(points), Color.WHITE, dice=[6, 5], dice_used=[False, False])
+    best = min(effective_pip_counts(p.board.points)[1] for p in state.build_legal_plays())
+    while not all(state.dice_used):
+        state.do_move(agent.choose_move(state))
+    assert effective_pip_counts(state.board.points)[1] == best
+    assert fallback.n_calls == 0
+
+
+def test_race_agent_falls_back_with_contact():
+    fallback = _Fallback()
+    agent = RaceAgent(fallback)
+    state = GameState(turn=Color.BLACK, dice=[3, 1], dice_used=[False, False])
+    agent.choose_move(state)
+    assert fallback.n_calls == 1
+
+
+def test_race_agent_match():
+    match = Match({Color.BLACK: RaceAgent(RandomAgent()), Color.WHITE: RandomAgent()}, n_points=2)
+    match.play(tqdm_disable=True)
+    assert max(match.points) >= 2
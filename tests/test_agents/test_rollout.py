@@ -0,0 +1,81 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from backgammon.core import Board, Color, GameState
+from backgammon.core.actions import canonical_points
+from backgammon.agents import RaceAgent, RandomAgent, SimpleAgent, rollout, OUTCOMES
+from backgammon.agents.rollout import ROLLS_36, _first_rolls
+from backgammon.misc import race_win_prob
+
+
+def _race(turn=Color.WHITE):
+    # a short race (of 6 checkers each, the others borne off), quick to roll out
+    points = np.zeros(26, dtype=int)
+    points[1:7] = [0, 1, 1, 1, 1, 2]
+    points[19:25] = [-2, -1, -1, -1, -1, 0]
+    return GameState(Board(points), turn)
+
+
+def test_first_rolls_balanced():
+    rolls = [_first_rolls(i, 2) for i in range(1296)]
+    # each block of 36 trials runs through all rolls, for each of the stratified rolls
+    for start in range(0, 1296, 36):
+        for k in range(2):
+            assert sorted(r[k] for r in rolls[start:start + 36]) == sorted(ROLLS_36)
+    assert {r[1] for r in rolls[:72]} == set(ROLLS_36)
+    # and over 1296 trials through all pairs
+    assert len(set(map(tuple, rolls))) == 1296
+
+
+def test_rollout_won_position():
+    # WHITE bears off the last checker with any roll, BLACK is gammoned
+    points = np.zeros(26, dtype=int)
+    points[1] = 1
+    points[19:25] = [-3, -3, -3, -2, -2, -2]
+    res = rollout(GameState(Board(points), Color.WHITE), RandomAgent(), n_trials=36, seed=1)
+    assert res.n_trials == 36
+    assert res.probs['win'] == res.probs['win_gammon'] == 1
+    assert res.equity == 2
+    # BLACK to roll cannot win, but may bear off a checker and save the gammon
+    res = rollout(GameState(Board(points), Color.BLACK), RandomAgent(), n_trials=36, seed=1)
+    assert res.probs['win'] == 0
+    assert 0 < res.probs['lose_gammon'] < 1
+    assert np.isclose(res.equity, -1 - res.probs['lose_gammon'])
+
+    with pytest.raises(ValueError):
+        rollout(GameState(), RandomAgent())
+
+
+def test_rollout_variance_reduction():
+    plain = rollout(_race(), RaceAgent(), n_trials=36, truncate=2, stratify=1, variance_reduction=False, seed=2)
+    reduced = rollout(_race(), RaceAgent(), n_trials=36, truncate=2, stratify=1, seed=2)
+    assert set(plain.probs) == set(OUTCOMES)
+    assert reduced.errors['win'] < plain.errors['win']
+    # the evaluator takes the viewpoint of the player who just played
+    estimate = 1 - race_win_prob(canonical_points(_race().board.points, Color.BLACK)[None, :])[0]
+    assert abs(reduced.probs['win'] - estimate) < 0.1
+    # the race is symmetric but for the player to roll
+    other = rollout(_race(Color.BLACK).flipped(), RaceAgent(), n_trials=36, truncate=2, stratify=1, seed=2)
+    assert np.isclose(other.probs['win'], reduced.probs['win'])
+
+
+def test_rollout_truncated():
+    state = GameState(turn=Color.WHITE)
+    res = rollout(state, SimpleAgent(), n_trials=36, truncate=2, stratify=1, target_error=1.0, batch_size=18, seed=3)
+    # the first batch is precise enough
+    assert res.n_trials == 18
+    assert 0 < res.probs['win'] < 1
+    assert 0 <= res.probs['win_gammon'] <= res.probs['win']
+    assert np.isfinite(res.equity_error)
+
+    again = rollout(state, SimpleAgent(), n_trials=36, truncate=2, stratify=1, target_error=1.0, batch_size=18, seed=3)
+    assert again.probs == res.probs
+
+
+def test_rollout_workers():
+    agent = pickle.loads(pickle.dumps(SimpleAgent()))
+    assert agent.eval_board(Board(), Color.WHITE) == SimpleAgent().eval_board(Board(), Color.WHITE)
+    res = rollout(GameState(turn=Color.WHITE), agent, n_trials=8, truncate=2, max_workers=1, seed=4)
+    assert res.n_trials == 8
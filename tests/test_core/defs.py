@@ -1,6 +1,6 @@
 import numpy as np
 
-from backgammon.core.defs import Color, WinType
+from backgammon.core.defs import Color, WinType, PositionClass
 from backgammon.core.board import Board
 
 
@@ -31,6 +31,8 @@ BOARD_PIP_CNSTS = [(167, 167), (292, 199), (221, 156), (136, 114), (27, 6), (174
 BOARD_CHECKER_CNT = [(15, 15), (15, 13), (15, 13), (15, 15), (14, 6), (15, 0), (0, 15)]
 BOARD_BEARING_OFF = [(False, False), (False, False), (False, False), (False, False), (True, True), (False, True),
                      (True, False)]
+BOARD_CONTACT = [True, True, True, True, False, False, False]
+BOARD_CLASSES = [PositionClass.CONTACT] * 4 + [PositionClass.BEAR_OFF, PositionClass.RACE, PositionClass.RACE]
 BOARD_GAME_OVER = [False, False, False, False, False, True, True]
 BOARD_WINNERS = [Color.NONE, Color.NONE, Color.NONE, Color.NONE, Color.NONE, Color.WHITE, Color.BLACK]
 BOARD_WINTYPES = [
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from backgammon.core.defs import Color
+from backgammon.core.board import Board
+from backgammon.core.state import GameState
+from backgammon.core.legal_moves import build_legal_moves
+from backgammon.core.actions import (
+    N_ACTIONS, NO_ACTION,
+    canonical_points, dice_counts, encode_actions, decode_actions, move_to_action, action_to_move, legal_action_mask,
+    encode_play, decode_play,
+)
+from .defs import rand_board, BOARDS
+
+
+def test_encode_decode_roundtrip():
+    actions = np.arange(N_ACTIONS)
+    for turn in (Color.BLACK, Color.WHITE):
+        src, dst, die = decode_actions(actions, turn)
+        assert np.all((1 <= die) & (die <= 6))
+        assert np.all(np.abs(dst - src) <= die)
+        assert np.all(encode_actions(src, die, turn) == actions)
+
+    # batch with mixed turns and padding
+    turns = np.array([Color.WHITE, Color.BLACK])[:, None]
+    src = np.array([[24, 13, 0, 0], [1, 12, 0, 0]])
+    die = np.array([[3, 1, 0, 0], [3, 1, 0, 0]])
+    actions = encode_actions(src, die, turns)
+    assert np.all(actions[0] == actions[1])
+    assert np.all(actions[:, 2:] == NO_ACTION)
+    dec_src, _, dec_die = decode_actions(actions, turns)
+    assert np.all(dec_src == src)
+    assert np.all(dec_die == die)
+
+
+@pytest.mark.parametrize('board', BOARDS)
+def test_encode_decode_play(board: Board):
+    for turn in (Color.BLACK, Color.WHITE):
+        for dice in ([6, 1], [3, 3, 3, 3]):
+            state = GameState(board, turn, dice=dice, dice_used=[False] * len(dice))
+            for play in state.build_legal_plays():
+                actions = encode_play(play.moves, dice, turn)
+                assert len(actions) == 4
+                assert np.all(actions[len(play.moves):] == NO_ACTION)
+                assert decode_play(actions, board, turn) == [m for _, m in play.moves]
+
+
+def test_canonical_points():
+    board = BOARDS[1]
+    assert np.all(canonical_points(board.points, Color.WHITE) == board.points)
+    assert np.all(canonical_points(board.points, Color.BLACK) == board.flipped().points)
+    batch = canonical_points(np.stack([board.points, board.points]), np.array([Color.WHITE, Color.BLACK]))
+    assert np.all(batch[0] == board.points)
+    assert np.all(batch[1] == board.flipped().points)
+
+
+def test_dice_counts():
+    assert np.all(dice_counts([3, 5]) == [0, 0, 1, 0, 1, 0])
+    assert np.all(dice_counts([2, 2, 2, 2], [True, False, False, True]) == [0, 2, 0, 0, 0, 0])
+
+
+@pytest.mark.parametrize('board', BOARDS + [rand_board() for _ in range(30)])
+def test_legal_action_mask(board: Board):
+    for color in (Color.BLACK, Color.WHITE):
+        for pips in range(1, 6 + 1):
+            dice = np.zeros(6, dtype=int)
+            dice[pips - 1] = 1
+            mask = legal_action_mask(board, dice, color)
+            moves = [action_to_move(a, board, color) for a in np.where(mask)[0]]
+            expected = build_legal_moves(board, pips, color)
+            assert set(moves) == set(expected)
+            for m in expected:
+                assert mask[move_to_action(m, pips, color)]
+
+
+def test_legal_action_mask_batch():
+    boards = BOARDS + [rand_board() for _ in range(20)]
+    points = np.stack([b.points for b in boards])
+    turns = np.where(np.arange(len(boards)) % 2, Color.WHITE, Color.BLACK)
+    dice = np.random.randint(0, 3, size=(len(boards), 6))
+    masks = legal_action_mask(points, dice, turns)
+    assert masks.shape == (len(boards), N_ACTIONS)
+    for board, turn, d, mask in zip(boards, turns, dice, masks):
+        assert np.all(mask == legal_action_mask(board, d, Color(turn)))
@@ -0,0 +1,30 @@
+import numpy as np
+
+from backgammon.core.batch import blot_counts, home_blot_counts, contact
+
+from .defs import BOARDS, rand_board
+
+
+def test_blot_counts():
+    boards = BOARDS + [rand_board() for _ in range(100)]
+    points = np.array([b.points for b in boards])
+    blots = blot_counts(points)
+    home_blots = home_blot_counts(points)
+    for b, (black, white), (home_black, home_white) in zip(boards, blots, home_blots):
+        assert black == sum(b.points[p] == -1 for p in range(1, 25))
+        assert white == sum(b.points[p] == 1 for p in range(1, 25))
+        assert home_black == sum(b.points[p] == -1 for p in range(19, 25))
+        assert home_white == sum(b.points[p] == 1 for p in range(1, 7))
+
+
+def test_contact():
+    points = np.array([b.points for b in BOARDS])
+    assert contact(points).tolist() == [True, True, True, True, False, False, False]
+    assert contact(points[0])
+
+    race = np.zeros(26, dtype=int)
+    race[[2, 5]] = 3
+    race[[8, 20]] = -2
+    assert not contact(race)
+    race[0] = -1  # on the bar
+    assert contact(race)
@@ -1,8 +1,10 @@
 import pytest
 import numpy as np
 
-from backgammon.core.defs import Color, WinType
+from backgammon.core.defs import Color, WinType, PositionClass
 from backgammon.core.board import Board
+from backgammon.core.batch import contact
+from backgammon.core.state import GameState
 from backgammon.display import board_ascii_art
 
 from .defs import (
@@ -10,7 +12,7 @@ from .defs import (
     BOARDS, BOARD_PIP_CNSTS, BOARD_CHECKER_CNT,
     BOARD_REPRS, BOARD_ASCIIS,
     BOARD_GAME_OVER, BOARD_WINNERS, BOARD_WINTYPES,
-    BOARD_BEARING_OFF,
+    BOARD_BEARING_OFF, BOARD_CONTACT, BOARD_CLASSES,
 )
 
 
@@ -136,3 +138,73 @@ def test_bearing_off_color(board: Board, expects: tuple[bool, bool]):
         assert board.bearing_off_allowed(color) == expect
     with pytest.raises(ValueError):
         board.bearing_off_allowed(Color.NONE)
+
+
+@pytest.mark.parametrize('board, expect, cls', zip(BOARDS, BOARD_CONTACT, BOARD_CLASSES))
+def test_contact(board: Board, expect: bool, cls: PositionClass):
+    assert board.contact() == expect
+    assert board.flipped().contact() == expect
+    assert board.position_class() == cls
+
+
+def test_incremental_contact():
+    np.random.seed(3)
+    for _ in range(5):
+        state = GameState(Board(incremental=True), Color.WHITE)
+        while not state.board.game_over():
+            state.roll_dice()
+            while len(moves := state.build_legal_moves()) > 0:
+                move = moves[np.random.randint(len(moves))]
+                k = state.do_move(move)
+                assert state.board.contact() == contact(state.board.points)
+                state.undo_move(move, k)
+                assert state.board.contact() == contact(state.board.points)
+                state.do_move(move, k)
+            assert state.copy().board.contact() == contact(state.board.points)
+            state.finish_turn()
+        assert not state.board.contact()
+
+
+def _assert_counts(board: Board):
+    plain = Board(board.points)
+    for color in (None, Color.BLACK, Color.NONE, Color.WHITE):
+        assert np.all(board.pip_count(color) == plain.pip_count(color))
+        assert np.all(board.checkers_count(color) == plain.checkers_count(color))
+        assert np.all(board.off_count(color) == plain.off_count(color))
+    assert board.game_over() == plain.game_over()
+
+
+@pytest.mark.parametrize('board', BOARDS)
+def test_bar_off_counts(board: Board):
+    assert np.all(board.bar_count() == [-board.points[0], board.points[25]])
+    assert board.bar_count(Color.WHITE) == board.points[25]
+    assert np.all(board.off_count() == 15 - board.checkers_count())
+
+
+def test_incremental_counts():
+    np.random.seed(5)
+    for _ in range(5):
+        state = GameState(Board(incremental=True), Color.BLACK)
+        while not state.board.game_over():
+            state.roll_dice()
+            while len(moves := state.build_legal_moves()) > 0:
+                move = moves[np.random.randint(len(moves))]
+                k = state.do_move(move)
+                _assert_counts(state.board)
+                state.undo_move(move, k)
+                _assert_counts(state.board)
+                state.do_move(move, k)
+            state.finish_turn()
+            if np.random.random() < 0.2:
+                state.flip()
+                _assert_counts(state.board)
+            _assert_counts(state.board.copy())
+
+
+@pytest.mark.parametrize('board', BOARDS)
+def test_counts_of_none(board: Board):
+    incremental = Board(board.points, incremental=True)
+    for b in (board, incremental):
+        assert b.pip_count(Color.NONE) == 0
+        assert b.checkers_count(Color.NONE) == 0
+        assert b.off_count(Color.NONE) == 15
@@ -0,0 +1,49 @@
+import numpy as np
+
+from backgammon.core import Color, Board, START_POINTS, zobrist_hash, zobrist_hashes, canonical_hash, canonical_hashes
+from backgammon.core.actions import canonical_points
+from backgammon.core.hashing import to_signed, to_unsigned
+
+from .defs import BOARDS, rand_board
+
+
+def test_hash_is_stable():
+    # must never change - hashes are stored on disk
+    assert zobrist_hash(START_POINTS) == 16501497675562913975
+    assert zobrist_hash(START_POINTS, Color.WHITE) == 10459062513047885567
+
+
+def test_hashes():
+    boards = BOARDS + [rand_board() for _ in range(200)]
+    points = np.array([b.points for b in boards])
+    distinct = {b.points.tobytes() for b in boards}
+
+    for turn in (Color.BLACK, Color.NONE, Color.WHITE):
+        hashes = zobrist_hashes(points, turn)
+        assert hashes.dtype == np.uint64 and hashes.shape == (len(boards),)
+        assert len(set(hashes.tolist())) == len(distinct)
+        assert [zobrist_hash(b.points, turn) for b in boards] == hashes.tolist()
+
+    turns = np.random.choice([-1, 0, 1], size=len(boards))
+    assert zobrist_hashes(points, turns).tolist() == [zobrist_hash(p, t) for p, t in zip(points, turns)]
+    assert zobrist_hash(START_POINTS, Color.WHITE) != zobrist_hash(START_POINTS, Color.BLACK)
+    assert zobrist_hash(Board().flipped().points) == zobrist_hash(START_POINTS)  # the start is symmetric
+
+    hashes = zobrist_hashes(points)
+    assert np.all(to_unsigned(to_signed(hashes)) == hashes)
+
+
+def test_canonical_hashes():
+    boards = BOARDS + [rand_board() for _ in range(100)]
+    points = np.array([b.points for b in boards])
+    turns = np.random.choice([-1, 0, 1], size=len(boards))
+
+    hashes = canonical_hashes(points, turns)
+    expected = zobrist_hashes(canonical_points(points, turns), np.where(turns == 0, 0, 1))
+    assert np.all(hashes == expected)
+    assert np.all(canonical_hashes(points, Color.WHITE) == zobrist_hashes(points, Color.WHITE))
+    assert np.all(canonical_hashes(points, Color.NONE) == zobrist_hashes(points))
+
+    # a position and its mirror image share the hash
+    for b in boards:
+        assert canonical_hash(b.points, Color.BLACK) == canonical_hash(b.flipped().points, Color.WHITE)
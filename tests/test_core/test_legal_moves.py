@@ -3,10 +3,12 @@ import random
 import pytest
 
 from backgammon.core.defs import Color
-from backgammon.core.move import Move
+from backgammon.core.move import Move, MoveList
 from backgammon.core.board import Board
-from backgammon.core.legal_moves import build_legal_moves, is_legal_move
-from .defs import BOARDS, BOARDS_N_MOVES
+from backgammon.core.legal_moves import build_legal_move, build_legal_moves, fill_legal_moves, is_legal_move
+from backgammon.core.defs import IllegalMoveError
+from backgammon.core.state import GameState
+from .defs import BOARDS, BOARDS_N_MOVES, rand_board
 
 
 @pytest.mark.parametrize('board, n_moves_expected', zip(BOARDS, BOARDS_N_MOVES))
@@ -45,3 +47,58 @@ def test_non_legal_moves_for_boards(board: Board):
         else:
             if 1 <= move.pips() <= 6:
                 assert not is_legal_move(move, board, color)
+
+
+@pytest.mark.parametrize('board', BOARDS)
+def test_legal_plays(board: Board):
+    for dice in ([3, 5], [6, 1], [2, 2, 2, 2]):
+        for color in (Color.BLACK, Color.WHITE):
+            state = GameState(board, turn=color, dice=dice, dice_used=[False] * len(dice))
+            plays = state.build_legal_plays()
+            assert len(plays) == len(set(p.board for p in plays))
+            for play in plays:
+                s = state.copy()
+                for k, move in play.moves:
+                    assert move in s.build_legal_moves()
+                    s.do_move(move, k)
+                assert s.board == play.board
+                assert len(s.build_legal_moves()) == 0
+
+
+def test_legal_moves_match_single_moves():
+    random.seed(11)
+    moves = MoveList()
+    for board in BOARDS + [rand_board() for _ in range(200)]:
+        for color in Color:
+            for pips in range(1, 7):
+                expected = []
+                for src in range(26):
+                    try:
+                        expected.append(build_legal_move(board, src, pips, color))
+                    except IllegalMoveError:
+                        pass
+                assert build_legal_moves(board, pips, color) == expected
+                moves.clear()
+                assert fill_legal_moves(board, pips, color, moves) == len(expected)
+                assert moves.to_moves() == expected
+
+
+def test_fill_legal_moves_appends():
+    moves = MoveList(capacity=1)
+    board = BOARDS[3]
+    n = fill_legal_moves(board, 6, Color.WHITE, moves)
+    n += fill_legal_moves(board, 1, Color.NONE, moves)
+    assert len(moves) == n
+    assert moves.to_moves() == build_legal_moves(board, 6, Color.WHITE) + build_legal_moves(board, 1, Color.NONE)
+    assert moves.data['die'].tolist() == [6] * (n - len(build_legal_moves(board, 1, Color.NONE))) + \
+        [1] * len(build_legal_moves(board, 1, Color.NONE))
+
+
+def test_state_legal_move_list():
+    state = GameState(BOARDS[3], turn=Color.WHITE, dice=[6, 1], dice_used=[False, False])
+    moves = state.legal_move_list()
+    assert sorted(moves, key=repr) == sorted(state.build_legal_moves(), key=repr)
+    assert set(moves.data['die'].tolist()) == {1, 6}
+    state.dice_used[0] = True
+    assert state.legal_move_list(moves) is moves
+    assert moves.to_moves() == state.build_legal_moves()
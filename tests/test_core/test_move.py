@@ -1,6 +1,9 @@
+from dataclasses import FrozenInstanceError
+import pickle
+
 import pytest
 
-from backgammon.core.move import Move
+from backgammon.core.move import Move, MoveList, interned_move
 from backgammon.core.board import WHITE_BAR, BLACK_BAR
 
 
@@ -65,3 +68,36 @@ def test_move_hash():
                 m = Move(src, dst, hit)
                 hashes.add(hash(m))
     assert len(hashes) > 0.9 * 2 * 26**2
+
+
+def test_interned_move():
+    move = interned_move(13, 8)
+    assert move == Move(13, 8)
+    assert interned_move(13, 8) is move
+    assert interned_move(13, 8, True) == Move(13, 8, True)
+    # shared instances must not change
+    with pytest.raises(FrozenInstanceError):
+        move.hit = True  # type: ignore[misc]
+    assert hash(move) == hash(Move(13, 8)) and {move: 1}[Move(13, 8)] == 1
+
+
+def test_move_flipped():
+    assert Move(13, 8).flipped() == Move(12, 17)
+    assert Move(25, 20, True).flipped() == Move(0, 5, True)
+    assert Move(3, 0).flipped().flipped() is interned_move(3, 0)
+    assert pickle.loads(pickle.dumps(Move(3, 0, True))) == Move(3, 0, True)
+
+
+def test_move_list():
+    moves = MoveList(capacity=2)
+    assert len(moves) == 0
+    moves.extend([13, 8, 6], [8, 3, 0], [False, True, False], 5)
+    assert len(moves) == 3
+    assert moves.to_moves() == [Move(13, 8), Move(8, 3, True), Move(6, 0)]
+    assert list(moves) == moves.to_moves()
+    assert moves[-1] is interned_move(6, 0)
+    assert moves.data['die'].tolist() == [5, 5, 5]
+    with pytest.raises(IndexError):
+        moves[3]
+    moves.clear()
+    assert len(moves) == 0 and moves.to_moves() == []
@@ -0,0 +1,89 @@
+import pickle
+import numpy as np
+
+from backgammon.core import Color, Move, Board, GameState
+
+from .defs import BOARDS
+
+
+def test_state_pickle():
+    for board in BOARDS:
+        state = GameState(board)
+        state.roll_dice()
+        copy = pickle.loads(pickle.dumps(state))
+        assert copy == state
+        assert list(copy.pip_count()) == list(state.pip_count())
+
+
+def _walk(state: GameState, depth: int):
+    """Make and unmake all moves up to `depth`, checking against `do_move`."""
+    if depth == 0:
+        return
+    for move in state.build_legal_moves():
+        before = state.copy()
+        record = state.make(move)
+        assert state.dice[record.die] >= move.pips()
+        expected = before.copy()
+        expected.do_move(move, record.die)
+        assert state == expected
+        assert state.zobrist_hash() == before.zobrist_hash() ^ record.hash_delta
+        if state.board.incremental:
+            assert list(state.pip_count()) == list(Board(state.board.points).pip_count())
+            assert list(state.checkers_count()) == list(Board(state.board.points).checkers_count())
+            assert state.board.contact() == Board(state.board.points).contact()
+        _walk(state, depth - 1)
+        assert state.unmake() is record
+        assert state == before
+        if state.board.incremental:
+            assert list(state.pip_count()) == list(before.pip_count())
+
+
+def test_make_unmake():
+    np.random.seed(7)
+    for incremental in (False, True):
+        for board in BOARDS[:5]:
+            for turn in (Color.WHITE, Color.BLACK):
+                state = GameState(Board(board.points, incremental=incremental), turn)
+                state.roll_dice()
+                _walk(state, depth=2)
+                assert len(state._stack) == 0
+
+
+def test_make_bearing_off_die():
+    points = np.zeros(26, dtype=int)
+    points[[2, 3]] = [2, 1]
+    state = GameState(Board(points), Color.WHITE, dice=[5, 3], dice_used=[False, False])
+    # the exact die is used, if possible
+    state.make(Move(3, 0))
+    assert state.dice_used == [False, True]
+    state.make(Move(2, 0))
+    assert state.dice_used == [True, True]
+    state.unmake()
+    state.unmake()
+    assert state.dice_used == [False, False]
+
+
+def test_legal_moves_cache():
+    state = GameState(turn=Color.WHITE, dice=[3, 3, 3, 3], dice_used=[False] * 4)
+    moves = state.build_legal_moves()
+    moves.clear()  # the cached moves are not affected
+    assert state.build_legal_moves() == _uncached_moves(state)
+    assert len(state._legal_moves) == 1
+
+    move = state.build_legal_moves()[0]
+    k = state.do_move(move)
+    after = state.build_legal_moves()
+    assert after == _uncached_moves(state)
+    state.undo_move(move, k)
+    state.do_move(move, (k + 1) % 4)  # another of the equal dice gives the same moves
+    assert state.build_legal_moves() == after
+    assert len(state._legal_moves) == 2
+
+    state.dice_used = [True] * 4
+    state.finish_turn()
+    assert len(state._legal_moves) == 0
+
+
+def _uncached_moves(state: GameState) -> list[Move]:
+    """The legal moves built without the cache."""
+    return state.copy().build_legal_moves()
@@ -0,0 +1,12 @@
+import pytest
+
+
+def _has_cairo() -> bool:
+    try:
+        import cairosvg  # type: ignore  # noqa: F401
+    except (ImportError, OSError):  # cairosvg raises OSError without the cairo library
+        return False
+    return True
+
+
+requires_cairo = pytest.mark.skipif(not _has_cairo(), reason="rasterizing needs cairosvg and the cairo library")
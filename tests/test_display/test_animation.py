@@ -0,0 +1,68 @@
+import random
+
+import pytest
+from PIL import Image
+
+from backgammon.core import Board, Color, GameState
+from backgammon.game import ActionType, Game
+from backgammon.agents import RandomAgent
+from backgammon.display import DEFAULT_DURATIONS, animate_game, game_frames
+
+from .defs import requires_cairo
+
+# a short race
+_RACE = [0, 2, 2, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, -2, -2, 0]
+
+
+@pytest.fixture(scope='module')
+def game():
+    random.seed(0)  # `RandomAgent` and the dice use the `random` module
+    agents = {Color.BLACK: RandomAgent(), Color.WHITE: RandomAgent()}
+    game = Game(GameState(Board(_RACE)))
+    while not game.game_over():
+        game.step(agents, allow_doubling=False)
+    return game
+
+
+def test_game_frames(game):
+    frames = game_frames(game, speed=2.0, final_pause=1.0)
+    # the start and the state after each action
+    assert len(frames) == len(game.history) + 1
+    assert frames[0].state is game.history[0].state
+    assert [f.state for f in frames[1:]] == [t.next_state for t in game.history]
+    assert frames[0].duration == pytest.approx(DEFAULT_DURATIONS[ActionType.NONE] / 2)
+    assert frames[-1].duration == pytest.approx((DEFAULT_DURATIONS[game.history[-1].action.type] + 1.0) / 2)
+    for frame, t in zip(frames[1:], game.history):
+        assert (frame.last_move is not None) == (t.action.type == ActionType.MOVE)
+
+    # a game without history is a single frame
+    assert len(game_frames(Game())) == 1
+
+
+def test_animate_game_svg(game, tmp_path):
+    path = tmp_path / 'game.svg'
+    for loop in (True, False):
+        frames = animate_game(game, path, loop=loop)
+        svg = path.read_text(encoding='utf-8')
+        assert svg.count('<set ') == len(frames)
+        assert svg.count('<animate ') == (1 if loop else 0)
+        assert svg.count('fill="freeze"') == (0 if loop else 1)
+        # the frames share the definitions of the static layer
+        assert svg.count('id="checker_WHITE"') == 1
+        assert svg.count('id="checker_BLACK"') == 1
+
+
+def test_animate_game_format(game, tmp_path):
+    with pytest.raises(ValueError):
+        animate_game(game, tmp_path / 'game.mp4')
+
+
+@requires_cairo
+@pytest.mark.parametrize('name, fmt', [('game.gif', 'GIF'), ('game.apng', 'PNG')])
+def test_animate_game_raster(game, tmp_path, name, fmt):
+    path = tmp_path / name
+    frames = animate_game(game, path)
+    with Image.open(path) as image:
+        assert image.format == fmt
+        # PIL merges identical consecutive frames
+        assert 1 < image.n_frames <= len(frames)
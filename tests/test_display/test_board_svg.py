@@ -0,0 +1,28 @@
+import re
+from xml.etree.ElementTree import tostring
+
+from backgammon.core import Board, Color, GameState
+from backgammon.display import svg_gamestate
+
+
+def _refs_and_ids(svg: str) -> tuple[set[str], set[str]]:
+    refs = set(re.findall(r'href="#([^"]+)"', svg))
+    ids = set(re.findall(r' id="([^"]+)"', svg))
+    return refs, ids
+
+
+def test_layered_drawing_defines_checkers():
+    for layered in (False, True):
+        for background in (True, False):
+            drawing = svg_gamestate(GameState(turn=Color.WHITE), layered=layered, background=background)
+            refs, ids = _refs_and_ids(drawing.tostring())
+            assert refs, (layered, background)
+            assert refs <= ids, (layered, background)
+
+
+def test_layered_drawing_without_background():
+    drawing = svg_gamestate(GameState(turn=Color.WHITE), layered=True, background=False)
+    drawing.add(drawing.board(Board(), background=False))
+    # the definitions are added once, and not to the positions (e.g. the frames of `animate_game`)
+    assert drawing.tostring().count('id="checker_WHITE"') == 1
+    assert 'id="checker_WHITE"' not in tostring(drawing.elements[-1].get_xml(), encoding='unicode')
@@ -0,0 +1,80 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from backgammon.core import Board, GameState
+from backgammon.display import DisplayStyle, contact_sheets, save_contact_sheets, thumbnail_size
+from backgammon.display import contact_sheet
+
+from .defs import requires_cairo
+
+WIDTH, PADDING = 40, 4
+
+
+def _fake_tiles(positions, ds, size, **kwargs) -> list[bytes]:
+    # plain red tiles, so that the layout is tested without cairo
+    tiles = []
+    for _ in positions:
+        buffer = BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, format='PNG')
+        tiles.append(buffer.getvalue())
+    return tiles
+
+
+@pytest.fixture
+def fake_tiles(monkeypatch):
+    monkeypatch.setattr(contact_sheet, '_render_tiles', _fake_tiles)
+
+
+@pytest.mark.parametrize('n, columns, rows, grids', [
+    (11, 4, 2, [(4, 2), (3, 1)]),
+    (8, 4, 2, [(4, 2)]),
+    (5, 6, None, [(5, 1)]),
+    (13, 3, None, [(3, 5)]),
+])
+def test_contact_sheets_grid(fake_tiles, n, columns, rows, grids):
+    w, h = thumbnail_size(DisplayStyle(), WIDTH)
+    sheets = list(contact_sheets([Board()] * n, width=WIDTH, columns=columns, rows=rows, padding=PADDING))
+    assert len(sheets) == len(grids)
+    for sheet, (n_cols, n_rows) in zip(sheets, grids):
+        assert sheet.size == (n_cols * (w + PADDING) + PADDING, n_rows * (h + PADDING) + PADDING)
+        # the first tile, and white padding
+        assert sheet.getpixel((PADDING, PADDING)) == (255, 0, 0)
+        assert sheet.getpixel((PADDING - 1, PADDING - 1)) == (255, 255, 255)
+
+
+def test_contact_sheets_labels(fake_tiles):
+    w, h = thumbnail_size(DisplayStyle(), WIDTH)
+    positions = [GameState(), Board(), Board().points]
+    sheet, = contact_sheets(positions, width=WIDTH, columns=2, labels=['a', 'b', 'c'], padding=PADDING)
+    label_height = (sheet.size[1] - PADDING) // 2 - h - PADDING
+    assert label_height > 0
+    assert sheet.size == (2 * (w + PADDING) + PADDING, 2 * (h + label_height + PADDING) + PADDING)
+
+    def caption(k: int) -> np.ndarray:
+        x = PADDING + (k % 2) * (w + PADDING)
+        y = PADDING + (k // 2) * (h + label_height + PADDING) + h
+        return np.asarray(sheet.crop((x, y, x + w, y + label_height)))
+
+    # a caption below each thumbnail, and none below the empty cell
+    assert all(np.any(caption(k) < 128) for k in range(3))
+    assert np.all(caption(3) == 255)
+
+    with pytest.raises(ValueError):
+        next(contact_sheets(positions, labels=['a']))
+
+
+@requires_cairo
+def test_save_contact_sheets(tmp_path):
+    size = thumbnail_size(DisplayStyle(), WIDTH)
+    paths = save_contact_sheets([Board()] * 5, tmp_path / 'sheet_{:02d}.png', width=WIDTH, columns=2, rows=2,
+                                padding=0)
+    assert [p.name for p in paths] == ['sheet_00.png', 'sheet_01.png']
+    with Image.open(paths[1]) as sheet:
+        assert sheet.size == size
+    with Image.open(paths[0]) as sheet:
+        assert sheet.size == (2 * size[0], 2 * size[1])
+        # the thumbnails are boards, not blank
+        assert len(sheet.getcolors(maxcolors=2 ** 16) or range(2)) > 1
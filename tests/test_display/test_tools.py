@@ -0,0 +1,38 @@
+from io import BytesIO
+
+from PIL import Image
+
+from backgammon.core import Board
+from backgammon.display import svg_board, svgs2pngs, svgs2images
+from backgammon.display.tools import png2image
+
+from .defs import requires_cairo
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="40" height="30"><rect width="40" height="30" fill="red"/></svg>'
+
+
+def test_png2image():
+    buffer = BytesIO()
+    Image.new('RGB', (7, 5), 'red').save(buffer, format='PNG')
+    image = png2image(buffer.getvalue())
+    assert image.size == (7, 5)
+    assert image.getpixel((3, 2)) == (255, 0, 0)
+
+
+@requires_cairo
+def test_svgs2pngs():
+    svgs = [SVG, SVG.encode('utf-8'), svg_board(Board())]
+    pngs = svgs2pngs(svgs)
+    assert len(pngs) == len(svgs)
+    assert all(png.startswith(PNG_SIGNATURE) for png in pngs)
+    assert pngs[0] == pngs[1]
+    # the same in worker processes, in order
+    assert svgs2pngs(svgs, max_workers=1, chunksize=1) == pngs
+
+
+@requires_cairo
+def test_svgs2images():
+    images = svgs2images([SVG, SVG], scale=2)
+    assert [image.size for image in images] == [(80, 60), (80, 60)]
+    assert images[0].convert('RGB').getpixel((40, 30)) == (255, 0, 0)
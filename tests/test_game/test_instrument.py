@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+import pstats
+
+from backgammon.core import Color
+from backgammon.game import ActionType, Game, Match, Instrumentation
+from backgammon.agents import RandomAgent
+
+
+def test_match_instrumentation(tmp_path):
+    black, white = RandomAgent(), RandomAgent()
+    instrument = Instrumentation(profile_games=[1])
+    match = Match({Color.BLACK: black, Color.WHITE: white}, n_points=3, allow_doubling=False, instrument=instrument)
+    match.play(tqdm_disable=True)
+
+    n_games = len(match.games)
+    assert instrument.counters['games'] == n_games
+    assert len(instrument.timers['game']) == n_games
+    assert instrument.counters['steps'] == len(instrument.timers['step'])
+    n_moves = sum(t.action.type == ActionType.MOVE for game in match.games for t in game.history)
+    assert instrument.counters['move'] == n_moves
+    assert instrument.counters['diceroll'] == len(instrument.timers['dice'])
+    assert len(instrument.timers['hooks']) == instrument.counters['steps']
+
+    rows = {row['phase']: row for row in instrument.summary()}
+    assert {'step', 'dice', 'legal_moves', 'history', 'game', 'hooks'} <= set(rows)
+    assert instrument.agent_phase(black) in rows and instrument.agent_phase(white) in rows
+    assert instrument.agent_phase(black) != instrument.agent_phase(white)
+    for row in rows.values():
+        assert row['min'] <= row['p50'] <= row['p90'] <= row['p99'] <= row['max']
+
+    data = json.loads(instrument.to_json(tmp_path / 'timings.json', raw=True))
+    assert data['counters']['games'] == n_games
+    assert len(data['raw']['step']) == instrument.counters['steps']
+    assert (tmp_path / 'timings.json').read_text() == json.dumps(data, indent=2)
+
+    table = list(csv.DictReader(io.StringIO(instrument.to_csv(tmp_path / 'timings.csv'))))
+    assert [row['phase'] for row in table] == sorted(rows)
+
+    if n_games > 1:
+        assert list(instrument.profiles) == [1]
+        instrument.dump_profile(1, tmp_path / 'game1.prof')
+        assert pstats.Stats(str(tmp_path / 'game1.prof')).total_calls > 0
+
+    instrument.reset()
+    assert len(instrument.timers) == 0 and len(instrument.counters) == 0 and len(instrument.profiles) == 0
+
+
+def test_game_without_instrumentation():
+    game = Game()
+    agents = {Color.BLACK: RandomAgent(), Color.WHITE: RandomAgent()}
+    while not game.game_over():
+        game.step(agents, points=[0, 0], match_ends_at=1, allow_doubling=False)
+    assert game.instrument is None
@@ -0,0 +1,41 @@
+import io
+
+from backgammon.core import Color
+from backgammon.game import Match, GameLogger, read_games
+from backgammon.agents import RandomAgent
+
+
+def test_log_and_replay(tmp_path):
+    path = tmp_path / 'games.log'
+    match = Match(RandomAgent(double_prob=0.05), n_points=5)
+    with GameLogger(path, boards=True) as logger:
+        match.play(after_move=[logger.after_move], tqdm_disable=True)
+    assert logger.n_games == len(match.games)
+
+    games = list(read_games(path))
+    assert len(games) == len(match.games)
+    for game, replayed in zip(match.games, games):
+        assert replayed.state == game.state
+        assert replayed.result() == game.result()
+        assert len(replayed.history) == len(game.history)
+        for t, r in zip(game.history, replayed.history):
+            assert r.action == t.action
+            assert r.state == t.state and r.next_state == t.next_state
+            assert r.reward == t.reward
+
+
+def test_log_game():
+    match = Match({Color.BLACK: RandomAgent(), Color.WHITE: RandomAgent()}, allow_doubling=False)
+    game = match.play_single_game()
+
+    buffer = io.StringIO()
+    logger = GameLogger(buffer)
+    logger.log_game(game)
+    logger.close()
+    lines = buffer.getvalue().splitlines()
+    assert lines[0].startswith('game 0 - 1 - ')
+    assert lines[-1].startswith('end ')
+    assert len(lines) == len(game.history) + 2
+
+    replayed, = read_games(lines)
+    assert replayed.state == game.state
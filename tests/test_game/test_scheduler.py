@@ -0,0 +1,39 @@
+import numpy as np
+
+from backgammon.core import Color
+from backgammon.game import BatchScheduler, Game
+from backgammon.agents import EvaluatorAgent, NeuralAgent, RandomAgent
+from backgammon.nn import MLP, N_FEATURES
+
+
+class CountingEvaluator:
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, points):
+        self.calls.append(len(points))
+        return -np.sum(np.clip(points, 0, None) * np.arange(26), axis=1)
+
+
+def test_scheduler_batches_across_games():
+    evaluator = CountingEvaluator()
+    agent = EvaluatorAgent(evaluator)
+    scheduler = BatchScheduler({Color.BLACK: agent, Color.WHITE: RandomAgent()}, max_wait=10.0, allow_doubling=False)
+    games = scheduler.play(8)
+    assert len(games) == 8
+    assert all(game.game_over() for game in games)
+
+    stats = scheduler.stats.summary()
+    assert stats['n_batches'] == len(evaluator.calls)
+    assert stats['n_positions'] == sum(evaluator.calls)
+    assert stats['n_requests'] > stats['n_batches']  # decisions of several games per call
+    assert stats['max_batch_size'] == max(evaluator.calls)
+
+
+def test_scheduler_max_batch_size():
+    agent = NeuralAgent(MLP.create((N_FEATURES, 8, 1), seed=6))
+    scheduler = BatchScheduler(agent, max_batch_size=1, allow_doubling=False)
+    games = scheduler.play([Game() for _ in range(3)])
+    assert all(game.game_over() for game in games)
+    assert all(r == 1 for r in scheduler.stats.batch_requests)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from backgammon.core import Color, IllegalMoveError, START_POINTS
+from backgammon.core.actions import N_ACTIONS
+from backgammon.game.vec_game import VecGame
+
+
+def assert_masks_match_legal_moves(env: VecGame):
+    for i in range(len(env)):
+        state = env.state(i)
+        legal_moves = state.build_legal_moves()
+        actions = np.where(env.masks[i])[0]
+        assert len(actions) > 0
+        assert set(env.decode_move(i, a) for a in actions) == set(legal_moves), f"@ game {i}"
+
+
+def test_vec_game_reset():
+    env = VecGame(16, seed=1)
+    obs, masks = env.reset()
+    assert obs.shape == (16, 26)
+    assert masks.shape == (16, N_ACTIONS)
+    assert np.all(obs == START_POINTS)
+    assert np.all(np.isin(env.turn, [Color.BLACK, Color.WHITE]))
+    assert np.all(env.dice.sum(axis=1) == 2)
+    assert np.all(env.dice.max(axis=1) == 1)  # no doubles in opening roll
+    assert_masks_match_legal_moves(env)
+
+
+def test_vec_game_random_play():
+    env = VecGame(8, seed=2)
+    _, masks = env.reset()
+    rng = np.random.default_rng(3)
+    n_done = 0
+    for _ in range(600):
+        actions = np.argmax(masks * rng.random(masks.shape), axis=1)
+        obs, rewards, dones, masks = env.step(actions)
+        assert np.all((rewards > 0) == dones)
+        assert np.all(np.isin(rewards, [0, 1, 2, 3]))
+        assert np.all(obs[dones] == START_POINTS)
+        assert np.all(np.sum(np.clip(obs, 0, None), axis=1) <= 15)
+        assert np.all(np.sum(np.clip(-obs, 0, None), axis=1) <= 15)
+        n_done += np.sum(dones)
+        if _ % 50 == 0:
+            assert_masks_match_legal_moves(env)
+    assert n_done > 0
+
+
+def test_vec_game_illegal_action():
+    env = VecGame(4, seed=4)
+    _, masks = env.reset()
+    actions = np.argmax(~masks, axis=1)
+    with pytest.raises(IllegalMoveError):
+        env.step(actions)
+    with pytest.raises(ValueError):
+        env.step(np.zeros(3, dtype=int))
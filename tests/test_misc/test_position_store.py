@@ -0,0 +1,80 @@
+import numpy as np
+
+from backgammon.core import Color, zobrist_hashes
+from backgammon.core.batch import contact, home_blot_counts
+from backgammon.game import Match
+from backgammon.agents import RandomAgent
+from backgammon.misc import PositionStore
+
+
+def _positions(n_games=3):
+    match = Match(RandomAgent(), n_points=n_games, allow_doubling=False)
+    while len(match.games) < n_games:
+        match.play_single_game()
+    return [t.state for game in match.games for t in game.history if t.state.turn != Color.NONE]
+
+
+def test_add_and_find(tmp_path):
+    states = _positions()
+    points = np.array([s.board.points for s in states])
+    turns = np.array([s.turn for s in states])
+
+    with PositionStore(tmp_path / 'positions.db', batch_size=64) as store:
+        hashes = store.add(points, turns, game=7, ply=np.arange(len(states)))
+        n_distinct = len(set(hashes.tolist()))
+        assert len(store) == n_distinct
+        assert states[0] in store and int(hashes[-1]) in store
+
+        # adding again only counts them
+        store.add(points, turns)
+        assert len(store) == n_distinct
+        assert store.connection.execute("SELECT SUM(count) FROM positions").fetchone()[0] == 2 * len(states)
+
+        found = store.find(contact=True, min_home_blots_own=1)
+        own = (turns >= 0).astype(int)
+        expected = contact(points) & (home_blot_counts(points)[np.arange(len(points)), own] >= 1)
+        assert set(found.hashes.tolist()) == set(hashes[expected].tolist())
+        assert np.all(zobrist_hashes(found.points, found.turns) == found.hashes)
+        assert all(s in store for s in found.states())
+
+        plan = ' '.join(store.query_plan("contact = 1 AND home_blots_own >= 1"))
+        assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan
+
+    with PositionStore(tmp_path / 'positions.db') as store:  # persisted
+        assert len(store) == n_distinct
+        assert len(store.query("game = ?", (7,))) == n_distinct
+
+
+def test_canonical_store():
+    states = _positions(1)
+    store = PositionStore(canonical=True)
+    store.add([s.board.points for s in states], [s.turn for s in states])
+    n = len(store)
+    assert all(s in store and s.flipped() in store for s in states)
+
+    # the mirror images are the same entries
+    store.add([s.board.flipped().points for s in states], [s.turn.other() for s in states])
+    assert len(store) == n
+    found = store.find()
+    assert np.all(found.turns == Color.WHITE)
+    assert np.all(store.hashes(found.points, found.turns) == found.hashes)
+
+
+def test_cached_evaluations():
+    store = PositionStore()
+    calls = []
+
+    def evaluator(points):
+        calls.append(len(points))
+        return points.sum(axis=1) / 100
+
+    cached = store.cached(evaluator, 'sum')
+    points = np.array([s.board.points for s in _positions(1)[:50]])
+    values = cached(points)
+    assert np.allclose(values, points.sum(axis=1) / 100)
+    assert np.allclose(cached(points), values)
+    assert len(calls) == 1
+
+    hashes = zobrist_hashes(points, Color.BLACK)
+    assert np.allclose(store.evaluations(hashes, 'sum'), values)
+    assert np.all(np.isnan(store.evaluations(hashes, 'other')))
@@ -0,0 +1,34 @@
+import numpy as np
+
+from backgammon.core import START_POINTS
+from backgammon.core.actions import canonical_points
+from backgammon.misc import effective_pip_counts, race_win_prob
+
+
+def _race(white_home, black_home):
+    points = np.zeros(26, dtype=int)
+    points[1:7] = white_home
+    points[19:25] = -np.asarray(black_home)[::-1]
+    return points
+
+
+def test_effective_pip_counts():
+    # the starting position has empty 4- and 5-points
+    assert effective_pip_counts(START_POINTS).tolist() == [169, 169]
+    # pips 49, two extra checkers on the 1-point and one on the 2-point
+    points = _race([3, 2, 2, 2, 2, 3], [2, 2, 2, 2, 2, 2])
+    assert effective_pip_counts(points).tolist() == [42 + 2 + 1, 49 + 4 + 1]
+    assert effective_pip_counts(np.zeros(26, dtype=int)).tolist() == [0, 0]
+    batch = np.stack([START_POINTS, points])
+    assert effective_pip_counts(batch).tolist() == [[169, 169], [45, 54]]
+
+
+def test_race_win_prob():
+    even = _race([2, 2, 2, 3, 3, 3], [2, 2, 2, 3, 3, 3])
+    # the player on roll (BLACK) is ahead in an even race
+    assert 0.2 < race_win_prob(even) < 0.5
+    ahead = _race([2, 2, 2, 3, 3, 3], [0, 0, 0, 3, 6, 6])
+    assert race_win_prob(ahead) > 0.75
+    assert race_win_prob(canonical_points(ahead, -1)) < 0.15
+    done = _race([0] * 6, [2, 2, 2, 3, 3, 3])
+    assert race_win_prob(done) == 1.0
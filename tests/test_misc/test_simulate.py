@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+
+from backgammon.core import Color, WinType
+from backgammon.game import Match, ActionType
+from backgammon.agents import RandomAgent
+from backgammon.core.actions import canonical_action_mask, canonical_points
+from backgammon.misc import simulate
+from backgammon.misc.simulate import _bits, _legal_sources, _ALL_BITS, _BAR_BIT
+
+
+def test_simulate_from_start():
+    res = simulate(2000, seed=1, record=True)
+    assert len(res) == 2000
+    assert set(np.abs(res.outcomes).tolist()) <= {1, 2, 3}
+    assert np.all(res.turns > 0) and np.all(res.turn == Color.NONE)
+    assert 0.4 < res.win_rates()[1] < 0.6
+    # the winner has borne off all checkers
+    winner = np.sign(res.outcomes)
+    assert np.all(np.sum(np.clip(res.points * winner[:, None], 0, None), axis=1) == 0)
+
+    # a position at the start of each turn
+    assert len(res.positions) == res.turns.sum()
+    assert np.all(np.bincount(res.position_games) == res.turns)
+
+    again = simulate(2000, seed=1)
+    assert np.all(again.outcomes == res.outcomes) and np.all(again.turns == res.turns)
+
+
+def test_simple_policy_beats_random():
+    res = simulate(1000, policy=('random', 'simple'), seed=2)
+    assert res.win_rates()[1] > 0.9
+
+
+def test_simulate_positions():
+    # WHITE bears off the last checker, BLACK has not borne off any
+    points = np.zeros(26, dtype=int)
+    points[1] = 1
+    points[19:25] = [-3, -3, -3, -2, -2, -2]
+    res = simulate(10, points, Color.WHITE, seed=3)
+    assert np.all(res.outcomes == 2) and np.all(res.turns == 1)
+
+    # the same with colors swapped
+    res = simulate(10, -points[::-1], Color.BLACK, seed=3)
+    assert np.all(res.outcomes == -2)
+
+    res = simulate(50, seed=4, max_turns=3)
+    assert np.all(res.outcomes == 0) and np.all(res.turns == 3)
+    assert np.all(np.abs(res.turn) == 1)
+    assert np.all(np.abs(res.points).sum(axis=1) >= 28)
+
+
+def test_simulate_chunks():
+    res = simulate(300, seed=5, record=True, max_workers=1, chunk_size=128)
+    assert len(res) == 300 and np.all(res.outcomes != 0)
+    assert np.all(np.bincount(res.position_games) == res.turns)
+
+
+def test_legal_sources():
+    res = simulate(200, seed=6, record=True)
+    turns = np.random.choice([-1, 1], size=len(res.positions))
+    boards = canonical_points(res.positions, turns)
+    padded = np.zeros((len(boards), 32), dtype=np.int8)
+    padded[:, :26] = boards
+    own = _bits(padded > 0)
+    blocked = _bits(padded < -1) & ~np.uint64(1)
+    bar_mask = np.where(boards[:, 25] > 0, _BAR_BIT, _ALL_BITS)
+
+    for die in range(1, 7):
+        dice = np.zeros((len(boards), 6), dtype=np.int8)
+        dice[:, die - 1] = 1
+        expected = canonical_action_mask(boards, dice).reshape(-1, 6, 25)[:, die - 1]
+        sources, _ = _legal_sources(own, blocked, bar_mask, np.full(len(boards), die, dtype=np.uint64))
+        found = (sources[:, None] >> np.arange(1, 26, dtype=np.uint64)) & np.uint64(1)
+        assert np.all(found.astype(bool) == expected)
+
+
+def test_random_policy_matches_random_agent():
+    random.seed(7)
+    match = Match(RandomAgent(), n_points=10**9, allow_doubling=False)
+    while len(match.games) < 100:
+        match.play_single_game()
+    turns = [sum(t.action.type == ActionType.DICEROLL for t in g.history) for g in match.games]
+    gammons = np.mean([g.result().wintype >= WinType.GAMMON for g in match.games])
+
+    res = simulate(20_000, seed=7)
+    # about 5 standard errors of the games of `Match`
+    assert abs(np.mean(turns) - res.turns.mean()) < 18
+    assert abs(gammons - np.mean(np.abs(res.outcomes) >= 2)) < 0.25
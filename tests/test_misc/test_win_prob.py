@@ -0,0 +1,54 @@
+import numpy as np
+
+from backgammon.core import Color, GameState, START_POINTS
+from backgammon.game import Match
+from backgammon.agents import RandomAgent, SimpleAgent
+from backgammon.misc import WinProbModel, game_positions
+
+from ..test_core.defs import BOARDS, rand_board
+
+
+def test_win_probs():
+    model = WinProbModel()
+    boards = BOARDS + [rand_board() for _ in range(50)]
+    points = np.array([b.points for b in boards])
+
+    win = model.win_probs(points)
+    assert win.shape == (len(boards), 2)
+    assert np.allclose(win.sum(axis=-1), 1)
+    assert np.allclose(model.win_probs(START_POINTS), [0.5, 0.5])
+
+    agent = SimpleAgent()
+    # the default model is not repeated in the repr, a refitted one is
+    assert repr(agent) == 'SimpleAgent()'
+    assert 'scale=0.5' in repr(SimpleAgent(win_prob_model=WinProbModel(scale=0.5)))
+    for b, w in zip(boards, win):
+        state = GameState(b, Color.WHITE)
+        assert np.isclose(agent.est_win_prob(state, Color.WHITE), w[1])
+        assert np.isclose(agent.est_win_prob(state, Color.BLACK), w[0])
+
+    gammon = model.gammon_probs(points)
+    assert np.all((0 <= gammon) & (gammon <= win))
+    # no gammons, once a checker is borne off
+    off = np.array([b.checkers_count(Color.BLACK) < 15 for b in boards])
+    assert np.all(gammon[off, 1] == 0)
+
+
+def test_calibrate():
+    match = Match(RandomAgent(), n_points=20, allow_doubling=False)
+    while len(match.games) < 20:
+        match.play_single_game()
+    points, results = game_positions(match.games)
+    assert len(points) == len(results) > 0
+    assert set(np.abs(results).tolist()) <= {1, 2, 3}
+
+    model = WinProbModel.calibrate(points, results)
+    assert 0.1 < model.scale < 2
+    assert model.gammon_slope > 0
+
+    # the fit is at least as likely as the defaults
+    def log_loss(m):
+        p = m.win_probs(points)[:, 1]
+        return -np.mean(np.log(np.where(results > 0, p, 1 - p) + 1e-12))
+
+    assert log_loss(model) <= log_loss(WinProbModel()) + 1e-9
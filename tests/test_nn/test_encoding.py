@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from backgammon.core import Color, Board, GameState
+from backgammon.core.batch import pip_counts, checkers_counts, bar_counts, off_counts
+from backgammon.nn.encoding import N_FEATURES, n_features, encode_points, encode_board, encode_state, encode_states
+from ..test_core.defs import rand_board, BOARDS, BOARD_PIP_CNSTS, BOARD_CHECKER_CNT
+
+
+def test_batch_counts():
+    points = np.stack([b.points for b in BOARDS])
+    assert np.all(pip_counts(points) == BOARD_PIP_CNSTS)
+    assert np.all(checkers_counts(points) == BOARD_CHECKER_CNT)
+    assert np.all(off_counts(points) == 15 - np.array(BOARD_CHECKER_CNT))
+    assert np.all(bar_counts(points[1]) == [6, 1])
+
+
+def test_encode_start_position():
+    features = encode_board(Board(), Color.WHITE)
+    assert features.shape == (N_FEATURES,)
+    assert features.dtype == np.float32
+    # white: 2 on 24, 5 on 13, 3 on 8, 5 on 6
+    white = features[:96].reshape(24, 4)
+    assert np.all(white[23] == [1, 1, 0, 0])
+    assert np.all(white[12] == [1, 1, 1, 1])
+    assert np.all(white[7] == [1, 1, 1, 0])
+    assert np.all(white[5] == [1, 1, 1, 1])
+    assert white.sum() == 2 + 4 + 3 + 4
+    assert np.all(features[96:192] == features[:96])
+    assert np.all(features[192:196] == 0)
+    assert np.all(features[196:] == [1, 0])
+
+
+@pytest.mark.parametrize('board', BOARDS + [rand_board() for _ in range(10)])
+def test_encode_flip_symmetry(board: Board):
+    for extra in (False, True):
+        features = encode_board(board, Color.WHITE, extra=extra)
+        flipped = encode_board(board.flipped(), Color.BLACK, extra=extra)
+        assert np.all(features[:96] == flipped[96:192])
+        assert np.all(features[192:196:2] == flipped[193:196:2])
+        assert np.all(features[196:198] == flipped[197:195:-1])
+        if extra:
+            assert np.allclose(features[198::2], flipped[199::2])
+            pips = board.pip_count()
+            assert np.allclose(features[198:200] * 167, [pips[1], pips[0]])
+        bar_off = [board.points[25] / 2, -board.points[0] / 2] + list((15 - board.checkers_count()[::-1]) / 15)
+        assert np.allclose(features[192:196], bar_off)
+
+
+def test_encode_batch_into_buffer():
+    boards = BOARDS + [rand_board() for _ in range(20)]
+    points = np.stack([b.points for b in boards])
+    turns = np.where(np.arange(len(boards)) % 2, Color.WHITE, Color.BLACK)
+    out = np.full((len(boards), n_features(extra=True)), np.nan, dtype=np.float32)
+    res = encode_points(points, turns, out=out, extra=True)
+    assert res is out
+    assert not np.any(np.isnan(out))
+    for board, turn, features in zip(boards, turns, out):
+        assert np.allclose(features, encode_board(board, Color(turn), extra=True))
+
+    states = [GameState(b, turn=Color(t)) for b, t in zip(boards, turns)]
+    assert np.allclose(encode_states(states, extra=True), out)
+    assert np.all(encode_state(states[3]) == out[3, :N_FEATURES])
+
+    with pytest.raises(ValueError):
+        encode_points(points, turns, out=np.zeros((len(boards), N_FEATURES), dtype=np.float64))
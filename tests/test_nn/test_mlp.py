@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from backgammon.core import Board
+from backgammon.nn import MLP, MLPEvaluator, TDTrainer, N_FEATURES
+
+
+def test_mlp_forward_and_save_load(tmp_path):
+    model = MLP.create((10, 7, 3), seed=1)
+    assert model.sizes == (10, 7, 3)
+    assert repr(model) == "MLP(sizes=(10, 7, 3))"
+
+    x = np.random.rand(5, 10).astype(np.float32)
+    y = model(x)
+    assert y.shape == (5, 3)
+    assert np.all((0 < y) & (y < 1))
+
+    model.save(tmp_path / 'model.npz')
+    loaded = MLP.load(tmp_path / 'model.npz')
+    assert loaded.sizes == model.sizes
+    assert np.all(loaded(x) == y)
+
+    with pytest.raises(ValueError):
+        MLP([np.zeros((3, 4)), np.zeros((5, 1))], [np.zeros(4), np.zeros(1)])
+
+
+def test_mlp_gradient():
+    model = MLP.create((6, 5, 1), seed=2)
+    x = np.random.rand(6).astype(np.float32)
+    out, grads = model.gradient(x)
+    assert out == pytest.approx(float(model(x[None, :])[0]))
+
+    eps = 1e-3
+    for param, grad in zip(model.params, grads):
+        assert param.shape == grad.shape
+        idx = tuple(np.random.randint(s) for s in param.shape)
+        orig = param[idx]
+        param[idx] = orig + eps
+        plus = float(model(x[None, :].astype(np.float64))[0])
+        param[idx] = orig - eps
+        minus = float(model(x[None, :].astype(np.float64))[0])
+        param[idx] = orig
+        assert grad[idx] == pytest.approx((plus - minus) / (2 * eps), rel=1e-2, abs=1e-5)
+
+
+def test_mlp_evaluator():
+    evaluator = MLPEvaluator(MLP.create((N_FEATURES, 8, 1), seed=3))
+    points = np.stack([Board().points, Board().points])
+    values = evaluator(points)
+    assert values.shape == (2,)
+    assert values[0] == values[1]
+    with pytest.raises(ValueError):
+        MLPEvaluator(MLP.create((N_FEATURES, 8, 1)), extra=True)
+
+
+def test_td_trainer():
+    model = MLP.create((N_FEATURES, 8, 1), seed=4)
+    weights = [p.copy() for p in model.params]
+    trainer = TDTrainer(model, alpha=0.1, epsilon=0.1)
+    winners = trainer.train(2, tqdm_disable=True)
+    assert len(winners) == 2
+    assert trainer.n_games == 2
+    assert any(np.any(p != w) for p, w in zip(model.params, weights))